@@ -0,0 +1,296 @@
+# End-to-end benchmark of get_pages, get_offers and get_details against local fixture server
+
+# Add path to scraping scripts
+import sys
+sys.path.append('Scraping')
+sys.path.append('/content/Apartments/Scraping')
+sys.path.append('/Apartments/Scraping')
+
+# Libraries
+import argparse
+import json
+import os
+import platform
+import resource
+import socket
+import subprocess
+import time
+import urllib.request
+from datetime import datetime
+import numpy as np
+from asyncFetcher import AsyncFetcher
+from httpSession import HttpSession
+from scraper import Scraper
+from fetchResult import OK, FAILED, GONE
+from otodomScraper import ScrapingOtodom
+from morizonScraper import ScrapingMorizon
+from gratkaScraper import ScrapingGratka
+
+SCRAPERS = {"otodom": (ScrapingOtodom, 'https://www.otodom.pl/wynajem/mieszkanie/', 'https://www.otodom.pl'),
+            "morizon": (ScrapingMorizon, 'https://www.morizon.pl/do-wynajecia/mieszkania', 'https://www.morizon.pl'),
+            "gratka": (ScrapingGratka, 'https://www.gratka.pl/nieruchomosci/mieszkania/', 'https://www.gratka.pl')}
+
+
+class StageProbe:
+    """
+    A class used to record latency of every request and results of every scraped link
+
+    HttpSession.get, AsyncFetcher._fetch and Scraper.scraping_all_links are wrapped on class level, so both fetch
+    engines are measured and scrapers can still be pickled for parse processes.
+
+    ...
+
+    Attributes
+    ----------
+    latencies : list
+        seconds of every request
+    results : list
+        FetchResult of every scraped link
+
+    Methods
+    -------
+    install() -> None:
+        Wrap fetching and scraping methods
+
+    reset() -> None:
+        Forget recorded requests and results
+    """
+
+    def __init__(self):
+        self.latencies = []
+        self.results = []
+
+    # Wrap fetching and scraping methods
+    def install(self) -> None:
+        probe = self
+        session_get = HttpSession.get
+        fetch = AsyncFetcher._fetch
+        scraping_all_links = Scraper.scraping_all_links
+
+        def get(session, link):
+            start = time.perf_counter()
+            try:
+                return session_get(session, link)
+            finally:
+                probe.latencies.append(time.perf_counter() - start)
+
+        async def _fetch(fetcher, session, url):
+            start = time.perf_counter()
+            result = await fetch(fetcher, session, url)
+            probe.latencies.append(time.perf_counter() - start)
+            return result
+
+        def scraping_all_links_recorded(scraper, func, all_links):
+            results = scraping_all_links(scraper, func, all_links)
+            probe.results.extend(results)
+            return results
+
+        HttpSession.get = get
+        AsyncFetcher._fetch = _fetch
+        Scraper.scraping_all_links = scraping_all_links_recorded
+
+    # Forget recorded requests and results
+    def reset(self) -> None:
+        self.latencies = []
+        self.results = []
+
+
+# CPU seconds of benchmark and its child processes
+def cpu_time() -> float:
+    usage_self = resource.getrusage(resource.RUSAGE_SELF)
+    usage_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage_self.ru_utime + usage_self.ru_stime + usage_children.ru_utime + usage_children.ru_stime
+
+
+# Peak resident memory of benchmark in MiB
+def peak_rss() -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 ** 2 if platform.system() == "Darwin" else 1024)
+
+
+# Percentile in milliseconds
+def percentile_ms(values: list, q: float) -> float:
+    return float(np.percentile(values, q) * 1000) if len(values) != 0 else None
+
+
+# Run stage of scraper and summarise it
+def run_stage(probe: StageProbe, stage, *args, **kwargs):
+    """Run stage of scraper and summarise it
+
+    Parameters
+    ----------
+    probe: StageProbe
+        installed probe
+    stage: function
+        get_pages, get_offers or get_details of scraper
+    args, kwargs:
+        arguments of stage
+
+    Returns
+    ------
+    object, dict
+        1. result of stage
+        2. wall and CPU seconds, requests, pages/sec, p50/p95 latency and parse time, results by status, bytes
+           and peak RSS
+    """
+
+    probe.reset()
+    cpu_start, start = cpu_time(), time.perf_counter()
+    output = stage(*args, **kwargs)
+    wall = time.perf_counter() - start
+    cpu = cpu_time() - cpu_start
+
+    statuses = [result.status for result in probe.results]
+    parse_times = [result.parse_time for result in probe.results if result.status != FAILED]
+    summary = {"wall_s": wall, "cpu_s": cpu, "requests": len(probe.latencies),
+               "pages_per_s": len(probe.latencies) / wall if wall > 0 else None,
+               "latency_p50_ms": percentile_ms(probe.latencies, 50),
+               "latency_p95_ms": percentile_ms(probe.latencies, 95),
+               "parse_p50_ms": percentile_ms(parse_times, 50), "parse_p95_ms": percentile_ms(parse_times, 95),
+               "links": len(probe.results), "ok": statuses.count(OK), "gone": statuses.count(GONE),
+               "failed": statuses.count(FAILED), "bytes": sum(result.n_bytes for result in probe.results),
+               "peak_rss_mb": peak_rss()}
+
+    return output, summary
+
+
+# Benchmark one site end-to-end
+def benchmark_site(site: str, probe: StageProbe, server_url: str, split_size: int, max_offers: int,
+                   scraper_kwargs: dict) -> dict:
+    """Run get_pages, get_offers and get_details of site against fixture server
+
+    Parameters
+    ----------
+    site: str
+        otodom, morizon or gratka
+    probe: StageProbe
+        installed probe
+    server_url: str
+        address of fixture server e.g. http://127.0.0.1:8765
+    split_size: int
+        split size of get_offers and get_details
+    max_offers: int
+        maximum number of offers passed to get_details (None for all)
+    scraper_kwargs: dict
+        settings of Scraper e.g. fetch_backend
+
+    Returns
+    ------
+    dict
+        stage: summary of stage
+    """
+
+    scraper_class, page, page_name = SCRAPERS[site]
+    host = page_name.split("://")[1]
+    scraper = scraper_class(page=page, page_name=page_name,
+                            host_overrides={page_name: "%s/%s" % (server_url, host)}, **scraper_kwargs)
+
+    report = {}
+    pages, report["pages"] = run_stage(probe, scraper.get_pages)
+    offers, report["offers"] = run_stage(probe, scraper.get_offers, split_size=split_size, pages=pages)
+    _, report["details"] = run_stage(probe, scraper.get_details, split_size=split_size,
+                                     offers=offers[:max_offers] if max_offers else offers)
+    report["failed_links"] = len(scraper.failed_links)
+    scraper.close()
+
+    return report
+
+
+# Start fixture server and wait until it answers
+def start_server(port: int, server_args: list) -> subprocess.Popen:
+    server_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixture_server.py")
+    process = subprocess.Popen([sys.executable, server_path, "--port", str(port)] + server_args,
+                               stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        # Port taken by another process
+        if process.poll() is not None:
+            raise RuntimeError("Fixture server exited, is port %d in use?" % port)
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Fixture server did not start on port %d" % port)
+
+
+# Print change of throughput against baseline run
+def compare(report: dict, baseline: dict) -> None:
+    for site, stages in report["sites"].items():
+        for stage in ["pages", "offers", "details"]:
+            try:
+                before = baseline["sites"][site][stage]["pages_per_s"]
+                after = stages[stage]["pages_per_s"]
+                print("%-8s %-8s pages/s %9.1f -> %9.1f (%+.1f%%)" % (site, stage, before, after,
+                                                                      (after / before - 1) * 100))
+            except (KeyError, TypeError, ZeroDivisionError):
+                pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end benchmark of scrapers against local fixture server")
+    parser.add_argument("--sites", nargs="+", default=list(SCRAPERS), choices=list(SCRAPERS))
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fetch-backend", default="threads", choices=["threads", "asyncio"])
+    parser.add_argument("--max-threads", type=int, default=30)
+    parser.add_argument("--async-concurrency", type=int, default=100)
+    parser.add_argument("--parser-backend", default=None, help="parser backend of scrapers (default of Scraper)")
+    parser.add_argument("--parse-processes", type=int, default=None)
+    parser.add_argument("--adaptive-concurrency", action="store_true")
+    parser.add_argument("--retry-delay", type=float, default=0.1)
+    parser.add_argument("--split-size", type=int, default=500)
+    parser.add_argument("--max-offers", type=int, default=None, help="maximum number of offers in get_details")
+    # Settings of fixture server
+    parser.add_argument("--archive-dir", help="serve pages recorded in PageArchive instead of synthetic ones")
+    parser.add_argument("--date", help="date of archived pages (YYYY-MM-DD)")
+    parser.add_argument("--pages", type=int, default=3, help="listing pages of every voivodeship/district")
+    parser.add_argument("--offers-per-page", type=int, default=24)
+    parser.add_argument("--latency", type=float, default=20.0, help="mean latency in ms")
+    parser.add_argument("--jitter", type=float, default=10.0, help="latency jitter in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 503 responses")
+    parser.add_argument("--throttle", type=int, default=0, help="requests in flight above which 429 is returned")
+    parser.add_argument("--output", help="save results to JSON file")
+    parser.add_argument("--baseline", help="JSON file of previous run to compare pages/sec with")
+    args = parser.parse_args()
+
+    server_args = ["--pages", str(args.pages), "--offers-per-page", str(args.offers_per_page),
+                   "--latency", str(args.latency), "--jitter", str(args.jitter),
+                   "--error-rate", str(args.error_rate), "--throttle", str(args.throttle)]
+    if args.archive_dir:
+        server_args += ["--archive-dir", args.archive_dir] + (["--date", args.date] if args.date else [])
+
+    scraper_kwargs = {"max_threads": args.max_threads, "fetch_backend": args.fetch_backend,
+                      "async_concurrency": args.async_concurrency, "parse_processes": args.parse_processes,
+                      "adaptive_concurrency": args.adaptive_concurrency, "retry_delay": args.retry_delay}
+    if args.parser_backend:
+        scraper_kwargs["parser_backend"] = args.parser_backend
+
+    probe = StageProbe()
+    probe.install()
+    server = start_server(args.port, server_args)
+    server_url = "http://127.0.0.1:%d" % args.port
+    try:
+        report = {"date": datetime.now().isoformat(timespec="seconds"), "settings": vars(args), "sites": {}}
+        for site in args.sites:
+            report["sites"][site] = benchmark_site(site, probe, server_url, args.split_size, args.max_offers,
+                                                   scraper_kwargs)
+            for stage in ["pages", "offers", "details"]:
+                summary = report["sites"][site][stage]
+                print("%-8s %-8s %6d req %8.1f pages/s  p50 %7.1f ms  p95 %7.1f ms  cpu %6.2f s  rss %7.1f MiB  "
+                      "failed %d" % (site, stage, summary["requests"], summary["pages_per_s"] or 0,
+                                     summary["latency_p50_ms"] or 0, summary["latency_p95_ms"] or 0,
+                                     summary["cpu_s"], summary["peak_rss_mb"], summary["failed"]))
+        with urllib.request.urlopen(server_url + "/__stats") as response:
+            report["server"] = json.loads(response.read())
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            compare(report, json.load(baseline_file))
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
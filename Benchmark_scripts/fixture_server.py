@@ -0,0 +1,354 @@
+# Local HTTP stand-in for Otodom, Morizon and Gratka used by end-to-end benchmarks
+
+# Add path to scraping scripts
+import sys
+sys.path.append('Scraping')
+sys.path.append('/content/Apartments/Scraping')
+sys.path.append('/Apartments/Scraping')
+
+# Libraries
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Tuple
+
+VOIVODESHIPS = ["dolnoslaskie", "kujawsko-pomorskie", "lodzkie", "lubelskie", "lubuskie", "malopolskie", "mazowieckie",
+                "opolskie", "podkarpackie", "podlaskie", "pomorskie", "slaskie", "warminsko-mazurskie",
+                "wielkopolskie", "zachodniopomorskie"]
+
+
+class SyntheticSite:
+    """
+    A class used to generate listing and detail pages of portals with the markup read by the scrapers
+
+    Pages are generated from the link, so the same link always gives the same page.
+
+    ...
+
+    Attributes
+    ----------
+    pages : int
+        number of listing pages of every voivodeship (Otodom, Gratka) or district (Morizon)
+    offers_per_page : int
+        number of offers on every listing page
+    cities : int
+        number of Morizon cities
+    districts : int
+        number of districts of every Morizon city
+
+    Methods
+    -------
+    page(host: str, path: str) -> bytes:
+        HTML of page of host (None if there is no such page)
+    """
+
+    def __init__(self, pages: int = 3, offers_per_page: int = 24, cities: int = 2, districts: int = 3):
+        """
+        Parameters
+        ----------
+        pages : int
+            number of listing pages of every voivodeship (Otodom, Gratka) or district (Morizon) (default 3)
+        offers_per_page : int
+            number of offers on every listing page (default 24)
+        cities : int
+            number of Morizon cities (default 2)
+        districts : int
+            number of districts of every Morizon city (default 3)
+        """
+
+        self.pages = pages
+        self.offers_per_page = offers_per_page
+        self.cities = cities
+        self.districts = districts
+
+    # HTML of page of host
+    def page(self, host: str, path: str) -> bytes:
+        """HTML of page of host
+
+        Parameters
+        ----------
+        host: str
+            host of portal e.g. www.otodom.pl
+        path: str
+            path with query e.g. /wynajem/mieszkanie/mazowieckie?page=2
+
+        Returns
+        ------
+        bytes
+            HTML of page (None if there is no such page)
+        """
+
+        path, _, query = path.partition("?")
+        page_number = int(query.split("page=")[1].split("&")[0]) if "page=" in query else None
+
+        if "otodom" in host:
+            html = self.otodom(path, page_number)
+        elif "gratka" in host:
+            html = self.gratka(path, page_number)
+        elif "morizon" in host:
+            html = self.morizon(path, page_number)
+        else:
+            html = None
+
+        return None if html is None else html.encode("utf-8")
+
+    # Pager with links to listing pages
+    def pager(self, tag: str, attributes: str) -> str:
+        return "<%s %s>%s</%s>" % (tag, attributes, "".join("<a href='?page=%d'>%d</a>" % (number, number)
+                                                               for number in range(1, self.pages + 1)), tag)
+
+    # Offers of listing page, pages past the last one are empty
+    def listed(self, page_number: int) -> range:
+        return range(self.offers_per_page if page_number <= self.pages else 0)
+
+    # Pages of Otodom
+    def otodom(self, path: str, page_number: int) -> str:
+        if "/oferta/" in path:
+            offer = {"props": {"pageProps": {"ad": {
+                "location": {"coordinates": {"latitude": 52.0 + number_of(path) % 1000 / 1000, "longitude": 21.0},
+                             "address": [{"value": "ul. Testowa %d" % (number_of(path) % 100)}],
+                             "geoLevels": [{"type": "region", "label": "mazowieckie"},
+                                           {"type": "city", "label": "Warszawa"},
+                                           {"type": "district", "label": "Mokotów"}]},
+                "title": "Mieszkanie %d" % number_of(path),
+                "description": "".join("<p>Opis mieszkania %d, akapit %d. Blisko metra i parku.</p>"
+                                       % (number_of(path), paragraph) for paragraph in range(5)),
+                "characteristics": [{"key": "price", "value": "2500", "label": "Cena", "localizedValue": "2 500 zł"},
+                                    {"key": "m", "value": "48", "label": "Powierzchnia", "localizedValue": "48 m²"},
+                                    {"key": "rooms_num", "value": "2", "label": "Liczba pokoi", "localizedValue": "2"}],
+                "featuresByCategory": [{"label": "Informacje dodatkowe", "values": ["balkon", "piwnica"]}],
+                "target": {"Area": "48", "Build_year": "2010", "Building_floors_num": "5", "Building_material": "brick",
+                           "Building_type": "block", "Construction_status": "ready_to_use", "Deposit": "3000",
+                           "Floor_no": "floor_2", "Heating": "urban", "Rent": "500", "Rooms_num": "two"}}}}}
+            return ("<html><body><h1 class='css-46s0sq eu6swcv18'>Mieszkanie %d</h1>"
+                    "<a class='css-1qz7z11 e1nbpvi61'>ul. Testowa %d</a>"
+                    "<strong class='css-srd1q3 eu6swcv17'>2 500 zł</strong>"
+                    "<div class='css-1d9dws4 egzohkh2'><div><div>Powierzchnia:</div><div>48 m²</div></div>"
+                    "<div><div>Liczba pokoi:</div><div>2</div></div></div>%s<h3>Informacje dodatkowe</h3>"
+                    "<ul class='css-13isnqa ex3yvbv0'><li>balkon</li><li>piwnica</li></ul>"
+                    "<script id='__NEXT_DATA__' type='application/json'>%s</script></body></html>"
+                    % (number_of(path), number_of(path) % 100, description(path), json.dumps(offer)))
+        voivodeship = path.rstrip("/").split("/")[-1]
+        if voivodeship not in VOIVODESHIPS:
+            return None
+        if page_number is None:
+            return "<html><body>%s</body></html>" % self.pager("nav", "class='pager'")
+        return "<html><body>%s</body></html>" % "".join(
+            "<article data-url='https://www.otodom.pl/pl/oferta/mieszkanie-%s-%d-%d-ID%d.html'></article>"
+            % (voivodeship, page_number, offer, number_of(path) + offer) for offer in self.listed(page_number))
+
+    # Pages of Gratka
+    def gratka(self, path: str, page_number: int) -> str:
+        if "/ob/" in path:
+            return ("<html><body><h1 class='sticker__title'>Mieszkanie %d</h1>"
+                    "<span class='priceInfo__value'>2 500<span class='priceInfo__currency'>zł</span></span>"
+                    "<ul class='parameters__rolled'><li>Powierzchnia 48 m2</li><li>Liczba pokoi 2</li></ul>"
+                    "<div class='description__rolled ql-container'>%s</div>"
+                    "<script>var locationParams = {\"lat\": 52.1, \"lng\": 21.0}</script></body></html>"
+                    % (number_of(path), description(path)))
+        parts = path.strip("/").split("/")
+        if (len(parts) != 4) or (parts[3] != "wynajem") or (parts[2] not in VOIVODESHIPS):
+            return None
+        if page_number is None:
+            return "<html><body>%s</body></html>" % self.pager("div", "class='pagination'")
+        return "<html><body>%s</body></html>" % "".join(
+            "<article data-href='https://www.gratka.pl/nieruchomosci/mieszkanie-%s-%d-%d/ob/%d'></article>"
+            % (parts[2], page_number, offer, number_of(path) + offer) for offer in self.listed(page_number))
+
+    # Pages of Morizon
+    def morizon(self, path: str, page_number: int) -> str:
+        if path.startswith("/oferta/"):
+            return ("<html><body><div class='summaryLocation clearfix row'><span>Warszawa</span>"
+                    "<span>Mokotów</span></div><div class='summaryTypeTransaction clearfix'>Mieszkanie do wynajęcia"
+                    "</div><nav class='breadcrumbs'><span>Mieszkania</span><span>Warszawa</span></nav>"
+                    "<ul><li class='paramIconPrice'><em>2 500 zł</em></li><li class='paramIconPriceM2'><em>52 zł"
+                    "</em></li><li class='paramIconLivingArea'><em>48 m²</em></li>"
+                    "<li class='paramIconNumberOfRooms'><em>2</em></li></ul><section class='propertyParams'>"
+                    "<h3>Szczegóły</h3><table><tr><th>Piętro</th><td>2</td></tr></table><p>Umeblowane</p></section>"
+                    "<div class='description'>%s</div><section class='propertyMap'><div class='GoogleMap' "
+                    "data-lat='52.1' data-lng='21.0'></div></section></body></html>" % description(path))
+        parts = path.strip("/").split("/")
+        if parts[:2] != ["do-wynajecia", "mieszkania"]:
+            return None
+        # Main page lists cities, city pages list districts
+        if len(parts) == 2:
+            return "<html><body><div id='locationListChildren'>%s</div></body></html>" % "".join(
+                "<a href='/do-wynajecia/mieszkania/miasto-%d'>Miasto %d</a>" % (city, city)
+                for city in range(self.cities))
+        if (parts[2] != "najnowsze") or (len(parts) not in (4, 5)):
+            return None
+        if len(parts) == 4:
+            return "<html><body><div id='locationListChildren'>%s</div></body></html>" % "".join(
+                "<a href='/do-wynajecia/mieszkania/%s/dzielnica-%d'>Dzielnica %d</a>" % (parts[3], district, district)
+                for district in range(self.districts))
+        if page_number is None:
+            return "<html><body>%s</body></html>" % self.pager("ul", "class='nav nav-pills mz-pagination-number'")
+        return "<html><body>%s</body></html>" % "".join(
+            "<a class='property_link' href='https://www.morizon.pl/oferta/wynajem-mieszkanie-%s-%s-%d-%d-mzn%d'></a>"
+            % (parts[3], parts[4], page_number, offer, number_of(path) + offer) for offer in self.listed(page_number))
+
+
+# Stable number of link
+def number_of(path: str) -> int:
+    return zlib.crc32(path.encode("utf-8")) % 10 ** 8
+
+
+# Description of offer
+def description(path: str) -> str:
+    return "".join("<p>Opis mieszkania %d, akapit %d. Blisko metra i parku.</p>" % (number_of(path), paragraph)
+                   for paragraph in range(5))
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """
+    A class used to answer requests of scrapers, the first segment of path is host of portal
+    e.g. http://127.0.0.1:8765/www.otodom.pl/wynajem/mieszkanie/mazowieckie?page=2
+
+    Settings are attributes of server: site (SyntheticSite), archive (PageArchive), date, latency and jitter
+    (seconds), error_rate, throttle (requests in flight above which 429 is returned).
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if self.path == "/__stats":
+            with server.lock:
+                stats = {"requests": sum(server.statuses.values()), "statuses": dict(server.statuses)}
+            return self.answer(200, json.dumps(stats).encode("utf-8"), "application/json")
+
+        with server.lock:
+            server.in_flight += 1
+            throttled = (server.throttle > 0) and (server.in_flight > server.throttle)
+        try:
+            if throttled:
+                return self.answer(429, b"", headers={"Retry-After": "1"})
+
+            time.sleep(max(0.0, server.latency + random.uniform(-server.jitter, server.jitter)))
+            if random.random() < server.error_rate:
+                return self.answer(503, b"")
+
+            host, path = split_path(self.path)
+            if server.archive is not None:
+                body = server.archive.load("https://" + host + path, server.date)
+            else:
+                body = server.site.page(host, path)
+
+            if body is None:
+                return self.answer(404, b"")
+            return self.answer(200, body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    # Send response with status and body
+    def answer(self, status: int, body: bytes, content_type: str = "text/html; charset=utf-8",
+               headers: dict = None) -> None:
+        with self.server.lock:
+            self.server.statuses[status] += 1
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# Host and path of original link
+def split_path(path: str) -> Tuple[str, str]:
+    host, _, rest = path.lstrip("/").partition("/")
+    return host, "/" + rest
+
+
+# Server answering requests of scrapers
+class FixtureServer(ThreadingHTTPServer):
+    """Threading HTTP server with listen backlog of a production server, the default one (5) drops connections
+    opened at once by many threads and clients wait for SYN retransmission (1 s)"""
+
+    request_queue_size = 1024
+
+
+def create_server(address: str = "127.0.0.1", port: int = 8765, site: SyntheticSite = None, archive_dir: str = None,
+                  date: str = None, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                  throttle: int = 0) -> ThreadingHTTPServer:
+    """Server answering requests of scrapers with recorded or synthetic pages
+
+    Parameters
+    ----------
+    address: str
+        address of server (default 127.0.0.1)
+    port: int
+        port of server (default 8765)
+    site: SyntheticSite, optional
+        generator of pages (default SyntheticSite with default settings)
+    archive_dir: str, optional
+        directory of PageArchive with recorded pages, it is used instead of site
+    date: str, optional
+        date of archived pages (YYYY-MM-DD, default the latest ones)
+    latency: float
+        mean latency of response in seconds (default 0)
+    jitter: float
+        latency is drawn uniformly from latency +- jitter seconds (default 0)
+    error_rate: float
+        share of responses with 503 status (default 0)
+    throttle: int
+        requests in flight above which 429 is returned (default 0 - no throttling)
+
+    Returns
+    ------
+    ThreadingHTTPServer
+        server which is started with serve_forever
+    """
+
+    server = FixtureServer((address, port), FixtureHandler)
+    server.daemon_threads = True
+    server.site = site or SyntheticSite()
+    server.archive = None
+    if archive_dir is not None:
+        from pageArchive import PageArchive
+        server.archive = PageArchive(archive_dir)
+    server.date = date
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.throttle = throttle
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.statuses = Counter()
+
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded or synthetic portal pages to scrapers")
+    parser.add_argument("--address", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--archive-dir", help="serve pages recorded in PageArchive instead of synthetic ones")
+    parser.add_argument("--date", help="date of archived pages (YYYY-MM-DD)")
+    parser.add_argument("--pages", type=int, default=3, help="listing pages of every voivodeship/district")
+    parser.add_argument("--offers-per-page", type=int, default=24)
+    parser.add_argument("--cities", type=int, default=2, help="Morizon cities")
+    parser.add_argument("--districts", type=int, default=3, help="districts of every Morizon city")
+    parser.add_argument("--latency", type=float, default=0.0, help="mean latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latency jitter in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 503 responses")
+    parser.add_argument("--throttle", type=int, default=0, help="requests in flight above which 429 is returned")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    server = create_server(args.address, args.port,
+                           SyntheticSite(args.pages, args.offers_per_page, args.cities, args.districts),
+                           args.archive_dir, args.date, args.latency / 1000, args.jitter / 1000, args.error_rate,
+                           args.throttle)
+    print("Serving on http://%s:%d" % (args.address, args.port), flush=True)
+    server.serve_forever()
@@ -0,0 +1,112 @@
+# Compare per-page parse time of Morizon details found by separate find calls (before) and in one walk (after)
+
+# Add path to scraping scripts
+import sys
+sys.path.append('Scraping')
+sys.path.append('/content/Apartments/Scraping')
+sys.path.append('/Apartments/Scraping')
+
+# Libraries
+import argparse
+import json
+import time
+from collections import defaultdict
+import numpy as np
+from morizonScraper import ScrapingMorizon
+from fetchResult import FetchResult, OK, GONE
+from parser_backends import load_pages
+from fixture_server import SyntheticSite
+
+
+# Details found by separate find calls from the root, as scraping_offers_details did before one walk
+def separate_finds_details(scraper: ScrapingMorizon, link: str) -> FetchResult:
+    offer_infos = defaultdict(list)
+    soup_details = scraper.enterPage_parser(link)
+    try:
+        find = scraper.soup_find_information
+        offer_infos["title"] = scraper.extract_information(
+            find(soup=soup_details, find_attr=['div', 'class', 'summaryLocation clearfix row']).find_all("span"))
+        offer_infos["subtitle"] = scraper.extract_information(
+            find(soup=soup_details, find_attr=['div', 'class', 'summaryTypeTransaction clearfix']))
+        offer_infos["localization_path"] = scraper.extract_information(
+            find(soup=soup_details, find_attr=['nav', 'class', 'breadcrumbs']).find_all("span"))
+        for key, class_name in [("price", "paramIconPrice"), ("priceM2", "paramIconPriceM2"),
+                                ("area", "paramIconLivingArea"), ("rooms", "paramIconNumberOfRooms")]:
+            offer_infos[key] = scraper.information_exists(find(soup=soup_details, find_attr=['li', 'class', class_name]))
+        params = soup_details.find(class_="propertyParams")
+        offer_infos["params_h3"] = [element.text for element in params.find_all("h3")]
+        offer_infos["params_tables"] = [element.text for element in params.find_all("table")]
+        offer_infos["params_p"] = [element.text for element in params.find_all("p")]
+        offer_infos["description"] = scraper.extract_information(
+            find(soup=soup_details, find_attr=['div', 'class', 'description']), True, "p")
+        soup_details.find("section", attrs={"class": "propertyMap"})
+        google_map = find(soup=soup_details, find_attr=['div', 'class', 'GoogleMap'])
+        offer_infos["lat"] = scraper.spatial_data_exists(google_map, 'data-lat')
+        offer_infos["lng"] = scraper.spatial_data_exists(google_map, 'data-lng')
+        offer_infos["link"] = link
+
+        return FetchResult(OK, link, offer_infos)
+
+    except:
+        return FetchResult(GONE, link)
+
+
+# CPU milliseconds of parsing every page (building tree and extracting fields)
+def measure(scraper: ScrapingMorizon, details, pages: dict, repeat: int) -> tuple:
+    times, results = [], {}
+    for link, html_bytes in pages.items():
+        best = None
+        for _ in range(repeat):
+            start = time.process_time()
+            results[link] = scraper.call_with_pages(details, link, {link: html_bytes})
+            elapsed = (time.process_time() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        times.append(best)
+
+    return times, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Morizon details found in one walk against separate find calls")
+    parser.add_argument("--pages-dir", help="directory with recorded offer pages (.html)")
+    parser.add_argument("--archive-dir", help="directory of PageArchive with recorded pages")
+    parser.add_argument("--date", help="date of archived pages (YYYY-MM-DD)")
+    parser.add_argument("--synthetic", type=int, default=200, help="number of synthetic pages if none are recorded")
+    parser.add_argument("--parser-backend", default="html.parser")
+    parser.add_argument("--repeat", type=int, default=3, help="best of repeated measurements of every page")
+    parser.add_argument("--output", help="save results to JSON file")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir, args.archive_dir, args.date, pattern="oferta")
+    if len(pages) == 0:
+        site = SyntheticSite()
+        pages = {"https://www.morizon.pl/oferta/wynajem-mieszkanie-%d" % number:
+                 site.page("www.morizon.pl", "/oferta/wynajem-mieszkanie-%d" % number)
+                 for number in range(args.synthetic)}
+
+    scraper = ScrapingMorizon(page='https://www.morizon.pl/do-wynajecia/mieszkania', page_name='https://www.morizon.pl',
+                              parser_backend=args.parser_backend)
+    before_times, before_results = measure(scraper, lambda link: separate_finds_details(scraper, link), pages,
+                                           args.repeat)
+    after_times, after_results = measure(scraper, scraper.scraping_offers_details, pages, args.repeat)
+    scraper.close()
+
+    # Pages whose status or details differ between both ways
+    differences = sum(1 for link, result in before_results.items()
+                      if (result.status != after_results[link].status)
+                      or (str(result.payload) != str(after_results[link].payload)))
+
+    report = {"pages": len(pages), "parser_backend": args.parser_backend,
+              "before_ms_p50": float(np.median(before_times)), "after_ms_p50": float(np.median(after_times)),
+              "before_ms_p95": float(np.percentile(before_times, 95)),
+              "after_ms_p95": float(np.percentile(after_times, 95)),
+              "before_ms_total": float(np.sum(before_times)), "after_ms_total": float(np.sum(after_times)),
+              "differences": differences}
+    report["speedup"] = report["before_ms_total"] / max(report["after_ms_total"], 1e-9)
+    print("%d pages  before p50 %.3f ms p95 %.3f ms  after p50 %.3f ms p95 %.3f ms  speedup %.2fx  "
+          "pages which differ: %d" % (len(pages), report["before_ms_p50"], report["before_ms_p95"],
+                                     report["after_ms_p50"], report["after_ms_p95"], report["speedup"], differences))
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
@@ -0,0 +1,73 @@
+# Compare per-page CPU time of Otodom details read from __NEXT_DATA__ JSON (fast path) and from soup (fallback)
+
+# Add path to scraping scripts
+import sys
+sys.path.append('Scraping')
+sys.path.append('/content/Apartments/Scraping')
+sys.path.append('/Apartments/Scraping')
+
+# Libraries
+import argparse
+import json
+import time
+import numpy as np
+from otodomScraper import ScrapingOtodom
+from fetchResult import OK
+from parser_backends import load_pages
+from fixture_server import SyntheticSite
+
+
+# CPU milliseconds of scraping every page
+def measure(scraper: ScrapingOtodom, pages: dict) -> tuple:
+    times, results = [], {}
+    for link, html_bytes in pages.items():
+        start = time.process_time()
+        results[link] = scraper.call_with_pages(scraper.scraping_offers_details, link, {link: html_bytes})
+        times.append((time.process_time() - start) * 1000)
+
+    return times, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Otodom details from __NEXT_DATA__ JSON against soup")
+    parser.add_argument("--pages-dir", help="directory with recorded offer pages (.html)")
+    parser.add_argument("--archive-dir", help="directory of PageArchive with recorded pages")
+    parser.add_argument("--date", help="date of archived pages (YYYY-MM-DD)")
+    parser.add_argument("--synthetic", type=int, default=200, help="number of synthetic pages if none are recorded")
+    parser.add_argument("--parser-backend", default="html.parser")
+    parser.add_argument("--output", help="save results to JSON file")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir, args.archive_dir, args.date, pattern="oferta")
+    if len(pages) == 0:
+        site = SyntheticSite()
+        pages = {"https://www.otodom.pl/pl/oferta/mieszkanie-%d" % number:
+                 site.page("www.otodom.pl", "/pl/oferta/mieszkanie-%d" % number) for number in range(args.synthetic)}
+
+    scraper = ScrapingOtodom(page='https://www.otodom.pl/wynajem/mieszkanie/', page_name='https://www.otodom.pl',
+                             parser_backend=args.parser_backend)
+    # Pages without the marker of JSON are read from soup
+    fallback_pages = {link: html_bytes.replace(b"__NEXT_DATA__", b"__NO_DATA__") for link, html_bytes in pages.items()}
+
+    fast_times, fast_results = measure(scraper, pages)
+    soup_times, soup_results = measure(scraper, fallback_pages)
+    scraper.close()
+
+    # Fields which differ between both ways of reading the same page
+    differences = {}
+    for link, result in soup_results.items():
+        if (result.status == OK) and (fast_results[link].status == OK):
+            for key, value in result.payload.items():
+                if str(value) != str(fast_results[link].payload.get(key)):
+                    differences[key] = differences.get(key, 0) + 1
+
+    report = {"pages": len(pages), "fast_ms_p50": float(np.median(fast_times)),
+              "soup_ms_p50": float(np.median(soup_times)), "fast_ms_total": float(np.sum(fast_times)),
+              "soup_ms_total": float(np.sum(soup_times)), "differences": differences}
+    report["speedup"] = report["soup_ms_total"] / max(report["fast_ms_total"], 1e-9)
+    print("%d pages  fast p50 %.3f ms  soup p50 %.3f ms  speedup %.1fx  fields which differ: %s"
+          % (len(pages), report["fast_ms_p50"], report["soup_ms_p50"], report["speedup"], differences or "none"))
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
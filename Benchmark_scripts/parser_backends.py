@@ -0,0 +1,185 @@
+# Compare per-page parse time and results of scrapers extractors across parser backends
+
+# Add path to scraping scripts
+import sys
+sys.path.append('Scraping')
+sys.path.append('/content/Apartments/Scraping')
+sys.path.append('/Apartments/Scraping')
+
+# Libraries
+import argparse
+import json
+import os
+import time
+import numpy as np
+from otodomScraper import ScrapingOtodom
+from morizonScraper import ScrapingMorizon
+from gratkaScraper import ScrapingGratka
+from pageArchive import PageArchive
+from parserBackends import PARSER_BACKENDS
+from fixture_server import SyntheticSite, VOIVODESHIPS
+
+SCRAPERS = {"otodom": (ScrapingOtodom, 'https://www.otodom.pl/wynajem/mieszkanie/', 'https://www.otodom.pl'),
+            "morizon": (ScrapingMorizon, 'https://www.morizon.pl/do-wynajecia/mieszkania', 'https://www.morizon.pl'),
+            "gratka": (ScrapingGratka, 'https://www.gratka.pl/nieruchomosci/mieszkania/', 'https://www.gratka.pl')}
+
+EXTRACTORS = {"details": "scraping_offers_details", "offers": "scraping_offers_links"}
+
+# Paths of synthetic pages used if none are recorded, listing pages are pages of one voivodeship or district
+SYNTHETIC_PATHS = {("otodom", "details"): lambda number: "/pl/oferta/mieszkanie-%d" % number,
+                   ("otodom", "offers"): lambda number: "/wynajem/mieszkanie/%s?page=%d" % (VOIVODESHIPS[0], number),
+                   ("morizon", "details"): lambda number: "/oferta/wynajem-mieszkanie-%d" % number,
+                   ("morizon", "offers"): lambda number: "/do-wynajecia/mieszkania/najnowsze/miasto-0/dzielnica-0?page=%d"
+                                                         % number,
+                   ("gratka", "details"): lambda number: "/nieruchomosci/mieszkanie-%d/ob/%d" % (number, number),
+                   ("gratka", "offers"): lambda number: "/nieruchomosci/mieszkania/%s/wynajem?page=%d"
+                                                        % (VOIVODESHIPS[0], number)}
+
+
+# Read recorded pages from directory with .html files or from archive
+def load_pages(pages_dir: str = None, archive_dir: str = None, date: str = None, pattern: str = '') -> dict:
+    """Read recorded pages from directory with .html files or from archive
+
+    Parameters
+    ----------
+    pages_dir: str, optional
+        directory with .html files
+    archive_dir: str, optional
+        directory of PageArchive
+    date: str, optional
+        date of archived pages (YYYY-MM-DD)
+    pattern: str, optional
+        only links containing pattern are used (e.g. "oferta")
+
+    Returns
+    ------
+    dict
+        link: raw HTML
+    """
+
+    pages = {}
+    if pages_dir is not None:
+        for file_name in sorted(os.listdir(pages_dir)):
+            if file_name.endswith(".html") and (pattern in file_name):
+                with open(os.path.join(pages_dir, file_name), "rb") as page_file:
+                    pages[file_name] = page_file.read()
+    if archive_dir is not None:
+        archive = PageArchive(archive_dir)
+        for link in archive.links(date):
+            if pattern in link:
+                pages[link] = archive.load(link, date)
+        archive.close()
+
+    return pages
+
+
+# Synthetic pages of site for extractor
+def synthetic_pages(site: str, extractor: str, number: int) -> dict:
+    """Synthetic pages of site for extractor, the same as pages served by fixture_server
+
+    Parameters
+    ----------
+    site: str
+        otodom, morizon or gratka
+    extractor: str
+        details or offers
+    number: int
+        number of pages
+
+    Returns
+    ------
+    dict
+        link: raw HTML
+    """
+
+    _, _, page_name = SCRAPERS[site]
+    host = page_name.split("://")[1]
+    synthetic_site = SyntheticSite(pages=number)
+    paths = [SYNTHETIC_PATHS[(site, extractor)](page_number) for page_number in range(1, number + 1)]
+
+    return {page_name + path: synthetic_site.page(host, path) for path in paths}
+
+
+# Time extractor for every page with every parser backend
+def benchmark(site: str, extractor: str, pages: dict, repeat: int = 3) -> dict:
+    """Time extractor for every page with every parser backend
+
+    Parameters
+    ----------
+    site: str
+        otodom, morizon or gratka
+    extractor: str
+        details or offers
+    pages: dict
+        link: raw HTML
+    repeat: int
+        number of runs for every page, the fastest is used
+
+    Returns
+    ------
+    dict
+        backend: statistics of per-page time in milliseconds and number of pages whose result (status and
+        payload) differs from result of html.parser
+    """
+
+    scraper_class, page, page_name = SCRAPERS[site]
+    results = {}
+    baseline = None
+
+    for backend in PARSER_BACKENDS:
+        try:
+            scraper = scraper_class(page=page, page_name=page_name, max_threads=1, parser_backend=backend)
+            func = getattr(scraper, EXTRACTORS[extractor])
+            scraper.create_parser(b"<html></html>")
+        except ImportError as error:
+            results[backend] = {"error": str(error)}
+            continue
+
+        times = []
+        outputs = {}
+        for link, html_bytes in pages.items():
+            page_times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = scraper.call_with_pages(func, link, {link: html_bytes})
+                page_times.append(time.perf_counter() - start)
+            times.append(min(page_times) * 1000)
+            outputs[link] = (result.status, str(result.payload))
+        scraper.close()
+
+        # Backends are compared with html.parser, the first of PARSER_BACKENDS
+        if baseline is None:
+            baseline = outputs
+        differences = sum(1 for link, output in outputs.items() if output != baseline[link])
+
+        results[backend] = {"pages": len(times), "mean_ms": float(np.mean(times)),
+                            "p50_ms": float(np.percentile(times, 50)), "p95_ms": float(np.percentile(times, 95)),
+                            "differences": differences}
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-page parse time across parser backends")
+    parser.add_argument("--site", choices=sorted(SCRAPERS), required=True)
+    parser.add_argument("--extractor", choices=sorted(EXTRACTORS), default="details")
+    parser.add_argument("--pages-dir", help="directory with recorded .html pages")
+    parser.add_argument("--archive-dir", help="directory of PageArchive with recorded pages")
+    parser.add_argument("--date", help="date of archived pages (YYYY-MM-DD)")
+    parser.add_argument("--pattern", default="", help="only links containing pattern are used")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--synthetic", type=int, default=200, help="number of synthetic pages if none are recorded")
+    parser.add_argument("--output", help="save results to JSON file")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir, args.archive_dir, args.date, args.pattern)
+    if len(pages) == 0:
+        pages = synthetic_pages(args.site, args.extractor, args.synthetic)
+
+    results = benchmark(args.site, args.extractor, pages, args.repeat)
+    for backend, stats in results.items():
+        print("%-12s %s" % (backend, stats))
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump({"site": args.site, "extractor": args.extractor, "results": results}, output_file, indent=2)
@@ -0,0 +1,92 @@
+# Compare time of cleaning scraped tables (joining lists, removing new line marks) cell by cell (before) and by
+# whole columns (after) for growing number of offers
+
+# Add path to preprocessing scripts
+import sys
+sys.path.append('Preprocessing_scripts')
+sys.path.append('/content/Apartments/Preprocessing_scripts')
+sys.path.append('/Apartments/Preprocessing_scripts')
+
+# Libraries
+import argparse
+import json
+import time
+import pandas as pd
+from otodom import Preprocessing_Otodom
+from morizon import Preprocessing_Morizon
+from cleaning import OTODOM_NEW_LINE_MARKS, MORIZON_NEW_LINE_MARKS
+from preprocessing_fixtures import synthetic_otodom, synthetic_morizon
+
+
+# Cleaning cell by cell as remove_new_line_marks did before, with .at instead of chained .loc[:, column][index]
+# (which writes to a copy in recent pandas, but wrote to the table in pandas 1.2)
+def cell_by_cell_cleaning(apartment_details: pd.DataFrame, replacements: list) -> pd.DataFrame:
+    for information_type in apartment_details.columns:
+        for index in range(len(apartment_details)):
+            if type(apartment_details.at[index, information_type]) == list:
+                apartment_details.at[index, information_type] = list(
+                    filter(lambda x: x != "", apartment_details.at[index, information_type]))
+                try:
+                    apartment_details.at[index, information_type] = ', '.join(
+                        apartment_details.at[index, information_type])
+                except:
+                    continue
+    for information_type in apartment_details.columns:
+        for index in range(len(apartment_details)):
+            try:
+                value = apartment_details.at[index, information_type]
+                for old, new in replacements:
+                    value = value.replace(old, new)
+                apartment_details.at[index, information_type] = value
+            except:
+                continue
+    return apartment_details
+
+
+# Cleaning by whole columns as Preprocessing_Otodom and Preprocessing_Morizon do
+def column_cleaning(site: str, apartment_details: pd.DataFrame) -> pd.DataFrame:
+    preprocessing = Preprocessing_Otodom if site == "otodom" else Preprocessing_Morizon
+    return preprocessing(apartment_details=apartment_details,
+                         information_types=apartment_details.columns).remove_new_line_marks()
+
+
+# Seconds of cleaning a fresh copy of table
+def measure(clean, table: pd.DataFrame) -> tuple:
+    table = table.copy()
+    start = time.perf_counter()
+    cleaned = clean(table)
+    return time.perf_counter() - start, cleaned
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cleaning of scraped tables by columns against cell by cell")
+    parser.add_argument("--site", choices=["otodom", "morizon"], default="otodom")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--legacy-max", type=int, default=100000,
+                        help="cell by cell cleaning is measured only up to this number of rows")
+    parser.add_argument("--output", help="save results to JSON file")
+    args = parser.parse_args()
+
+    synthetic = synthetic_otodom if args.site == "otodom" else synthetic_morizon
+    replacements = OTODOM_NEW_LINE_MARKS if args.site == "otodom" else MORIZON_NEW_LINE_MARKS
+    report = []
+    for rows in args.rows:
+        table = synthetic(rows)
+        after, cleaned = measure(lambda frame: column_cleaning(args.site, frame), table)
+        result = {"rows": rows, "after_s": after, "after_us_per_row": after / rows * 1e6}
+        if rows <= args.legacy_max:
+            before, expected = measure(lambda frame: cell_by_cell_cleaning(frame, replacements), table)
+            result.update({"before_s": before, "before_us_per_row": before / rows * 1e6,
+                           "speedup": before / max(after, 1e-9),
+                           "identical": bool(cleaned.astype(object).equals(expected.astype(object)))})
+        report.append(result)
+
+        line = "%8d rows  after %8.3f s (%6.2f us/row)" % (rows, after, result["after_us_per_row"])
+        if "before_s" in result:
+            line += "  before %8.3f s (%7.2f us/row)  speedup %7.1fx  identical: %s" % (
+                result["before_s"], result["before_us_per_row"], result["speedup"], result["identical"])
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
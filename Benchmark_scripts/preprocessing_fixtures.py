@@ -0,0 +1,217 @@
+# Synthetic scraped tables of Otodom and Morizon with the same columns and kinds of values as scrapers return
+
+# Libraries
+import numpy as np
+import pandas as pd
+
+CITIES = [("Warszawa", "Mokotów", "mazowieckie"), ("Kraków", "Podgórze", "małopolskie"),
+          ("Wrocław", "Krzyki", "dolnośląskie"), ("Gdańsk", "Wrzeszcz", "pomorskie"), ("Łódź", None, "łódzkie")]
+STREETS = ["ul. Puławska", "ul. Wielicka", "ul. Powstańców Śląskich", "ul. Grunwaldzka", None]
+BUILDINGS = ["blok", "kamienica", "apartamentowiec", "dom wolnostojący"]
+MATERIALS = ["cegła", "wielka płyta", "żelbet", "pustak"]
+FLOORS = ["parter", "1", "2", "3/10", "suterena", "> 10"]
+PARAGRAPHS = ["Mieszkanie do wynajęcia od zaraz.\n\nDwa pokoje, kuchnia i łazienka z oknem.",
+              "Blisko metra, sklepów i parku.", "",
+              "Apartment for rent, close to the city centre.\n\nPets are welcome.",
+              "Czynsz administracyjny w cenie.\n\n\n\nKaucja zwrotna."]
+HEADERS = ["Wyposażenie", "Zabezpieczenia", "Media", "Informacje dodatkowe"]
+ADDITIONAL = ["meble", "", "lodówka", "pralka", "internet", "balkon", "domofon / wideofon"]
+
+
+# Polish formatted price e.g. "2 500 zł", "~450 000,50 EUR" or "Zapytaj o cenę"
+def polish_price(value: float, currency: str, approximate: bool = False, decimals: bool = False) -> str:
+    text = "{:,}".format(int(value)).replace(",", " ")
+    if decimals:
+        text += ",%02d" % int(round((value % 1) * 100))
+    return ("~" if approximate else "") + text + " " + currency
+
+
+def synthetic_otodom(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Table of scraped Otodom offers (columns of ScrapingOtodom details), with None as missing values like
+    in otodom_init
+
+    Parameters
+    ----------
+    rows: int
+        number of offers
+    seed: int
+        seed of random generator
+
+    Returns
+    ------
+    pd.DataFrame
+        scraped offers
+    """
+
+    rng = np.random.default_rng(seed)
+    # Offers are built from a pool of distinct ones, so millions of rows do not need millions of Python objects
+    pool = min(rows, 5000)
+    records = []
+    for number in range(pool):
+        city, district, voivodeship = CITIES[number % len(CITIES)]
+        street = STREETS[number % len(STREETS)]
+        area = round(float(rng.uniform(18, 160)), 2)
+        rooms = int(rng.integers(1, 6))
+        price = float(rng.integers(1500, 1200000))
+        currency = "zł" if number % 7 != 0 else "EUR"
+        details = ["Powierzchnia:%s m²" % ("%.2f" % area).replace(".", ","), "Liczba pokoi:%d" % rooms,
+                   "Piętro:%s" % FLOORS[number % len(FLOORS)], "Rodzaj zabudowy:%s" % BUILDINGS[number % 4],
+                   "Materiał budynku:%s" % MATERIALS[number % 4]]
+        if number % 3 == 0:
+            details.append("Rok budowy:%d" % (1950 + number % 70))
+        if number % 5 == 0:
+            details.append("Liczba pięter:%d" % (2 + number % 12))
+        record = {"Area": "%.2f" % area, "Build_year": str(1950 + number % 70) if number % 3 == 0 else None,
+                  "Building_floors_num": str(2 + number % 12) if number % 5 == 0 else None,
+                  "Building_material": MATERIALS[number % 4], "Building_type": BUILDINGS[number % 4],
+                  "Construction_status": "ready_to_use", "Deposit": None, "Floor_no": "floor_%d" % (number % 4),
+                  "Heating": "urban" if number % 2 else None, "Rent": str(int(rng.integers(200, 900))),
+                  "Rooms_num": str(rooms), "city": city, "district": district, "address": street,
+                  "voivodeship": voivodeship, "title": "Mieszkanie %d-pokojowe %s" % (rooms, city),
+                  "subtitle": [", ".join(part for part in [street, district, city] if part)],
+                  "price": [polish_price(price, currency)] if number % 11 != 0 else ["Zapytaj o cenę"],
+                  "additional_info_headers": HEADERS[:1 + number % len(HEADERS)],
+                  "additional_info": [ADDITIONAL[(number + shift) % len(ADDITIONAL)] for shift in range(3)],
+                  "details": details,
+                  "description": [PARAGRAPHS[(number + shift) % len(PARAGRAPHS)] for shift in range(1 + number % 4)],
+                  "lat": 52.0 + float(rng.uniform(-2, 2)), "lng": 19.0 + float(rng.uniform(-4, 4)),
+                  "link": "https://www.otodom.pl/pl/oferta/mieszkanie-%d" % number}
+        # Pages which changed their layout miss some fields
+        if number % 13 == 0:
+            record["details"] = np.nan
+            record["additional_info"] = []
+        records.append(record)
+
+    table = pd.DataFrame([records[index % pool] for index in range(rows)])
+    table["link"] = ["https://www.otodom.pl/pl/oferta/mieszkanie-%d" % index for index in range(rows)]
+    return table.astype(object).where(pd.notnull(table), None)
+
+
+def synthetic_morizon(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Table of scraped Morizon offers (columns of ScrapingMorizon details), with None as missing values like
+    in morizon_init
+
+    Parameters
+    ----------
+    rows: int
+        number of offers
+    seed: int
+        seed of random generator
+
+    Returns
+    ------
+    pd.DataFrame
+        scraped offers
+    """
+
+    rng = np.random.default_rng(seed)
+    pool = min(rows, 5000)
+    records = []
+    for number in range(pool):
+        city, district, voivodeship = CITIES[number % len(CITIES)]
+        street = STREETS[number % len(STREETS)]
+        area = float(rng.uniform(18, 160))
+        rooms = int(rng.integers(1, 6))
+        price = float(rng.integers(1500, 1200000))
+        currency = "zł" if number % 7 != 0 else "€"
+        path = ["Morizon", "Mieszkania", voivodeship, city] + [part for part in [district, street] if part]
+        table = ["Piętro: ", FLOORS[number % len(FLOORS)], "Typ budynku: ", BUILDINGS[number % 4].capitalize(),
+                 "Materiał budowlany: ", MATERIALS[number % 4].capitalize()]
+        if number % 3 == 0:
+            table += ["Rok budowy: ", str(1950 + number % 70)]
+        if number % 5 == 0:
+            table += ["Liczba pięter: ", str(2 + number % 12)]
+        record = {"title": ["Mieszkanie", city, district or ""],
+                  "subtitle": ["Mieszkanie na wynajem"], "localization_path": path,
+                  "price": [polish_price(price, "", number % 9 == 0, number % 4 == 0).strip(), currency],
+                  "priceM2": ["%d" % (price // area), currency + "/m²"],
+                  "area": [("%.2f" % area).replace(".", ","), "m²"], "rooms": [str(rooms)],
+                  "params_h3": ["Szczegóły ogłoszenia", "Budynek"],
+                  "params_tables": ["\n".join(table[index] + table[index + 1] for index in range(0, len(table), 2))
+                                    .replace("\n", " ,\n")],
+                  "params_p": [ADDITIONAL[(number + shift) % len(ADDITIONAL)] for shift in range(3)],
+                  "description": [PARAGRAPHS[(number + shift) % len(PARAGRAPHS)] for shift in range(1 + number % 4)],
+                  "lat": "%.6f" % (52.0 + float(rng.uniform(-2, 2))),
+                  "lng": "%.6f" % (19.0 + float(rng.uniform(-4, 4)))}
+        if number % 13 == 0:
+            record["price"] = ["Zapytaj o cenę"]
+            record["params_tables"] = np.nan
+        records.append(record)
+
+    table = pd.DataFrame([records[index % pool] for index in range(rows)])
+    table["link"] = ["https://www.morizon.pl/oferta/wynajem-mieszkanie-%d" % index for index in range(rows)]
+    return table.astype(object).where(pd.notnull(table), None)
+
+# Sentences of long multilingual descriptions
+SENTENCES = {
+    "pl": ["Do wynajęcia przestronne mieszkanie w spokojnej okolicy.",
+           "Mieszkanie składa się z dwóch pokoi, kuchni i łazienki z oknem.",
+           "W pobliżu znajdują się sklepy, szkoła, przedszkole oraz przystanek tramwajowy.",
+           "Czynsz administracyjny wynosi 600 zł miesięcznie i obejmuje wodę oraz ogrzewanie.",
+           "Budynek jest ocieplony, posiada windę i monitoring.",
+           "Kaucja w wysokości jednego czynszu jest zwrotna po zakończeniu umowy.",
+           "Lokal jest umeblowany i wyposażony w nowe sprzęty AGD.",
+           "Do centrum miasta dojedziesz komunikacją miejską w piętnaście minut.",
+           "Zapraszam do kontaktu telefonicznego w celu umówienia prezentacji.",
+           "Oferta skierowana do osób niepalących bez zwierząt.",
+           "Duży balkon wychodzi na zieloną stronę osiedla.",
+           "Piwnica i miejsce parkingowe w garażu podziemnym za dodatkową opłatą.",
+           "Nieruchomość dostępna od zaraz, minimalny okres najmu to rok.",
+           "Świetna lokalizacja blisko parku i ścieżek rowerowych.",
+           "Mieszkanie po generalnym remoncie, nowe okna i podłogi."],
+    "en": ["The apartment is located in a quiet neighbourhood close to the city centre.",
+           "It has two bedrooms, a fully equipped kitchen and a bathroom with a window.",
+           "Shops, schools and public transport are within walking distance.",
+           "The monthly rent includes water, heating and internet access.",
+           "The building has an elevator and a secure underground garage.",
+           "A deposit equal to one month of rent is required.",
+           "Pets are welcome and the flat is available immediately.",
+           "Please contact us to arrange a viewing at your convenience."],
+    "de": ["Die Wohnung befindet sich in einer ruhigen Gegend nahe dem Stadtzentrum.",
+           "Sie hat zwei Zimmer, eine voll ausgestattete Küche und ein Badezimmer.",
+           "Geschäfte und öffentliche Verkehrsmittel sind zu Fuß erreichbar.",
+           "Die Miete beinhaltet Wasser, Heizung und Internet."],
+    "uk": ["Квартира розташована в тихому районі поблизу центру міста.",
+           "Є дві кімнати, повністю обладнана кухня та ванна кімната.",
+           "Магазини та громадський транспорт знаходяться поруч."]}
+
+
+def long_descriptions(count: int, seed: int = 0, length: int = 18000) -> tuple:
+    """Descriptions longer than 16000 characters with Polish and foreign sentences, like offers written in many
+    languages, and language of every word
+
+    Parameters
+    ----------
+    count: int
+        number of descriptions
+    seed: int
+        seed of random generator
+    length: int
+        minimum number of characters of description
+
+    Returns
+    ------
+    tuple
+        descriptions and for every description languages of its words (after removing "," and "-" like
+        prepare_description_table)
+    """
+
+    rng = np.random.default_rng(seed)
+    languages = list(SENTENCES)
+    descriptions, word_languages = [], []
+    for _ in range(count):
+        # Every description has its own mix of languages, mostly Polish
+        weights = rng.dirichlet([6, 2, 1, 1])
+        sentences, labels, size = [], [], 0
+        while size < length:
+            language = languages[rng.choice(len(languages), p=weights)]
+            # Foreign parts come in paragraphs of a few sentences
+            for _ in range(int(rng.integers(1, 4))):
+                sentence = SENTENCES[language][int(rng.integers(len(SENTENCES[language])))]
+                sentences.append(sentence)
+                labels += [language] * len(sentence.replace(",", "").replace("-", "").split())
+                size += len(sentence) + 1
+        descriptions.append(" ".join(sentences))
+        word_languages.append(labels)
+
+    return descriptions, word_languages
@@ -0,0 +1,93 @@
+# Compare Polish parts of long descriptions found by langdetect for every part (before) and by Polish and foreign
+# words with langdetect only for unclear parts (after): time and agreement
+
+# Add path to preprocessing scripts
+import sys
+sys.path.append('Preprocessing_scripts')
+sys.path.append('/content/Apartments/Preprocessing_scripts')
+sys.path.append('/Apartments/Preprocessing_scripts')
+
+# Libraries
+import argparse
+import json
+import time
+import numpy as np
+from langdetect import detect
+from language import is_polish, polish_texts, detect_language, CHUNK_WORDS
+from preprocessing_fixtures import long_descriptions
+
+
+# Parts of description checked by langdetect one after another as prepare_description_table did before
+def langdetect_decisions(description: str) -> list:
+    text = ' '.join(description.replace(",", "").replace("-", "").split(" ")).split()
+    decisions = []
+    for x in range(0, len(text), CHUNK_WORDS):
+        element = list(map(str.lower, text[x:x + CHUNK_WORDS]))
+        try:
+            language = detect(" ".join(element))
+        except:
+            language = 'pl'
+        decisions.append(language == 'pl')
+
+    return decisions
+
+
+# Parts of description checked by is_polish
+def fast_decisions(description: str) -> list:
+    text = description.replace(",", "").replace("-", "").split()
+    return [is_polish(" ".join(text[x:x + CHUNK_WORDS]).lower()) for x in range(0, len(text), CHUNK_WORDS)]
+
+
+# Whether most words of every part are Polish
+def true_decisions(word_languages: list) -> list:
+    return [np.mean([language == "pl" for language in word_languages[x:x + CHUNK_WORDS]]) >= 0.5
+            for x in range(0, len(word_languages), CHUNK_WORDS)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Polish parts of long descriptions: word scorer against langdetect")
+    parser.add_argument("--descriptions", type=int, default=40, help="number of descriptions over 16000 characters")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4],
+                        help="numbers of processes of the pool measured")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="save results to JSON file")
+    args = parser.parse_args()
+
+    descriptions, word_languages = long_descriptions(args.descriptions, args.seed)
+
+    start = time.perf_counter()
+    before = [langdetect_decisions(description) for description in descriptions]
+    before_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = [fast_decisions(description) for description in descriptions]
+    after_s = time.perf_counter() - start
+    cache = detect_language.cache_info()
+
+    before_flat = np.concatenate(before)
+    after_flat = np.concatenate(after)
+    truth = np.concatenate([true_decisions(languages) for languages in word_languages])
+    report = {"descriptions": len(descriptions), "chunks": int(len(truth)),
+              "langdetect_calls_before": int(len(truth)), "langdetect_calls_after": cache.misses,
+              "before_s": before_s, "after_s": after_s, "speedup": before_s / max(after_s, 1e-9),
+              "agreement_with_langdetect": float(np.mean(before_flat == after_flat)),
+              "langdetect_accuracy": float(np.mean(before_flat == truth)),
+              "after_accuracy": float(np.mean(after_flat == truth))}
+    print("%d descriptions, %d parts  before %.2f s  after %.2f s  speedup %.1fx  langdetect calls %d -> %d" % (
+        report["descriptions"], report["chunks"], before_s, after_s, report["speedup"],
+        report["langdetect_calls_before"], report["langdetect_calls_after"]))
+    print("agreement with langdetect %.4f  accuracy on known languages: langdetect %.4f  after %.4f" % (
+        report["agreement_with_langdetect"], report["langdetect_accuracy"], report["after_accuracy"]))
+
+    # Whole descriptions filtered in pools of processes (every process starts with empty memory of texts)
+    report["pool_s"] = {}
+    for processes in args.processes:
+        detect_language.cache_clear()
+        start = time.perf_counter()
+        polish_texts(descriptions, processes)
+        report["pool_s"][processes] = time.perf_counter() - start
+        print("%d processes  %.2f s" % (processes, report["pool_s"][processes]))
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
@@ -0,0 +1,93 @@
+# Compare time of creating params table (rooms, floor, year of building, ...) by concatenating one row tables
+# (before) and by collecting columns (after) for growing number of offers
+
+# Add path to preprocessing scripts
+import sys
+sys.path.append('Preprocessing_scripts')
+sys.path.append('/content/Apartments/Preprocessing_scripts')
+sys.path.append('/Apartments/Preprocessing_scripts')
+
+# Libraries
+import argparse
+import json
+import time
+import pandas as pd
+from otodom import Preprocessing_Otodom
+from morizon import Preprocessing_Morizon
+from cleaning import split_otodom_params, split_morizon_params
+from preprocessing_fixtures import synthetic_otodom, synthetic_morizon
+
+
+# Params table built as prepare_table_information did before, one row table concatenated for every offer
+def concatenated_params_table(table: pd.Series, split_params) -> pd.DataFrame:
+    prepared_table = []
+    params_table = pd.DataFrame()
+    for index, row in enumerate(table):
+        try:
+            to_append = dict([x for x in zip(*[iter(split_params(row))] * 2)])
+            prepared_table.append(to_append)
+        except:
+            prepared_table.append(None)
+    for i in range(len(prepared_table)):
+        column = []
+        row = []
+        try:
+            for key, value in prepared_table[i].items():
+                column.append(key.strip(':'))
+                row.append(value)
+        except:
+            row.append(None)
+        df_temp = pd.DataFrame([row], columns=column)
+        params_table = pd.concat([params_table, df_temp], ignore_index=True)
+
+    return params_table.astype(object).where(pd.notnull(params_table), None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Params table collected by columns against concatenated rows")
+    parser.add_argument("--site", choices=["otodom", "morizon"], default="otodom")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 20000, 100000, 1000000])
+    parser.add_argument("--legacy-max", type=int, default=20000,
+                        help="concatenated rows are measured only up to this number of rows")
+    parser.add_argument("--output", help="save results to JSON file")
+    args = parser.parse_args()
+
+    if args.site == "otodom":
+        synthetic, preprocessing, column, split_params = \
+            synthetic_otodom, Preprocessing_Otodom, "details", split_otodom_params
+    else:
+        synthetic, preprocessing, column, split_params = \
+            synthetic_morizon, Preprocessing_Morizon, "params_tables", split_morizon_params
+
+    report = []
+    for rows in args.rows:
+        scraped = synthetic(rows)
+        site = preprocessing(apartment_details=scraped, information_types=scraped.columns)
+        # The old way fails on offers without params, they are compared as empty texts
+        table = site.remove_new_line_marks()[column].fillna("")
+
+        start = time.perf_counter()
+        params = site.prepare_table_information(table)
+        after = time.perf_counter() - start
+        result = {"rows": rows, "after_s": after, "after_us_per_row": after / rows * 1e6}
+        line = "%8d rows  after %8.3f s (%6.2f us/row)" % (rows, after, result["after_us_per_row"])
+
+        if rows <= args.legacy_max:
+            start = time.perf_counter()
+            expected = concatenated_params_table(table, split_params)
+            before = time.perf_counter() - start
+            # Keys consumed by create_table are columns also when no offer has them
+            extra = [key for key in params.columns if key not in expected.columns]
+            identical = (expected.equals(params[expected.columns])
+                         and bool(params[extra].isna().all().all()))
+            result.update({"before_s": before, "before_us_per_row": before / rows * 1e6,
+                           "speedup": before / max(after, 1e-9), "identical": identical})
+            line += "  before %8.3f s (%7.2f us/row)  speedup %7.1fx  identical: %s" % (
+                before, result["before_us_per_row"], result["speedup"], identical)
+
+        report.append(result)
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
@@ -0,0 +1,66 @@
+# Compare time of preprocessing the whole scraped table in one process (before) and in shards of rows in a pool of
+# processes (after), and check that both give the same table
+
+# Add path to preprocessing scripts
+import sys
+sys.path.append('Preprocessing_scripts')
+sys.path.append('/content/Apartments/Preprocessing_scripts')
+sys.path.append('/Apartments/Preprocessing_scripts')
+
+# Libraries
+import argparse
+import json
+import os
+import time
+import pandas as pd
+from otodom import Preprocessing_Otodom
+from morizon import Preprocessing_Morizon
+from partitioned import create_table_partitioned
+from language import detect_language
+from preprocessing_fixtures import synthetic_otodom, synthetic_morizon, long_descriptions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Preprocessing in shards of rows against the whole table at once")
+    parser.add_argument("--site", choices=["otodom", "morizon"], default="otodom")
+    parser.add_argument("--rows", type=int, default=50000, help="number of scraped offers")
+    parser.add_argument("--long-descriptions", type=int, default=8, help="offers with descriptions over 16000 characters")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--output", help="save results to JSON file")
+    args = parser.parse_args()
+
+    synthetic, preprocessing = ((synthetic_otodom, Preprocessing_Otodom) if args.site == "otodom"
+                                else (synthetic_morizon, Preprocessing_Morizon))
+    scraped = synthetic(args.rows)
+    # Long descriptions are spread over the table, so every shard gets some
+    descriptions, _ = long_descriptions(args.long_descriptions)
+    for number, description in enumerate(descriptions):
+        scraped.at[(number * args.rows) // max(len(descriptions), 1), "description"] = [description]
+
+    # Every measurement starts with empty memory of detected texts
+    detect_language.cache_clear()
+    start = time.perf_counter()
+    expected = preprocessing(apartment_details=scraped.copy(), information_types=scraped.columns,
+                             language_processes=1).create_table()
+    before = time.perf_counter() - start
+    report = {"rows": args.rows, "cpus": os.cpu_count(), "before_s": before, "after_s": {}, "identical": {}}
+    print("%d rows on %d CPUs  one process %.2f s" % (args.rows, os.cpu_count(), before))
+
+    for processes in sorted(set(args.processes)):
+        detect_language.cache_clear()
+        start = time.perf_counter()
+        table = create_table_partitioned(preprocessing, scraped, processes=processes)
+        after = time.perf_counter() - start
+        # Text columns of shards without any text are object instead of str in recent pandas, so only dtypes of
+        # numeric and categorical columns are compared
+        typed = [column for column in expected.columns if (expected[column].dtype.kind == "f")
+                 or isinstance(expected[column].dtype, pd.CategoricalDtype)]
+        identical = bool(table.astype(object).equals(expected.astype(object))
+                         and (table[typed].dtypes == expected[typed].dtypes).all())
+        report["after_s"][processes] = after
+        report["identical"][processes] = identical
+        print("%2d processes  %.2f s  speedup %.2fx  identical: %s" % (processes, after, before / after, identical))
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
@@ -0,0 +1,112 @@
+# Compare time of reading prices, areas and currencies character by character and row by row (before) and with
+# one regular expression over whole columns (after) for growing number of offers
+
+# Add path to preprocessing scripts
+import sys
+sys.path.append('Preprocessing_scripts')
+sys.path.append('/content/Apartments/Preprocessing_scripts')
+sys.path.append('/Apartments/Preprocessing_scripts')
+
+# Libraries
+import argparse
+import json
+import time
+import numpy as np
+import pandas as pd
+from cleaning import parse_numbers
+from preprocessing_fixtures import synthetic_otodom, synthetic_morizon
+
+
+# Price and currency read as Preprocessing_Otodom.extract_price did before, digits kept character by character
+def otodom_prices_by_characters(price_table: pd.Series) -> tuple:
+    price_table = price_table.copy()
+    currency = []
+    for i in range(len(price_table)):
+        try:
+            filtered_str = filter(lambda sign: sign in [',', '.'] or str.isdigit(sign), ''.join(price_table[i]))
+            only_digit = "".join(filtered_str)
+            if only_digit == "" or only_digit == None:
+                price_table[i] = None
+                currency.append(None)
+            else:
+                currency.append(''.join(price_table[i]).split()[-1])
+                price_table[i] = float(only_digit.replace(",", "."))
+        except:
+            price_table[i] = None
+            currency.append(None)
+
+    return price_table, currency
+
+
+# Number and currency read as Preprocessing_Morizon did before (every row is tried, the old lambda gave up on whole
+# column when one offer had no number)
+def morizon_numbers_by_rows(table: pd.Series) -> tuple:
+    numbers, currency = [], []
+    for value in table:
+        try:
+            numbers.append(float(value[0].replace(",", ".").replace(" ", "").replace("~", "")))
+        except:
+            numbers.append(None)
+        try:
+            currency.append(value[-1])
+        except:
+            currency.append(None)
+
+    return numbers, currency
+
+
+# Share of offers with equal number and unit in both ways
+def agreement(before_numbers, before_units, after: pd.DataFrame) -> float:
+    before_numbers = pd.to_numeric(pd.Series(list(before_numbers), dtype=object), errors="coerce").to_numpy(float)
+    after_numbers = after["value"].to_numpy(float)
+    same_number = (before_numbers == after_numbers) | (np.isnan(before_numbers) & np.isnan(after_numbers))
+    # Texts without number (e.g. "Zapytaj o cenę") had the text itself as currency before
+    after_units = after["unit"].astype(object).where(after["unit"].notna(), None).tolist()
+    same_unit = [(before == after_unit) or (after_unit is None and np.isnan(number))
+                 for before, after_unit, number in zip(before_units, after_units, after_numbers)]
+    return float(np.mean(same_number & np.array(same_unit)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prices read with regular expression against character by character")
+    parser.add_argument("--site", choices=["otodom", "morizon"], default="otodom")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--legacy-max", type=int, default=100000,
+                        help="the old way is measured only up to this number of rows")
+    parser.add_argument("--output", help="save results to JSON file")
+    args = parser.parse_args()
+
+    report = []
+    for rows in args.rows:
+        if args.site == "otodom":
+            # Price lists are joined by remove_new_line_marks before extract_price
+            prices = synthetic_otodom(rows)["price"].str.join(", ")
+            before_way = otodom_prices_by_characters
+        else:
+            prices = synthetic_morizon(rows)["price"]
+            before_way = morizon_numbers_by_rows
+
+        start = time.perf_counter()
+        parsed = parse_numbers(prices)
+        after = time.perf_counter() - start
+        # Every distinct text is parsed once, so the share of repeated prices matters
+        distinct = int(prices.astype(str).nunique())
+        result = {"rows": rows, "distinct": distinct, "after_s": after, "after_us_per_row": after / rows * 1e6}
+        line = "%8d rows (%6d distinct)  after %8.3f s (%6.2f us/row)" % (rows, distinct, after,
+                                                                          result["after_us_per_row"])
+
+        if rows <= args.legacy_max:
+            start = time.perf_counter()
+            numbers, currency = before_way(prices)
+            before = time.perf_counter() - start
+            result.update({"before_s": before, "before_us_per_row": before / rows * 1e6,
+                           "speedup": before / max(after, 1e-9), "agreement": agreement(numbers, currency, parsed)})
+            line += "  before %8.3f s (%6.2f us/row)  speedup %6.1fx  agreement %.4f" % (
+                before, result["before_us_per_row"], result["speedup"], result["agreement"])
+
+        report.append(result)
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
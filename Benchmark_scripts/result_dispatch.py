@@ -0,0 +1,135 @@
+# Compare per-split overhead of sentinel results (before) and FetchResult status dispatch (after)
+
+# Add path to scraping scripts
+import sys
+sys.path.append('Scraping')
+sys.path.append('/content/Apartments/Scraping')
+sys.path.append('/Apartments/Scraping')
+
+# Libraries
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from collections import defaultdict
+import numpy as np
+from fetchResult import FetchResult, OK, FAILED, GONE
+
+PAGE_NAME = "https://www.otodom.pl"
+
+
+# Synthetic results of one details split
+def make_split(split_size: int, failed_share: float, gone_share: float, seed: int = 0):
+    """Synthetic results of one details split in both formats
+
+    Parameters
+    ----------
+    split_size: int
+        number of links in split
+    failed_share: float
+        share of links which were not scraped
+    gone_share: float
+        share of offers which no longer exist
+    seed: int
+        seed of random generator
+
+    Returns
+    ------
+    list, list
+        1. sentinel results (details, link or "Does not exist")
+        2. FetchResult objects
+    """
+
+    generator = random.Random(seed)
+    sentinels, results = [], []
+    for number in range(split_size):
+        link = "%s/pl/oferta/mieszkanie-%d" % (PAGE_NAME, number)
+        draw = generator.random()
+        if draw < failed_share:
+            sentinels.append(link)
+            results.append(FetchResult(FAILED, link, error=TimeoutError()))
+        elif draw < failed_share + gone_share:
+            sentinels.append("Does not exist")
+            results.append(FetchResult(GONE, link))
+        else:
+            details = defaultdict(list, {"title": ["Mieszkanie %d" % number], "price": ["2 500 zł"],
+                                         "details": ["Powierzchnia", "48 m²"], "description": ["Opis"] * 5,
+                                         "lat": 52.2, "lng": 21.0, "link": link})
+            sentinels.append(details)
+            results.append(FetchResult(OK, link, details))
+
+    return sentinels, results
+
+
+# Flatten a list (as in Scraper.flatten)
+def flatten(result_to_flatt):
+    rt = []
+    for i in result_to_flatt:
+        if isinstance(i, list):
+            rt.extend(flatten(i))
+        else:
+            rt.append(i)
+    return rt
+
+
+# Post-processing of split before FetchResult (filter, flatten, join_missed_with_scraped, final filter)
+def process_sentinels(results_details, retried):
+    missed_details = [details for details in results_details if "www.otodom.pl" in details]
+    results_details = flatten([details for details in results_details
+                               if (details != None) & ("www.otodom.pl" not in details)])
+    missed = [retried]
+    if len(missed) > 1:
+        missed = [properties for properties in flatten(missed) if properties != None]
+        results_details = np.concatenate([flatten(results_details), missed], axis=0)
+    elif len(missed) == 1:
+        results_details = np.concatenate([flatten(results_details), flatten(missed[0])], axis=0)
+    return [result for result in results_details if
+            (result != "Does not exist") & (result != None) & ("www.otodom.pl" not in result)], missed_details
+
+
+# Post-processing of split with FetchResult
+def process_results(results_details):
+    return [result.payload for result in results_details if result.status == OK]
+
+
+# Time and peak memory of function, the fastest of repeats
+def measure(func, *args, repeat: int = 5) -> dict:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"ms": min(times) * 1000, "peak_kb": peak / 1024}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-split overhead of result post-processing")
+    parser.add_argument("--split-sizes", type=int, nargs="+", default=[100, 500, 1000, 5000])
+    parser.add_argument("--failed-share", type=float, default=0.05)
+    parser.add_argument("--gone-share", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="save results to JSON file")
+    args = parser.parse_args()
+
+    report = []
+    for split_size in args.split_sizes:
+        sentinels, results = make_split(split_size, args.failed_share, args.gone_share)
+        # Retry pass of the old code returns details of missed links in one list
+        retried = [details for details in sentinels if isinstance(details, dict)][:int(split_size * args.failed_share)]
+        before = measure(process_sentinels, sentinels, retried, repeat=args.repeat)
+        after = measure(process_results, results, repeat=args.repeat)
+        report.append({"split_size": split_size, "before": before, "after": after,
+                       "speedup": before["ms"] / max(after["ms"], 1e-9)})
+        print("split %6d  before %8.2f ms %8.1f KiB  after %8.2f ms %8.1f KiB  speedup %.1fx"
+              % (split_size, before["ms"], before["peak_kb"], after["ms"], after["peak_kb"], report[-1]["speedup"]))
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
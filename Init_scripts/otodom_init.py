@@ -1,68 +1,102 @@
-# Add path to scraping scripts
-import sys
-sys.path.append('Scraping')
-sys.path.append('Database_scripts')
-sys.path.append('Preprocessing scripts')
-
-#Colab paths
-sys.path.append('/content/Apartments')
-sys.path.append('/content/Apartments/Scraping')
-sys.path.append('/content/Apartments/Database_scripts')
-sys.path.append('/content/Apartments/Preprocessing_scripts')
-sys.path.append('/Apartments/Scraping')
-sys.path.append('/Apartments/Database_scripts')
-sys.path.append('/Apartments/Preprocessing_scripts')
-
-from otodomScraper import ScrapingOtodom
-from db_manipulation import DatabaseManipulation
-from otodom import Preprocessing_Otodom
-import pandas as pd
-import configparser
-import urllib
-from sqlalchemy import create_engine
-
-if __name__ == "__main__":
-    # Database connection
-
-    config = configparser.ConfigParser()
-    config.read('/content/Apartments/Database_scripts/config.ini')
-
-    database_manipulation = DatabaseManipulation(config = config, config_database = "DATABASE", table_name_links = "active_links",
-                                                 table_name_offers = "preprocessing_offers", table_name_to_scrape = "to_scrape",
-                                                 table_name_process_stage = "process_stage", split_size = 1000)
-
-    # ===Otodom===
-    otodom_scraper = ScrapingOtodom(page='https://www.otodom.pl/wynajem/mieszkanie/', page_name='https://www.otodom.pl', max_threads=20)
-
-    # Get links to scrape
-    otodom_pages = otodom_scraper.get_pages()
-    otodom_offers = otodom_scraper.get_offers(pages=otodom_pages, split_size=100)
-    to_scrape = database_manipulation.push_to_database_links(activeLinks = otodom_offers, page_name = "Otodom")
-
-    #Push to scrape links to database
-    del database_manipulation
-    database_manipulation = DatabaseManipulation(config = config, config_database = "DATABASE", table_name_links = "active_links",
-                                                 table_name_offers = "preprocessing_offers", table_name_to_scrape = "to_scrape",
-                                                 table_name_process_stage = "process_stage", split_size = 1000)
-
-
-    database_manipulation.push_to_scrape(to_scrape, "Otodom")
-
-    # Scrape details
-    otodom_scraped = otodom_scraper.get_details(offers=list(to_scrape["link"]),split_size=500)
-
-    # Prepare offers to insert into table
-    otodom_scraped_c = otodom_scraped.copy().reset_index().drop(['index'], axis=1)
-    otodom_preprocess = Preprocessing_Otodom(apartment_details=otodom_scraped_c.where(pd.notnull(otodom_scraped_c), None),
-                                             information_types=otodom_scraped_c.columns)
-    otodom_table = otodom_preprocess.create_table()
-    otodom_table=otodom_table.where(pd.notnull(otodom_table), None)
-
-    # Insert details into table
-    del database_manipulation
-    database_manipulation = DatabaseManipulation(config = config, config_database = "DATABASE", table_name_links = "active_links",
-                                                 table_name_offers = "preprocessing_offers", table_name_to_scrape = "to_scrape",
-                                                 table_name_process_stage = "process_stage", split_size = 1000)
-
-    database_manipulation.push_to_database_offers(offers=otodom_table, page_name = "Otodom")
-
+# Add path to scraping scripts
+import sys
+sys.path.append('Scraping')
+sys.path.append('Database_scripts')
+sys.path.append('Preprocessing scripts')
+
+#Colab paths
+sys.path.append('/content/Apartments')
+sys.path.append('/content/Apartments/Scraping')
+sys.path.append('/content/Apartments/Database_scripts')
+sys.path.append('/content/Apartments/Preprocessing_scripts')
+sys.path.append('/Apartments/Scraping')
+sys.path.append('/Apartments/Database_scripts')
+sys.path.append('/Apartments/Preprocessing_scripts')
+
+from otodomScraper import ScrapingOtodom
+from db_manipulation import DatabaseManipulation
+from otodom import Preprocessing_Otodom
+from partitioned import create_table_partitioned
+import pandas as pd
+import configparser
+import urllib
+from sqlalchemy import create_engine
+
+if __name__ == "__main__":
+    # --incremental reads listings from the newest offers until known ones (e.g. hourly),
+    # --check-removed also looks for removed offers
+    incremental = "--incremental" in sys.argv
+    check_removed = "--check-removed" in sys.argv
+
+    # Database connection
+
+    config = configparser.ConfigParser()
+    config.read('/content/Apartments/Database_scripts/config.ini')
+
+    database_manipulation = DatabaseManipulation(config = config, config_database = "DATABASE", table_name_links = "active_links",
+                                                 table_name_offers = "preprocessing_offers", table_name_to_scrape = "to_scrape",
+                                                 table_name_process_stage = "process_stage", split_size = 1000)
+
+    # ===Otodom===
+    otodom_scraper = ScrapingOtodom(page='https://www.otodom.pl/wynajem/mieszkanie/', page_name='https://www.otodom.pl', max_threads=30,
+                                    adaptive_concurrency=True)
+
+    # Get links to scrape
+    if incremental:
+        # Only listing pages with new offers are read
+        with otodom_scraper.metrics.stage("database"):
+            known_links = database_manipulation.select_active_links(page_name = "Otodom")
+        otodom_offers = otodom_scraper.get_new_offers(known_links=known_links)
+        with otodom_scraper.metrics.stage("database"):
+            to_scrape = database_manipulation.push_to_database_new_links(newLinks = otodom_offers, page_name = "Otodom")
+
+        # Removed offers are found with HEAD requests
+        if check_removed:
+            removed_links = otodom_scraper.find_removed_offers(sorted(known_links))
+            with otodom_scraper.metrics.stage("database"):
+                database_manipulation.push_removed_links(removeLinks = removed_links, page_name = "Otodom")
+    else:
+        otodom_pages = otodom_scraper.get_pages()
+        otodom_offers = otodom_scraper.get_offers(pages=otodom_pages, split_size=100)
+        with otodom_scraper.metrics.stage("database"):
+            to_scrape = database_manipulation.push_to_database_links(activeLinks = otodom_offers, page_name = "Otodom")
+
+    #Push to scrape links to database
+    del database_manipulation
+    database_manipulation = DatabaseManipulation(config = config, config_database = "DATABASE", table_name_links = "active_links",
+                                                 table_name_offers = "preprocessing_offers", table_name_to_scrape = "to_scrape",
+                                                 table_name_process_stage = "process_stage", split_size = 1000)
+
+
+    with otodom_scraper.metrics.stage("database"):
+        database_manipulation.push_to_scrape(to_scrape, "Otodom")
+
+    # Scrape details
+    otodom_scraped = otodom_scraper.get_details(offers=list(to_scrape["link"]),split_size=500)
+
+    # Prepare offers to insert into table
+    with otodom_scraper.metrics.stage("preprocessing"):
+        otodom_scraped_c = otodom_scraped.copy().reset_index().drop(['index'], axis=1)
+        # Shards of offers are preprocessed in parallel processes
+        otodom_table = create_table_partitioned(Preprocessing_Otodom, otodom_scraped_c.where(pd.notnull(otodom_scraped_c), None))
+        otodom_table=otodom_table.where(pd.notnull(otodom_table), None)
+
+    # Insert details into table
+    del database_manipulation
+    database_manipulation = DatabaseManipulation(config = config, config_database = "DATABASE", table_name_links = "active_links",
+                                                 table_name_offers = "preprocessing_offers", table_name_to_scrape = "to_scrape",
+                                                 table_name_process_stage = "process_stage", split_size = 1000)
+
+    with otodom_scraper.metrics.stage("database"):
+        database_manipulation.push_to_database_offers(offers=otodom_table, page_name = "Otodom")
+
+    # Concurrency levels settled for every host
+    print(otodom_scraper.concurrency.report())
+
+    # Requests, failures, latency and time of every stage
+    otodom_scraper.metrics.write("otodom_metrics.prom")
+    otodom_scraper.metrics.write("otodom_metrics.json")
+
+    # Threads, processes and archive of scraper
+    otodom_scraper.close()
+
@@ -0,0 +1,232 @@
+import re
+import pandas as pd
+import numpy as np
+from typing import Callable, List, Tuple
+
+# New line marks replaced in texts of offers
+OTODOM_NEW_LINE_MARKS = [('\n\n', ', '), (', ,', ','), ('\\xa0', ' ')]
+MORIZON_NEW_LINE_MARKS = [('\n\n\n\n', ', '), ("\n", ''), (",,", ",")]
+
+# Keys of params tables read by create_table, they are columns even if no offer has them
+OTODOM_PARAMS = ["Liczba pokoi", "Liczba pięter", "Piętro", "Rodzaj zabudowy", "Materiał budynku", "Rok budowy"]
+MORIZON_PARAMS = ["Liczba pięter", "Piętro", "Typ budynku", "Materiał budowlany", "Rok budowy"]
+
+# Number in Polish format followed by unit e.g. "~450 000,50 zł", "48,5 m²", "2 500 EUR/mc"
+NUMBER_WITH_UNIT = re.compile(r'^\D*?(?P<number>\d+(?:[ \xa0\u202f]\d{3})*(?:[,.]\d+)?)\s*(?P<unit>.*?)\s*$', re.S)
+# Thousands separators (space, no-break space and narrow no-break space)
+THOUSANDS_SEPARATORS = re.compile('[ \xa0\u202f]')
+
+
+def text_columns(apartment_details: pd.DataFrame, information_types: List[str]) -> List[str]:
+    """Columns which can hold lists or strings, numeric columns are skipped without looking at their values.
+    Parameters
+    ----------
+    apartment_details: pd.DataFrame
+        data frame with information about apartments.
+    information_types: list
+        names of columns.
+    Returns
+    ------
+    columns: list
+        names of object and string columns.
+    """
+    return [information_type for information_type in information_types
+            if (apartment_details[information_type].dtype == object)
+            or pd.api.types.is_string_dtype(apartment_details[information_type].dtype)]
+
+
+def join_list(values: list):
+    """Remove empty strings from list and join it with commas, list with other elements than strings is only filtered.
+    Parameters
+    ----------
+    values: list
+        list from offer (e.g. title, details).
+    Returns
+    ------
+    joined: str or list
+        joined strings or filtered list.
+    """
+    values = [value for value in values if value != ""]
+    try:
+        return ', '.join(values)
+    except TypeError:
+        return values
+
+
+def join_lists(column: pd.Series) -> pd.Series:
+    """Join lists of column with join_list, other values are kept.
+    Parameters
+    ----------
+    column: pd.Series
+        column of apartments table.
+    Returns
+    ------
+    column: pd.Series
+        the same column if it has no lists, otherwise new column with joined lists.
+    """
+    values = column.to_numpy(dtype=object)
+    is_list = np.fromiter((type(value) is list for value in values), dtype=bool, count=len(values))
+    if not is_list.any():
+        return column
+
+    values = values.copy()
+    values[is_list] = [join_list(value) for value in values[is_list]]
+    return pd.Series(values, index=column.index, name=column.name, dtype=object)
+
+
+def replace_in_strings(column: pd.Series, replacements: List[Tuple[str, str]]) -> pd.Series:
+    """Replace substrings in strings of column one replacement after another, other values are kept.
+    Parameters
+    ----------
+    column: pd.Series
+        column of apartments table.
+    replacements: list
+        pairs of substring and its replacement.
+    Returns
+    ------
+    column: pd.Series
+        the same column if it has no strings, otherwise new column with replaced substrings.
+    """
+    values = column.to_numpy(dtype=object)
+    is_str = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=len(values))
+    if not is_str.any():
+        return column
+
+    strings = pd.Series(values[is_str], dtype=object)
+    for old, new in replacements:
+        strings = strings.str.replace(old, new, regex=False)
+
+    values = values.copy()
+    values[is_str] = strings.to_numpy(dtype=object)
+    return pd.Series(values, index=column.index, name=column.name, dtype=column.dtype)
+
+
+def remove_quotation_marks(apartment_details: pd.DataFrame, information_types: List[str]) -> pd.DataFrame:
+    """Join lists of strings in columns with commas (empty strings are removed), columns are changed in place.
+    Parameters
+    ----------
+    apartment_details: pd.DataFrame
+        data frame with information about apartments.
+    information_types: list
+        names of columns from which quotation marks need to be removed.
+    Returns
+    ------
+    apartment_details: pd.DataFrame
+        data frame with information about apartments.
+    """
+    for information_type in text_columns(apartment_details, information_types):
+        column = apartment_details[information_type]
+        cleaned = join_lists(column)
+        if cleaned is not column:
+            apartment_details[information_type] = cleaned
+    return apartment_details
+
+
+def remove_new_line_marks(apartment_details: pd.DataFrame, information_types: List[str],
+                          replacements: List[Tuple[str, str]]) -> pd.DataFrame:
+    """Replace new line marks in strings of columns, columns are changed in place.
+    Parameters
+    ----------
+    apartment_details: pd.DataFrame
+        data frame with information about apartments.
+    information_types: list
+        names of columns from which new line marks need to be removed.
+    replacements: list
+        pairs of substring and its replacement e.g. OTODOM_NEW_LINE_MARKS.
+    Returns
+    ------
+    apartment_details: pd.DataFrame
+        data frame where new line marks was removed.
+    """
+    for information_type in text_columns(apartment_details, information_types):
+        column = apartment_details[information_type]
+        cleaned = replace_in_strings(column, replacements)
+        if cleaned is not column:
+            apartment_details[information_type] = cleaned
+    return apartment_details
+
+
+def split_otodom_params(row: str) -> List[str]:
+    """Keys and values of Otodom details one after another e.g. "Powierzchnia:48 m², Liczba pokoi:2"."""
+    return row.replace(":", ", ").replace(" ,", "").split(", ")
+
+
+def split_morizon_params(row: str) -> List[str]:
+    """Keys and values of Morizon params table one after another e.g. "Piętro: 2 ,Typ budynku: Blok"."""
+    return [part.strip() for part in row.replace(":", " ,").split(" ,")]
+
+
+def params_table(table: pd.Series, split_params: Callable[[str], List[str]], schema: List[str]) -> pd.DataFrame:
+    """Create table of params (one column for every key) from texts with keys and values. Values are collected
+    in lists of columns and the table is created once at the end.
+    Parameters
+    ----------
+    table: pd.Series
+        column with params of offers e.g. details.
+    split_params: function
+        splits text into keys and values one after another e.g. split_otodom_params.
+    schema: list
+        keys which are columns of table even if no offer has them e.g. OTODOM_PARAMS.
+    Returns
+    ------
+    params: pd.DataFrame
+        table with columns of schema and then other keys in order of appearance, None if offer has no key.
+    """
+    rows = len(table)
+    columns = {key: [None] * rows for key in schema}
+    for position, row in enumerate(table):
+        # Offer without params (e.g. None) has only missing values
+        try:
+            params = split_params(row)
+        except (AttributeError, TypeError):
+            continue
+
+        for key, value in dict(zip(*[iter(params)] * 2)).items():
+            key = key.strip(':')
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * rows
+            column[position] = value
+
+    index = table.index if isinstance(table, pd.Series) else None
+    return pd.DataFrame(columns, index=index, dtype=object)
+
+
+def parse_numbers(column: pd.Series) -> pd.DataFrame:
+    """Read numbers in Polish format and their units from whole column e.g. price "~450 000,50 zł" or area
+    ["48,5", "m²"] (parts of lists are joined with spaces). Every distinct text is parsed once.
+    Parameters
+    ----------
+    column: pd.Series
+        column with price or area of offers.
+    Returns
+    ------
+    numbers: pd.DataFrame
+        float column "value" and categorical column "unit" e.g. currency, NaN if text has no number.
+    """
+    texts = column.to_numpy(dtype=object).copy()
+    for position, value in enumerate(texts):
+        if type(value) is str:
+            continue
+        elif type(value) is list:
+            texts[position] = " ".join([str(part) for part in value if part is not None])
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and (value == value):
+            texts[position] = str(value)
+        elif not isinstance(value, str):
+            texts[position] = None
+
+    # Codes of missing texts are -1, so they take the last (missing) number and unit
+    codes, distinct_texts = pd.factorize(texts)
+    numbers = np.full(len(distinct_texts) + 1, np.nan)
+    units = np.full(len(distinct_texts) + 1, None, dtype=object)
+    for position, text in enumerate(distinct_texts):
+        match = NUMBER_WITH_UNIT.match(text)
+        if match is not None:
+            numbers[position] = float(THOUSANDS_SEPARATORS.sub("", match.group("number")).replace(",", "."))
+            units[position] = match.group("unit") or None
+
+    unit_codes, unit_names = pd.factorize(units)
+    unit_codes = np.append(unit_codes, -1)
+    return pd.DataFrame({"value": numbers[codes],
+                         "unit": pd.Categorical.from_codes(unit_codes[codes], categories=unit_names)},
+                        index=column.index)
@@ -0,0 +1,113 @@
+import re
+import os
+import concurrent.futures
+from functools import lru_cache
+from typing import List, Optional
+from langdetect import detect, DetectorFactory
+
+# Same text gets the same language in every process
+DetectorFactory.seed = 0
+
+# Descriptions longer than this are filtered by language
+LONG_DESCRIPTION = 16000
+# Number of words in a part of description whose language is checked
+CHUNK_WORDS = 6
+
+WORDS = re.compile(r"[^\W\d_]+")
+POLISH_LETTERS = re.compile("[ąćęłńóśźż]")
+CYRILLIC_LETTERS = re.compile("[Ѐ-ӿ]")
+# Words which are frequent in offers in one language and not used in others (e.g. "to", "do" or "we" are left out)
+POLISH_WORDS = frozenset([
+    "w", "z", "na", "się", "jest", "są", "nie", "że", "od", "po", "oraz", "dla", "przy", "jak", "lub", "czy", "ale",
+    "tak", "ze", "za", "przez", "tylko", "będzie", "jako", "bez", "pod", "nad", "ma", "mamy", "który", "która",
+    "które", "także", "można", "bardzo", "mieszkanie", "mieszkania", "pokoje", "pokój", "pokoi", "kuchnia",
+    "łazienka", "ul", "metrów", "balkon", "osiedle", "osiedlu", "cena", "czynsz", "wynajem", "wynajęcia", "sprzedaż",
+    "piętro", "piętrze", "budynek", "budynku", "blisko", "oferta", "ofercie", "zł", "jego", "jej", "kaucja",
+    "umowa", "miesiąc", "sklepy", "sklepów", "komunikacja", "okolica", "okolicy", "centrum", "ogłoszenie", "najmu",
+    "najem", "okres", "zapraszam", "kontakt", "kontaktu", "dostępne", "miasta"])
+FOREIGN_WORDS = frozenset([
+    "the", "and", "of", "is", "with", "for", "this", "that", "are", "you", "your", "from", "has", "have", "will",
+    "apartment", "flat", "room", "rooms", "kitchen", "bathroom", "located", "near", "close", "rent", "floor",
+    "building", "which", "there", "our", "it", "its", "an", "in", "at", "be", "very", "available", "us", "please",
+    "month", "one", "per", "can", "deposit", "contact",
+    "und", "der", "die", "das", "mit", "ist", "ein", "eine", "für", "von", "zu", "wohnung", "nicht", "auf", "den",
+    "dem", "im", "sich", "sie", "wir", "es", "zimmer", "küche", "miete"])
+
+
+@lru_cache(maxsize=65536)
+def detect_language(text: str) -> str:
+    """Language of text found by langdetect, repeated texts are detected once.
+    Parameters
+    ----------
+    text: str
+        part of description.
+    Returns
+    ------
+    language: str
+        code of language e.g. "pl", "pl" if language cannot be detected (as before for texts without letters).
+    """
+    try:
+        return detect(text)
+    except:
+        return 'pl'
+
+
+def is_polish(chunk: str) -> bool:
+    """Check if part of description is in Polish. Polish and foreign words or letters decide at once, langdetect is
+    used only if there are none or both of them.
+    Parameters
+    ----------
+    chunk: str
+        a few lower case words of description.
+    Returns
+    ------
+    polish: bool
+        True if part is in Polish or has no letters.
+    """
+    words = WORDS.findall(chunk)
+    if len(words) == 0:
+        return True
+
+    polish = any(word in POLISH_WORDS for word in words) or (POLISH_LETTERS.search(chunk) is not None)
+    foreign = any(word in FOREIGN_WORDS for word in words) or (CYRILLIC_LETTERS.search(chunk) is not None)
+    if polish != foreign:
+        return polish
+    return detect_language(chunk) == 'pl'
+
+
+def polish_text(description: str) -> str:
+    """Keep Polish parts of description, it is split in parts of CHUNK_WORDS lower case words.
+    Parameters
+    ----------
+    description: str
+        description of offer.
+    Returns
+    ------
+    polish_description: str
+        lower case Polish parts joined with spaces.
+    """
+    text = description.replace(",", "").replace("-", "").split()
+    chunks = [" ".join(text[x:x + CHUNK_WORDS]).lower() for x in range(0, len(text), CHUNK_WORDS)]
+    return " ".join(chunk for chunk in chunks if is_polish(chunk))
+
+
+def polish_texts(descriptions: List[str], processes: Optional[int] = None) -> List[str]:
+    """Keep Polish parts of many descriptions, in a pool of processes if there is more than one description.
+    Parameters
+    ----------
+    descriptions: list
+        long descriptions of offers.
+    processes: int, optional
+        number of processes (default number of CPUs, 1 checks descriptions in this process).
+    Returns
+    ------
+    polish_descriptions: list
+        Polish parts of descriptions in the same order.
+    """
+    processes = min(processes or os.cpu_count() or 1, len(descriptions))
+    if processes <= 1:
+        return [polish_text(description) for description in descriptions]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(polish_text, descriptions,
+                                 chunksize=max(1, len(descriptions) // (4 * processes))))
@@ -0,0 +1,89 @@
+import os
+import concurrent.futures
+from typing import List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Smaller shards are not worth starting a process
+MIN_SHARD_ROWS = 2000
+
+
+def shard_bounds(rows: int, shards: int) -> List[Tuple[int, int]]:
+    """Split rows into ranges of almost equal size.
+    Parameters
+    ----------
+    rows: int
+        number of rows of table.
+    shards: int
+        number of ranges.
+    Returns
+    ------
+    bounds: list
+        pairs of the first row and the row after the last one.
+    """
+    edges = np.linspace(0, rows, max(shards, 1) + 1).astype(int)
+    return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+
+def create_shard_table(preprocessing: type, apartment_details: pd.DataFrame,
+                       language_processes: Optional[int] = None) -> pd.DataFrame:
+    """Create final preprocessing table of one shard with its own preprocessing object.
+    Parameters
+    ----------
+    preprocessing: type
+        class of site e.g. Preprocessing_Otodom.
+    apartment_details: pd.DataFrame
+        shard of scraped offers with index from 0.
+    language_processes: int, optional
+        number of processes checking language of long descriptions.
+    Returns
+    ------
+    table: pd.DataFrame
+        final preprocessing table of shard.
+    """
+    return preprocessing(apartment_details=apartment_details, information_types=apartment_details.columns,
+                         language_processes=language_processes).create_table()
+
+
+def create_table_partitioned(preprocessing: type, apartment_details: pd.DataFrame, processes: Optional[int] = None,
+                             shards: Optional[int] = None) -> pd.DataFrame:
+    """Create final preprocessing table from shards of rows in a pool of processes. Every process gets a copy of
+    its shard, so create_table can change it without affecting others, and tables of shards are concatenated.
+    Parameters
+    ----------
+    preprocessing: type
+        class of site e.g. Preprocessing_Otodom or Preprocessing_Morizon.
+    apartment_details: pd.DataFrame
+        scraped offers with None instead of missing values.
+    processes: int, optional
+        number of processes (default number of CPUs, 1 creates tables in this process). Table created in this
+        process (one process or one shard) checks language of long descriptions in this number of processes,
+        shards in the pool check it in their own process.
+    shards: int, optional
+        number of shards (default one for every process, but at least MIN_SHARD_ROWS rows in shard).
+    Returns
+    ------
+    table: pd.DataFrame
+        final preprocessing table in order of offers.
+    """
+    processes = processes or os.cpu_count() or 1
+    if shards is None:
+        shards = min(processes, max(1, len(apartment_details) // MIN_SHARD_ROWS))
+
+    parts = [apartment_details.iloc[start:stop].reset_index(drop=True)
+             for start, stop in shard_bounds(len(apartment_details), shards)]
+    if (processes <= 1) or (len(parts) <= 1):
+        tables = [create_shard_table(preprocessing, part, processes) for part in parts]
+    else:
+        # Processes of the pool do not start their own pools for descriptions
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(processes, len(parts))) as executor:
+            tables = list(executor.map(create_shard_table, [preprocessing] * len(parts), parts,
+                                       [1] * len(parts)))
+
+    table = pd.concat(tables, ignore_index=True)
+    # Shards have their own categories (e.g. currencies), so concatenated column is made categorical again
+    for column in table.columns:
+        if any(isinstance(part[column].dtype, pd.CategoricalDtype) for part in tables):
+            table[column] = table[column].astype("category")
+
+    return table
@@ -0,0 +1,221 @@
+# Fetching pages on a single asyncio event loop
+
+# Libraries
+import asyncio
+import concurrent.futures
+import time
+from typing import Callable, Dict, List, Union
+from httpCache import HttpCache
+from httpSession import override_origin
+from concurrencyControl import ConcurrencyController, HostConcurrency, is_overload
+from retryScheduler import RetryScheduler
+from scraperMetrics import ScraperMetrics
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncFetcher:
+    """
+    A class used to download thousands of pages concurrently on one asyncio event loop
+
+    ...
+
+    Attributes
+    ----------
+    concurrency : int
+        maximum number of requests in flight (default 1000)
+    timeout : int
+        total timeout of a single request in seconds (default 60)
+    headers : dict
+        headers sent with every request
+    cache : HttpCache
+        on-disk cache for pages which rarely change (None if not used)
+    adaptive : ConcurrencyController
+        adaptive limit of requests in flight for every host, at most concurrency (None if not used)
+    parse_workers : int
+        number of threads calling process (default 1), more are useful when process waits for other processes
+    host_overrides : dict
+        origin: replacement, requests are sent to replacement (pages are returned under original links)
+    metrics : ScraperMetrics
+        metrics where latency, status and size of requests sent to the network are recorded (None if not used)
+
+    Methods
+    -------
+    map(links: List[str], resolve: Callable, process: Callable, scheduler: RetryScheduler = None) -> List:
+        Download pages needed for every link and process them, results are in the order of links
+    """
+
+    def __init__(self, concurrency: int = 1000, timeout: int = 60, headers: Dict[str, str] = None,
+                 cache: HttpCache = None, adaptive: ConcurrencyController = None, parse_workers: int = 1,
+                 host_overrides: Dict[str, str] = None, metrics: ScraperMetrics = None):
+        """
+        Parameters
+        ----------
+        concurrency : int
+            maximum number of requests in flight (default 1000)
+        timeout : int
+            total timeout of a single request in seconds (default 60)
+        headers : dict, optional
+            headers sent with every request
+        cache : HttpCache, optional
+            on-disk cache for pages which rarely change
+        adaptive : ConcurrencyController, optional
+            adaptive limit of requests in flight for every host
+        parse_workers : int
+            number of threads calling process (default 1), more are useful when process waits for other processes
+        host_overrides : dict, optional
+            origin: replacement e.g. {"https://www.otodom.pl": "http://127.0.0.1:8000/www.otodom.pl"}
+        metrics : ScraperMetrics, optional
+            metrics where latency, status and size of requests sent to the network are recorded
+        """
+
+        if aiohttp is None:
+            raise ImportError("fetch_backend 'asyncio' requires the aiohttp package")
+
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.headers = headers
+        self.cache = cache
+        self.adaptive = adaptive
+        self.parse_workers = parse_workers
+        self.host_overrides = host_overrides or {}
+        self.metrics = metrics
+
+    # Download pages needed for every link and process them
+    def map(self, links: List[str], resolve: Callable[[str], List[str]],
+            process: Callable[[str, Dict[str, Union[bytes, Exception]]], object],
+            scheduler: RetryScheduler = None) -> List:
+        """Download pages needed for every link and process them, results are in the order of links
+
+        The event loop runs in its own thread, so map can be called also when an event loop is already running
+        (e.g. in a notebook)
+
+        Parameters
+        ----------
+        links: list
+            arguments of the scraping function
+        resolve: function
+            returns links to pages which have to be downloaded for a link
+        process: function
+            processes a link with downloaded pages (raw HTML or exception raised while downloading)
+        scheduler: RetryScheduler, optional
+            retries failed links together with fresh ones, process has to return (result, error or None)
+
+        Returns
+        ------
+        list
+            results of process for every link
+        """
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as loop_thread:
+            return loop_thread.submit(asyncio.run, self._map(links, resolve, process, scheduler)).result()
+
+    async def _map(self, links: List[str], resolve: Callable, process: Callable,
+                   scheduler: RetryScheduler = None) -> List:
+        results = {}
+        to_do = iter(dict.fromkeys(links))
+        active = 0
+        loop = asyncio.get_running_loop()
+        self._waiting = {}
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        # Parsing is done outside of the event loop thread so it does not stall the downloads
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.parse_workers) as parse_executor:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                             headers=self.headers) as session:
+
+                async def worker():
+                    nonlocal active
+                    while True:
+                        # Due retries go before fresh links
+                        link = None if scheduler is None else scheduler.pop_due()
+                        if link is None:
+                            link = next(to_do, None)
+                        if link is None:
+                            # Links in flight can still fail and be scheduled
+                            if (scheduler is None) or ((active == 0) and (scheduler.pending() == 0)):
+                                return
+                            await asyncio.sleep(min(scheduler.wait() or 0.05, 0.5))
+                            continue
+
+                        active += 1
+                        try:
+                            pages = {}
+                            for url in resolve(link):
+                                pages[url] = await self._fetch(session, url)
+                            result = await loop.run_in_executor(parse_executor, process, link, pages)
+                        finally:
+                            active -= 1
+
+                        if scheduler is not None:
+                            result, error = result
+                            if error is None:
+                                scheduler.succeeded(link)
+                            elif scheduler.retry(link, error):
+                                continue
+                        results[link] = result
+
+                workers = min(self.concurrency, len(links))
+                await asyncio.gather(*[worker() for _ in range(workers)])
+
+        return [results[link] for link in links]
+
+    async def _fetch(self, session, url: str) -> Union[bytes, Exception]:
+        try:
+            # Fresh page from cache or headers to revalidate it
+            body, conditional_headers = (None, None) if self.cache is None else self.cache.lookup(url)
+            if body is not None:
+                return body
+
+            host = None if self.adaptive is None else self.adaptive.host(url)
+            if host is not None:
+                await self._acquire(host)
+            start, status, request_error = time.monotonic(), None, None
+            try:
+                async with session.get(override_origin(url, self.host_overrides),
+                                       headers=conditional_headers) as response:
+                    status = response.status
+                    if (response.status == 304) and (conditional_headers is not None):
+                        return self.cache.revalidated(url)
+                    response.raise_for_status()
+                    body = await response.read()
+            except Exception as error:
+                # Error statuses are judged by status, other errors are timeouts and connection errors
+                if not isinstance(error, aiohttp.ClientResponseError):
+                    request_error = error
+                raise
+            finally:
+                if host is not None:
+                    self._release(host, time.monotonic() - start, is_overload(status, request_error))
+                if self.metrics is not None:
+                    self.metrics.request(time.monotonic() - start, status or "error",
+                                         len(body) if body is not None else 0)
+
+            if conditional_headers is not None:
+                self.cache.store(url, response.headers, body)
+
+            return body
+        except Exception as error:
+            return error
+
+    # Wait for free slot of host without blocking the event loop
+    async def _acquire(self, host: HostConcurrency) -> None:
+        waiting = self._waiting.setdefault(host.host, asyncio.Condition())
+        async with waiting:
+            await waiting.wait_for(host.try_acquire)
+
+    # Free slot of host and wake up as many waiting requests as there are free slots
+    def _release(self, host: HostConcurrency, latency: float, overloaded: bool) -> None:
+        host.release(latency, overloaded)
+        waiting = self._waiting[host.host]
+
+        async def wake_up():
+            async with waiting:
+                waiting.notify(max(1, int(host.limit) - host.in_flight))
+
+        asyncio.ensure_future(wake_up())
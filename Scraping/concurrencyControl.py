@@ -0,0 +1,296 @@
+# Adaptive (AIMD) per-host concurrency control
+
+# Libraries
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+
+class HostConcurrency:
+    """
+    A class used to adapt the number of requests in flight to one host (additive increase, multiplicative decrease)
+
+    The limit doubles after every window of healthy requests until the first overload (slow start), later it grows
+    by one per window. 429/5xx answers, timeouts, connection errors and latency spikes cut it in half, at most once
+    per cooldown, so requests which were already in flight do not cut it again.
+
+    ...
+
+    Attributes
+    ----------
+    host : str
+        host name
+    limit : float
+        current maximum number of requests in flight
+    minimum : int
+        the lowest limit
+    maximum : int
+        the highest limit
+    in_flight : int
+        number of requests in flight
+
+    Methods
+    -------
+    acquire() -> None:
+        Wait for free slot (threads)
+
+    try_acquire() -> bool:
+        Take free slot if there is one
+
+    release(latency: float, overloaded: bool) -> None:
+        Free slot and adapt limit to request outcome
+
+    report() -> Dict[str, float]:
+        Current state of host
+    """
+
+    def __init__(self, host: str, initial: int = 2, minimum: int = 1, maximum: int = 30,
+                 latency_spike: float = 3.0, cooldown: float = None):
+        """
+        Parameters
+        ----------
+        host : str
+            host name
+        initial : int
+            starting limit (default 2)
+        minimum : int
+            the lowest limit (default 1)
+        maximum : int
+            the highest limit (default 30)
+        latency_spike : float
+            latency higher than latency_spike times average latency is treated as overload (default 3)
+        cooldown : float, optional
+            minimum number of seconds between two decreases (default twice the average latency)
+        """
+
+        self.host = host
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_spike = latency_spike
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.slow_start = True
+        self.latency = None
+        self.healthy = 0
+        self.requests = 0
+        self.overloads = 0
+        self.peak_in_flight = 0
+        self.last_decrease = 0.0
+        self._condition = threading.Condition(threading.RLock())
+
+    # Wait for free slot
+    def acquire(self) -> None:
+        """Wait for free slot (threads)"""
+
+        with self._condition:
+            self._condition.wait_for(self.try_acquire)
+
+    # Take free slot if there is one
+    def try_acquire(self) -> bool:
+        """Take free slot if there is one
+
+        Returns
+        ------
+        bool
+            True if slot was taken
+        """
+
+        with self._condition:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+            return True
+
+    # Free slot and adapt limit to request outcome
+    def release(self, latency: float, overloaded: bool) -> None:
+        """Free slot and adapt limit to request outcome
+
+        Parameters
+        ----------
+        latency: float
+            duration of request in seconds
+        overloaded: bool
+            whether host answered 429/5xx, timed out or refused connection
+        """
+
+        with self._condition:
+            self.in_flight -= 1
+            self.requests += 1
+
+            # Latency spike compared with average of healthy requests
+            if (not overloaded) and (self.latency is not None) and (self.requests > 20):
+                overloaded = latency > self.latency_spike * self.latency
+
+            if overloaded:
+                self.overloads += 1
+                self.healthy = 0
+                now = time.monotonic()
+                cooldown = self.cooldown if self.cooldown is not None else 2 * (self.latency or latency)
+                if now - self.last_decrease > cooldown:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self.slow_start = False
+                    self.last_decrease = now
+            else:
+                self.latency = latency if self.latency is None else 0.95 * self.latency + 0.05 * latency
+                self.healthy += 1
+                # One window of healthy requests
+                if self.healthy >= int(self.limit):
+                    self.healthy = 0
+                    self.limit = min(self.maximum, self.limit * 2 if self.slow_start else self.limit + 1)
+
+            self._condition.notify_all()
+
+    # Current state of host
+    def report(self) -> Dict[str, float]:
+        """Current state of host
+
+        Returns
+        ------
+        dict
+            limit, peak number of requests in flight, average latency, number of requests and overloads
+        """
+
+        return {"limit": int(self.limit), "peak_in_flight": self.peak_in_flight,
+                "latency_ms": None if self.latency is None else round(self.latency * 1000, 1),
+                "requests": self.requests, "overloads": self.overloads}
+
+
+class RequestSlot:
+    """Context manager which holds slot of host for one request (threads), set status to the answer status"""
+
+    def __init__(self, host: HostConcurrency):
+        self.host = host
+        self.status = None
+
+    def __enter__(self):
+        self.host.acquire()
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, error_type, error, traceback):
+        self.host.release(time.monotonic() - self.start, is_overload(self.status, error))
+        return False
+
+
+# Verify whether request outcome means that host is overloaded
+def is_overload(status: int = None, error: Exception = None) -> bool:
+    """Verify whether request outcome means that host is overloaded
+
+    Parameters
+    ----------
+    status: int, optional
+        status of answer
+    error: Exception, optional
+        exception raised while sending request (timeouts, connection errors)
+
+    Returns
+    ------
+    bool
+        True for 429 and 5xx answers, timeouts and connection errors
+    """
+
+    if error is not None:
+        return True
+
+    return (status is not None) and ((status == 429) or (status >= 500))
+
+
+class ConcurrencyController:
+    """
+    A class used to keep adaptive concurrency limit for every host
+
+    ...
+
+    Attributes
+    ----------
+    initial : int
+        starting limit of new host
+    minimum : int
+        the lowest limit
+    maximum : int
+        the highest limit (e.g. number of threads)
+
+    Methods
+    -------
+    host(link: str) -> HostConcurrency:
+        Concurrency state of link host
+
+    slot(link: str) -> RequestSlot:
+        Context manager which holds slot of link host for one request
+
+    report() -> Dict[str, Dict[str, float]]:
+        Limits which hosts settled on
+    """
+
+    def __init__(self, initial: int = 2, minimum: int = 1, maximum: int = 30):
+        """
+        Parameters
+        ----------
+        initial : int
+            starting limit of new host (default 2)
+        minimum : int
+            the lowest limit (default 1)
+        maximum : int
+            the highest limit (default 30)
+        """
+
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    # Concurrency state of link host
+    def host(self, link: str) -> HostConcurrency:
+        """Concurrency state of link host
+
+        Parameters
+        ----------
+        link: str
+            link to web page
+
+        Returns
+        ------
+        HostConcurrency
+            state of host, created with the first request
+        """
+
+        name = urlsplit(link).netloc
+        with self._lock:
+            if name not in self._hosts:
+                self._hosts[name] = HostConcurrency(name, self.initial, self.minimum, self.maximum)
+            return self._hosts[name]
+
+    # Context manager which holds slot of link host for one request
+    def slot(self, link: str) -> RequestSlot:
+        """Context manager which holds slot of link host for one request
+
+        Parameters
+        ----------
+        link: str
+            link to web page
+
+        Returns
+        ------
+        RequestSlot
+            slot, set its status to the answer status
+        """
+
+        return RequestSlot(self.host(link))
+
+    # Limits which hosts settled on
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Limits which hosts settled on
+
+        Returns
+        ------
+        dict
+            host: state of host
+        """
+
+        with self._lock:
+            return {name: host.report() for name, host in self._hosts.items()}
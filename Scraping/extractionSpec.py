@@ -0,0 +1,224 @@
+# Declarative extraction of offer fields from HTML tree and JSON
+
+# Libraries
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class DomField:
+    """
+    A class used to describe field of offer found in HTML tree by tag name and attributes
+
+    Attributes are matched as in BeautifulSoup find: class matches a single class name of element or the whole class
+    attribute, other attributes match the whole value and True matches any value.
+
+    ...
+
+    Attributes
+    ----------
+    tag : str
+        tag name e.g. "h1" (None matches every tag)
+    attrs : dict
+        attributes of tag e.g. {"class": "sticker__title"}
+    many : bool
+        collect every matching element (as findAll) instead of the first one (as find)
+    post : function
+        post-processor called with found element(s) and arguments of extract (default returns element(s))
+    """
+
+    __slots__ = ("tag", "attrs", "many", "post")
+
+    def __init__(self, tag: str, attrs: Dict[str, Any] = None, many: bool = False, post: Callable = None):
+        self.tag = tag
+        self.attrs = tuple((attrs or {}).items())
+        self.many = many
+        self.post = post
+
+    # Whether element has attributes of field
+    def matches(self, element) -> bool:
+        for key, value in self.attrs:
+            found = element.get(key)
+            if found is None:
+                return False
+            if value is True:
+                continue
+            # BeautifulSoup keeps class as list of names, lexbor as string
+            if not isinstance(found, str):
+                found = " ".join(found)
+            if key == "class":
+                if (found != value) and (value not in found.split()):
+                    return False
+            elif found != value:
+                return False
+
+        return True
+
+
+class JsonField:
+    """
+    A class used to describe field of offer found in JSON by path of keys
+
+    ...
+
+    Attributes
+    ----------
+    path : tuple
+        keys (or list indexes) leading to value e.g. ("props", "pageProps", "ad", "title")
+    post : function
+        post-processor called with value (default returns value)
+    default : object
+        value of field if path does not exist or post-processor fails (default None)
+    """
+
+    __slots__ = ("path", "post", "default")
+
+    def __init__(self, path: Tuple, post: Callable = None, default: Any = None):
+        self.path = tuple(path)
+        self.post = post
+        self.default = default
+
+
+class DomSpec:
+    """
+    A class used to extract fields from HTML tree in one traversal
+
+    Fields are compiled once into a table from tag name to fields, so every element of document is visited once
+    no matter how many fields are extracted. Post-processors run afterwards in order of fields, like separate
+    find calls written one after another.
+
+    ...
+
+    Attributes
+    ----------
+    fields : dict
+        name of field: DomField
+
+    Methods
+    -------
+    extract(soup: BeautifulSoup, *args) -> Dict[str, Any]:
+        Find elements of all fields and post-process them
+    """
+
+    def __init__(self, fields: Dict[str, DomField]):
+        """
+        Parameters
+        ----------
+        fields : dict
+            name of field: DomField, post-processors run in this order
+        """
+
+        self.fields = fields
+        self._by_tag = {}
+        for name, field in fields.items():
+            self._by_tag.setdefault(field.tag, []).append((name, field))
+        # Fields without tag name are checked for every element
+        self._any_tag = self._by_tag.pop(None, [])
+        for tag in self._by_tag:
+            self._by_tag[tag] += self._any_tag
+        self._n_single = sum(not field.many for field in fields.values())
+        self._has_many = self._n_single != len(fields)
+
+    # Find elements of all fields and post-process them
+    def extract(self, soup, *args) -> Dict[str, Any]:
+        """Find elements of all fields in one traversal of the tree and post-process them. Exceptions of
+        post-processors are not caught, so scraper decides what a broken page means
+
+        Parameters
+        ----------
+        soup: BeautifulSoup
+            HTML tree (or LexborTag)
+        args:
+            passed to post-processors after found element(s) e.g. scraper
+
+        Returns
+        ------
+        dict
+            name of field: post-processed value (element is None or list is empty if nothing matched)
+        """
+
+        found = {name: [] if field.many else None for name, field in self.fields.items()}
+        n_single = 0
+        for element in soup.find_all(True):
+            for name, field in self._by_tag.get(element.name, self._any_tag):
+                if field.many:
+                    if field.matches(element):
+                        found[name].append(element)
+                elif (found[name] is None) and field.matches(element):
+                    found[name] = element
+                    n_single += 1
+            # Nothing is left to find
+            if (not self._has_many) and (n_single == self._n_single):
+                break
+
+        return {name: field.post(found[name], *args) if field.post is not None else found[name]
+                for name, field in self.fields.items()}
+
+
+class JsonSpec:
+    """
+    A class used to extract fields from JSON walking shared parts of their paths once
+
+    Paths are compiled once into a prefix tree, e.g. fields under ("props", "pageProps", "ad", "target") look up
+    the common keys once and then read their own key.
+
+    ...
+
+    Attributes
+    ----------
+    fields : dict
+        name of field: JsonField
+
+    Methods
+    -------
+    extract(obj: dict) -> Dict[str, Any]:
+        Read and post-process all fields
+    """
+
+    def __init__(self, fields: Dict[str, JsonField]):
+        """
+        Parameters
+        ----------
+        fields : dict
+            name of field: JsonField
+        """
+
+        self.fields = fields
+        # Node of prefix tree is [fields ending at node, {key: child node}]
+        self._root = [[], {}]
+        for name, field in fields.items():
+            node = self._root
+            for key in field.path:
+                node = node[1].setdefault(key, [[], {}])
+            node[0].append((name, field))
+
+    # Read and post-process all fields
+    def extract(self, obj: Any) -> Dict[str, Any]:
+        """Read and post-process all fields, fields whose path does not exist or whose post-processor fails get
+        their default
+
+        Parameters
+        ----------
+        obj: dict
+            JSON object
+
+        Returns
+        ------
+        dict
+            name of field: value, in order of fields
+        """
+
+        values = {name: field.default for name, field in self.fields.items()}
+        stack: List[Tuple[list, Any]] = [(self._root, obj)]
+        while len(stack) != 0:
+            (ending, children), value = stack.pop()
+            for name, field in ending:
+                try:
+                    values[name] = field.post(value) if field.post is not None else value
+                except Exception:
+                    values[name] = field.default
+            for key, child in children.items():
+                try:
+                    stack.append((child, value[key]))
+                except (KeyError, IndexError, TypeError):
+                    pass
+
+        return values
@@ -0,0 +1,54 @@
+# Result of scraping a single link
+
+# Libraries
+from typing import Any
+
+# Statuses of results
+OK = "ok"
+FAILED = "failed"
+GONE = "gone"
+
+
+class FetchResult:
+    """
+    A class used to return result of scraping function together with its status
+
+    ...
+
+    Attributes
+    ----------
+    status : str
+        OK (payload is scraped), FAILED (link should be retried) or GONE (offer no longer exists)
+    link : str
+        argument of scraping function
+    payload : object
+        scraped elements e.g. pages links, offers links, details (None if link was not scraped)
+    error : Exception
+        exception which made scraping fail (None if status is not FAILED)
+    fetch_time : float
+        seconds spent reading pages
+    parse_time : float
+        seconds spent parsing pages and extracting information
+    n_bytes : int
+        number of bytes of read pages
+    """
+
+    __slots__ = ("status", "link", "payload", "error", "fetch_time", "parse_time", "n_bytes")
+
+    def __init__(self, status: str, link: str, payload: Any = None, error: Exception = None,
+                 fetch_time: float = 0.0, parse_time: float = 0.0, n_bytes: int = 0):
+        self.status = status
+        self.link = link
+        self.payload = payload
+        self.error = error
+        self.fetch_time = fetch_time
+        self.parse_time = parse_time
+        self.n_bytes = n_bytes
+
+    # Results sent between processes are pickled as a plain tuple
+    def __reduce__(self):
+        return (FetchResult, (self.status, self.link, self.payload, self.error, self.fetch_time, self.parse_time,
+                              self.n_bytes))
+
+    def __repr__(self) -> str:
+        return "FetchResult(%s, %r, error=%r)" % (self.status, self.link, self.error)
@@ -0,0 +1,205 @@
+# On-disk HTTP cache for pages which rarely change
+
+# Libraries
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Dict, Optional, Tuple
+
+
+class HttpCache:
+    """
+    A class used to keep pages on disk and revalidate them with conditional GET (ETag, Last-Modified)
+
+    Only links matching one of url_classes are cached. Every class has its own time to live, within it the page
+    is served from disk without any request, after it the page is revalidated and a 304 answer is served from disk.
+
+    ...
+
+    Attributes
+    ----------
+    directory : str
+        directory where pages are saved
+    url_classes : dict
+        name of class: (regular expression matched with link, time to live in seconds)
+
+    Methods
+    -------
+    url_class(link: str) -> Optional[Tuple[str, int]]:
+        Find class of link
+
+    lookup(link: str) -> Tuple[Optional[bytes], Optional[Dict[str, str]]]:
+        Get fresh page from cache or headers to revalidate it
+
+    store(link: str, headers: Dict[str, str], body: bytes) -> None:
+        Save downloaded page with its validators
+
+    revalidated(link: str) -> bytes:
+        Renew page after 304 answer and return it from disk
+    """
+
+    def __init__(self, directory: str, url_classes: Dict[str, Tuple[str, int]]):
+        """
+        Parameters
+        ----------
+        directory : str
+            directory where pages are saved
+        url_classes : dict
+            name of class: (regular expression matched with link, time to live in seconds)
+        """
+
+        self.directory = directory
+        self.url_classes = url_classes
+        self._patterns = [(name, re.compile(pattern), ttl) for name, (pattern, ttl) in url_classes.items()]
+        os.makedirs(directory, exist_ok=True)
+
+    # Find class of link
+    def url_class(self, link: str) -> Optional[Tuple[str, int]]:
+        """Find class of link
+
+        Parameters
+        ----------
+        link: str
+            link to web page
+
+        Returns
+        ------
+        tuple or None
+            name of class and its time to live, None if link is not cached
+        """
+
+        for name, pattern, ttl in self._patterns:
+            if pattern.search(link):
+                return name, ttl
+
+        return None
+
+    # Paths to page and its metadata
+    def paths(self, link: str) -> Tuple[str, str]:
+        """Paths to page and its metadata
+
+        Parameters
+        ----------
+        link: str
+            link to web page
+
+        Returns
+        ------
+        str, str
+            1. path to page content
+            2. path to metadata (link, download time, ETag, Last-Modified)
+        """
+
+        key = hashlib.sha1(link.encode("utf-8")).hexdigest()
+
+        return os.path.join(self.directory, key + ".html"), os.path.join(self.directory, key + ".json")
+
+    # Get fresh page from cache or headers to revalidate it
+    def lookup(self, link: str) -> Tuple[Optional[bytes], Optional[Dict[str, str]]]:
+        """Get fresh page from cache or headers to revalidate it
+
+        Parameters
+        ----------
+        link: str
+            link to web page
+
+        Returns
+        ------
+        bytes or None, dict or None
+            1. page content if it is still fresh
+            2. conditional headers for request if page has to be downloaded (None if link is not cached)
+        """
+
+        url_class = self.url_class(link)
+        if url_class is None:
+            return None, None
+
+        body_path, meta_path = self.paths(link)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as meta_file:
+                meta = json.load(meta_file)
+            if time.time() - meta["fetched"] < url_class[1]:
+                with open(body_path, "rb") as body_file:
+                    return body_file.read(), None
+        except (OSError, ValueError, KeyError):
+            return None, {}
+
+        # Without saved page 304 answer can not be served
+        if not os.path.exists(body_path):
+            return None, {}
+
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        return None, headers
+
+    # Save downloaded page with its validators
+    def store(self, link: str, headers: Dict[str, str], body: bytes) -> None:
+        """Save downloaded page with its validators
+
+        Parameters
+        ----------
+        link: str
+            link to web page
+        headers: dict
+            response headers
+        body: bytes
+            page content
+        """
+
+        if self.url_class(link) is None:
+            return
+
+        body_path, meta_path = self.paths(link)
+        meta = {"link": link, "fetched": time.time(), "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified")}
+
+        self.write_atomic(body_path, body)
+        self.write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    # Renew page after 304 answer and return it from disk
+    def revalidated(self, link: str) -> bytes:
+        """Renew page after 304 answer and return it from disk
+
+        Parameters
+        ----------
+        link: str
+            link to web page
+
+        Returns
+        ------
+        bytes
+            page content
+        """
+
+        body_path, meta_path = self.paths(link)
+        with open(meta_path, "r", encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        meta["fetched"] = time.time()
+        self.write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+        with open(body_path, "rb") as body_file:
+            return body_file.read()
+
+    # Replace file at once, so a crash never leaves half written page
+    def write_atomic(self, path: str, content: bytes) -> None:
+        """Replace file at once, so a crash never leaves half written page
+
+        Parameters
+        ----------
+        path: str
+            path to file
+        content: bytes
+            file content
+        """
+
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, path)
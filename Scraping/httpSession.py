@@ -0,0 +1,260 @@
+# Pooled HTTP sessions
+
+# Libraries
+import threading
+import time
+from typing import Dict, Tuple
+from httpCache import HttpCache
+from concurrencyControl import ConcurrencyController
+from scraperMetrics import ScraperMetrics
+from urllib.parse import urlsplit
+import urllib3
+
+# Brotli is decoded by urllib3 only if one of the brotli packages is installed
+try:
+    import brotli
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+
+# Replace origin of link
+def override_origin(link: str, host_overrides: Dict[str, str] = None) -> str:
+    """Replace origin of link e.g. to send production links to a local fixture server
+
+    Parameters
+    ----------
+    link: str
+        link to web page
+    host_overrides: dict, optional
+        origin: replacement e.g. {"https://www.otodom.pl": "http://127.0.0.1:8000/www.otodom.pl"}
+
+    Returns
+    ------
+    str
+        link with replaced origin (the same link if its origin is not overridden)
+    """
+
+    if not host_overrides:
+        return link
+
+    parts = urlsplit(link)
+    origin = "%s://%s" % (parts.scheme, parts.netloc)
+    replacement = host_overrides.get(origin)
+
+    return link if replacement is None else replacement + link[len(origin):]
+
+
+class HttpStatusError(Exception):
+    """Raised when the server answers with error status (4xx, 5xx)"""
+
+    def __init__(self, link: str, status: int):
+        super().__init__("HTTP %s for %s" % (status, link))
+        self.link = link
+        self.status = status
+
+
+class HttpSession:
+    """
+    A class used to download pages with keep-alive connections shared by all threads
+
+    Every host has its own connection pool. Responses are requested compressed (gzip, deflate and brotli if
+    available) and decoded transparently.
+
+    ...
+
+    Attributes
+    ----------
+    pool_size : int
+        maximum number of connections kept per host (default 30)
+    host_pool_sizes : dict
+        pool sizes for specific hosts e.g. {"www.otodom.pl": 10}, other hosts use pool_size
+    timeout : int
+        timeout of a single request in seconds (default 60)
+    cache : HttpCache
+        on-disk cache for pages which rarely change (None if not used)
+    concurrency : ConcurrencyController
+        adaptive limit of requests in flight for every host (None if not used)
+    host_overrides : dict
+        origin: replacement, requests are sent to replacement (cache, archive and errors use original links)
+    metrics : ScraperMetrics
+        metrics where latency, status and size of requests sent to the network are recorded (None if not used)
+
+    Methods
+    -------
+    request(link: str, headers: Dict[str, str] = None, method: str = "GET", redirect: bool = True) -> urllib3.HTTPResponse:
+        Send request with connection from host pool
+
+    get(link: str) -> bytes:
+        Download decoded page content, pages matching cache url classes are served from cache or revalidated
+
+    head(link: str) -> Tuple[int, str]:
+        Status of page and target of redirect without downloading the page
+    """
+
+    def __init__(self, pool_size: int = 30, host_pool_sizes: Dict[str, int] = None, timeout: int = 60,
+                 cache: HttpCache = None, concurrency: ConcurrencyController = None,
+                 host_overrides: Dict[str, str] = None, metrics: ScraperMetrics = None):
+        """
+        Parameters
+        ----------
+        pool_size : int
+            maximum number of connections kept per host (default 30)
+        host_pool_sizes : dict, optional
+            pool sizes for specific hosts e.g. {"www.otodom.pl": 10}, other hosts use pool_size
+        timeout : int
+            timeout of a single request in seconds (default 60)
+        cache : HttpCache, optional
+            on-disk cache for pages which rarely change
+        concurrency : ConcurrencyController, optional
+            adaptive limit of requests in flight for every host
+        host_overrides : dict, optional
+            origin: replacement e.g. {"https://www.otodom.pl": "http://127.0.0.1:8000/www.otodom.pl"}
+        metrics : ScraperMetrics, optional
+            metrics where latency, status and size of requests sent to the network are recorded
+        """
+
+        self.pool_size = pool_size
+        self.host_pool_sizes = host_pool_sizes or {}
+        self.timeout = timeout
+        self.cache = cache
+        self.concurrency = concurrency
+        self.host_overrides = host_overrides or {}
+        self.metrics = metrics
+        self.headers = {"Accept-Encoding": ACCEPT_ENCODING}
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    # Connection pool for host
+    def pool(self, host: str) -> urllib3.PoolManager:
+        """Connection pool for host, created with the first request
+
+        Parameters
+        ----------
+        host: str
+            host name e.g. www.otodom.pl
+
+        Returns
+        ------
+        urllib3.PoolManager
+            pool of keep-alive connections, threads wait for a free connection when pool is full
+        """
+
+        with self._lock:
+            if host not in self._pools:
+                self._pools[host] = urllib3.PoolManager(maxsize=self.host_pool_sizes.get(host, self.pool_size),
+                                                        block=True, headers=self.headers,
+                                                        retries=urllib3.Retry(connect=0, read=0, status=0,
+                                                                              redirect=10),
+                                                        timeout=urllib3.Timeout(total=self.timeout))
+            return self._pools[host]
+
+    # Send request with connection from host pool
+    def request(self, link: str, headers: Dict[str, str] = None, method: str = "GET",
+                redirect: bool = True) -> urllib3.HTTPResponse:
+        """Send request with connection from host pool
+
+        Parameters
+        ----------
+        link: str
+            link to web page
+        headers: dict, optional
+            additional request headers
+        method: str
+            HTTP method (default GET)
+        redirect: bool
+            follow redirects (default True)
+
+        Returns
+        ------
+        urllib3.HTTPResponse
+            response with decoded content
+        """
+
+        request_headers = dict(self.headers)
+        if headers:
+            request_headers.update(headers)
+        link = override_origin(link, self.host_overrides)
+
+        return self.pool(urlsplit(link).hostname).request(method, link, headers=request_headers,
+                                                           redirect=redirect, decode_content=True)
+
+    # Download decoded page content
+    def get(self, link: str) -> bytes:
+        """Download decoded page content, pages matching cache url classes are served from cache or revalidated
+
+        Parameters
+        ----------
+        link: str
+            link to web page
+
+        Returns
+        ------
+        bytes
+            raw HTML of the page
+        """
+
+        # Fresh page from cache or headers to revalidate it
+        body, conditional_headers = (None, None) if self.cache is None else self.cache.lookup(link)
+        if body is not None:
+            return body
+
+        start, status = time.perf_counter(), "error"
+        try:
+            if self.concurrency is None:
+                response = self.request(link, conditional_headers)
+            else:
+                # Only requests sent to the network are counted, cache hits do not change the limit
+                with self.concurrency.slot(link) as slot:
+                    response = self.request(link, conditional_headers)
+                    slot.status = response.status
+            status = response.status
+        finally:
+            if self.metrics is not None:
+                self.metrics.request(time.perf_counter() - start, status,
+                                     len(response.data) if status != "error" else 0)
+
+        if (response.status == 304) and (conditional_headers is not None):
+            return self.cache.revalidated(link)
+        if response.status >= 400:
+            raise HttpStatusError(link, response.status)
+
+        if conditional_headers is not None:
+            self.cache.store(link, response.headers, response.data)
+
+        return response.data
+
+    # Status of page without downloading it
+    def head(self, link: str) -> Tuple[int, str]:
+        """Status of page and target of redirect without downloading the page, redirects are not followed
+
+        Parameters
+        ----------
+        link: str
+            link to web page
+
+        Returns
+        ------
+        int, str
+            1. HTTP status
+            2. Location header of redirect (None if there is no redirect)
+        """
+
+        start, status = time.perf_counter(), "error"
+        try:
+            if self.concurrency is None:
+                response = self.request(link, method="HEAD", redirect=False)
+            else:
+                with self.concurrency.slot(link) as slot:
+                    response = self.request(link, method="HEAD", redirect=False)
+                    slot.status = response.status
+            status = response.status
+        finally:
+            if self.metrics is not None:
+                self.metrics.request(time.perf_counter() - start, status)
+
+        return response.status, response.headers.get("Location")
@@ -0,0 +1,211 @@
+# Cities, districts and page counts of districts kept between runs
+
+# Libraries
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+
+class LocationTopology:
+    """
+    A class used to keep links of cities, their districts and the last known number of pages of every district in
+    JSON file. Every part has its own time of update, so only expired parts are scraped again
+
+    ...
+
+    Attributes
+    ----------
+    path : str
+        path to JSON file
+    ttl : float
+        seconds after which list of cities and districts of city are scraped again (default a week)
+    pages_ttl : float
+        seconds after which number of pages of district is scraped again (default 6 hours)
+
+    Methods
+    -------
+    save() -> None:
+        Save topology to file at once
+
+    is_empty() -> bool:
+        Whether districts were never scraped
+
+    is_stale() -> bool:
+        Whether any part of topology expired
+
+    cities_expired() -> bool:
+        Whether list of cities expired
+
+    set_cities(cities: List[str]) -> None:
+        Keep only cities which are still listed
+
+    stale_cities(cities: List[str]) -> List[str]:
+        Cities whose districts were never scraped or expired
+
+    set_districts(city: str, districts: List[str]) -> None:
+        Save districts of city
+
+    districts() -> List[str]:
+        Districts of all cities
+
+    stale_districts() -> List[str]:
+        Districts whose number of pages is unknown or expired
+
+    page_counts(districts: List[str]) -> Dict[str, int]:
+        Last known numbers of pages of districts
+
+    set_page_count(district: str, count: int) -> None:
+        Save number of pages of district
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, pages_ttl: float = 6 * 3600):
+        """
+        Parameters
+        ----------
+        path : str
+            path to JSON file, it is created with the first save
+        ttl : float
+            seconds after which list of cities and districts of city are scraped again (default a week)
+        pages_ttl : float
+            seconds after which number of pages of district is scraped again (default 6 hours)
+        """
+
+        self.path = path
+        self.ttl = ttl
+        self.pages_ttl = pages_ttl
+        self._lock = threading.Lock()
+        self._data = {"cities_updated": 0, "cities": {}, "pages": {}}
+
+        # Broken file is scraped again like a missing one
+        try:
+            with open(path, encoding="utf-8") as topology_file:
+                self._data.update(json.load(topology_file))
+        except (OSError, ValueError):
+            pass
+
+    # Scraper sent to parse processes does not take lock
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # Save topology to file at once
+    def save(self) -> None:
+        """Save topology to file at once, so a crash never leaves half written file"""
+
+        with self._lock:
+            content = json.dumps(self._data, ensure_ascii=False, indent=1)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, self.path)
+
+    # Whether districts were never scraped
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not any(city["districts"] for city in self._data["cities"].values())
+
+    # Whether any part of topology expired
+    def is_stale(self) -> bool:
+        now = time.time()
+        with self._lock:
+            return ((now - self._data["cities_updated"] > self.ttl)
+                    or any(now - city["updated"] > self.ttl for city in self._data["cities"].values())
+                    or any(now - pages["updated"] > self.pages_ttl for pages in self._data["pages"].values()))
+
+    # Whether list of cities expired
+    def cities_expired(self) -> bool:
+        with self._lock:
+            return time.time() - self._data["cities_updated"] > self.ttl
+
+    # Keep only cities which are still listed
+    def set_cities(self, cities: List[str]) -> None:
+        """Keep only cities which are still listed, new cities have no districts until they are scraped
+
+        Parameters
+        ----------
+        cities: list
+            links to cities
+        """
+
+        with self._lock:
+            old_cities = self._data["cities"]
+            self._data["cities"] = {city: old_cities.get(city, {"updated": 0, "districts": []}) for city in cities}
+            self._data["cities_updated"] = time.time()
+            # Page counts of districts of removed cities are forgotten
+            districts = {district for city in self._data["cities"].values() for district in city["districts"]}
+            self._data["pages"] = {district: pages for district, pages in self._data["pages"].items()
+                                   if district in districts}
+
+    # Cities whose districts were never scraped or expired
+    def stale_cities(self, cities: List[str] = None) -> List[str]:
+        """Cities whose districts were never scraped or expired
+
+        Parameters
+        ----------
+        cities: list, optional
+            links to cities (default all known cities)
+
+        Returns
+        ------
+        list
+            links to cities
+        """
+
+        now = time.time()
+        with self._lock:
+            known = self._data["cities"]
+            cities = list(known) if cities is None else cities
+            return [city for city in cities if (city not in known) or (now - known[city]["updated"] > self.ttl)]
+
+    # Save districts of city
+    def set_districts(self, city: str, districts: List[str]) -> None:
+        with self._lock:
+            self._data["cities"][city] = {"updated": time.time(), "districts": list(districts)}
+
+    # Districts of all cities
+    def districts(self) -> List[str]:
+        with self._lock:
+            return [district for city in self._data["cities"].values() for district in city["districts"]]
+
+    # Districts whose number of pages is unknown or expired
+    def stale_districts(self) -> List[str]:
+        now = time.time()
+        with self._lock:
+            pages = self._data["pages"]
+            return [district for city in self._data["cities"].values() for district in city["districts"]
+                    if (district not in pages) or (now - pages[district]["updated"] > self.pages_ttl)]
+
+    # Last known numbers of pages of districts
+    def page_counts(self, districts: List[str]) -> Dict[str, int]:
+        """Last known numbers of pages of districts, also expired ones (they are refreshed in background)
+
+        Parameters
+        ----------
+        districts: list
+            links to districts
+
+        Returns
+        ------
+        dict
+            district: number of pages, districts without known number are skipped
+        """
+
+        with self._lock:
+            pages = self._data["pages"]
+            return {district: pages[district]["count"] for district in districts if district in pages}
+
+    # Save number of pages of district
+    def set_page_count(self, district: str, count: int) -> None:
+        with self._lock:
+            self._data["pages"][district] = {"updated": time.time(), "count": count}
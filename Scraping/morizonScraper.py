@@ -1,500 +1,658 @@
-#Scraping Morizon
-import sys
-sys.path.append('Scraping')
-
-#Libraries
-from bs4 import BeautifulSoup
-from urllib.request import urlopen
-from collections import defaultdict
-from datetime import datetime
-import concurrent.futures
-from scraper import Scraper
-import numpy as np
-import pandas as pd
-from typing import Tuple, List, Callable, DefaultDict, Union, Dict
-
-MAX_THREADS = 30
-PAGE_NAME = 'https://www.morizon.pl'
-
-
-class ScrapingMorizon(Scraper):
-    """
-    A class used to scrape offers from morizon.pl
-
-    ...
-
-    Attributes
-    ----------
-    page : str
-        full main page name
-    page_name : str
-        specific page name which determines if you want to rent or buy/home or apartment etc.
-    max_threads : int
-        maximum number of threads (default 30)
-
-    Methods
-    -------
-    scraping_cities_and_districts_links(page: str) -> Tuple[List[str], List[str]]
-        Scraping cities and running function to scrape districts
-
-    scraping_districts_links(city_link: str) -> List[str]:
-        Scraping cities and districts
-
-    get_districts_cities() -> List[str]:
-        Get districts links
-
-    scraping_pages_links(district_link: str) -> List[str]:
-        Scraping pages links
-
-    get_pages(districts: List[str] = []) -> List[str]:
-        The method called up by the user to download all links of the pages from morizon.pl
-
-    scraping_offers_links(page_link: str) -> List[str]:
-        Scraping offers links
-
-    get_offers(pages: List[str] = []) -> List[str]:
-        Get districts and cities links
-
-    missed_details_func(links: List[str]) -> Tuple[List[str], List[str]]:
-        Scrape missed details links
-
-    get_details(split_size: int, offers: List[str] = []) -> None:
-        The method called up by the user to download all details about apartments.
-
-    scraping_offers_details(link: str) -> Union[DefaultDict[str,str], str]:
-        Scraping details from offer
-
-    information_exists(details: List[str]) -> Union[List[str], str]:
-        Verify if basic information in 'em' tag exists
-
-    spatial_data_exists(data: List[str], kind: str) -> Union[List[str], str]:
-        Verify if information about apartment location exists
-    """
-
-    def __init__(self, page, page_name, max_threads = 30):
-        """
-        Parameters
-        ----------
-        page : str
-            full main page name
-        page_name : str
-            specific page name which determines if you want to rent or buy/home or apartment etc.
-        max_threads : int
-            maximum number of threads (default 30)
-        """
-        
-        self.page = page
-        self.max_threads = max_threads
-        self.page_name = page_name
-        
-    #Scraping cities and running function to scrape districts
-    def scraping_cities_and_districts_links(self, page: str) -> Tuple[List[str], List[str]]:
-        """Scraping cities and running function to scrape districts
-
-        Parameters
-        ----------
-        page: str
-            full main page name 
-        Returns
-        ------
-        list, list
-            1. links to cities
-            2. links to individual city districts
-        """
-        
-        #Read website, encode and create HTML parser
-        soup_cities = self.enterPage_parser(page)
-
-        #Extract cities names and links
-        cities_names, cities_newest_links = self.extract_links_idClass(isId = True, to_find = 'locationListChildren',soup = soup_cities, replace = True, replace_to = ["mieszkania", "mieszkania/najnowsze"])
-
-        threads = min(self.max_threads, len(cities_newest_links))
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
-            results = list(executor.map(self.scraping_districts_links, cities_newest_links))
-            
-        return cities_newest_links, results
-    
-    #Scraping districts links
-    def scraping_districts_links(self, city_link: str) -> List[str]:
-        """Scraping districts links
-
-        Parameters
-        ----------
-        city_link: str
-            link to specific city
-        Returns
-        ------
-        list
-            links to individual city districts
-        """
-        #Create city link
-        link = self.page_name + city_link
-
-        try:
-            #Read website, encode and create HTML parser
-            soup_districts = self.enterPage_parser(link)
-            
-            #Extract districts names and links
-            districts_names, districs_links = self.extract_links_idClass(isId = True, to_find = 'locationListChildren', soup = soup_districts, replace = True, replace_to = ["mieszkania", "mieszkania/najnowsze"])
-        
-            districs_newest_links = districs_links
-        
-        except:
-            districs_newest_links = link
-            
-        return districs_newest_links
-            
-    #Get districts links
-    def get_districts_cities(self) -> List[str]:
-        """Scraping districts links
-
-        Returns
-        ------
-        list
-            links to individual city districts
-        """
-        
-        cities_newest_links, results_districts = self.scraping_cities_and_districts_links(self.page)
-        results_districts = np.concatenate([districts for districts in results_districts if districts is not None], axis=0)
-        
-        return results_districts
-
-    #Scraping pages links
-    def scraping_pages_links(self, district_link: str) -> List[str]:
-        """Scraping pages links
-
-        Parameters
-        ----------
-        district_link: str
-            link to specific district
-
-        Returns
-        ------
-        list
-            scraped pages links
-        """
-        
-        #Create link
-        link = self.page_name + district_link
-        
-        try:
-            #Read website, encode and create HTML parser
-            soup_pages = self.enterPage_parser(link)
-             
-            #Extract pages numbers and links
-            pages_names, pages_newest_links = self.extract_links_idClass(isId = False, to_find = 'nav nav-pills mz-pagination-number', soup = soup_pages,replace = False)
-
-            pages_range = self.prepare_range(pages_names)
-            
-            #Create all pages links
-            pages_links = [link + '?page=' + str(page) for page in pages_range]
-            
-            all_pages_links = pages_links
-        
-        except:
-            all_pages_links = link
-            
-        return all_pages_links
-    
-    #The method called up by the user to download all links of the pages from morizon.pl
-    def get_pages(self, districts: List[str] = []) -> List[str]:
-        """The method called up by the user to download all links of the pages from morizon.pl
-
-        Parameters
-        ----------
-        districts: list, optional
-            for which districts the links to the pages are to be downloaded (default for all)
-
-        Returns
-        ------
-        list
-            flatten pages links
-        """
-        
-        #Verify whether user want to specify specific districts
-        if any(districts):
-            results_districts = districts
-        else:
-            results_districts = self.get_districts_cities()
-        
-        results_pages = self.scraping_all_links(self.scraping_pages_links,results_districts)
-        results_pages = self.flatten(results_pages)
-        
-        missed_pages = [offers for offers in results_pages if "page" not in offers]
-        
-        if len(missed_pages) != 0:
-            results_pages = self.flatten([properties for properties in results_pages if (properties != None) & ("page" in properties)])
-
-        missed_pages_list = self.missed_links_all(missed_offers = missed_pages, func = self.missed_offers_pages, details = False, offers = False, func_pages_or_offers = self.scraping_pages_links)
-        results_pages = self.join_missed_with_scraped(missed_pages_list,results_pages)
-
-        return self.flatten(results_pages)
-    
-    #Scraping offers links
-    def scraping_offers_links(self, page_link: str) -> List[str]:
-        """Scraping offers links
-
-        Parameters
-        ----------
-        page_link: str
-            link to specific page
-
-        Returns
-        ------
-        list
-            scraped offers links
-        """
-        
-        try:
-            #Read website, encode and create HTML parser
-            soup_offers = self.enterPage_parser(page_link)
-               
-            properties_links = soup_offers.findAll(class_ = "property_link")
-            properties_links = [link.get("href") for link in properties_links if("oferta" in link.get("href"))]
-            
-            all_properties_links = properties_links
-    
-        except:
-            all_properties_links = page_link
-            
-        return all_properties_links
-    
-    #Get districts and cities links
-    def get_offers(self, split_size: int, pages: List[str] = []) -> List[str]:
-        """The method called up by the user to download all links of the properties from morizon.pl
-
-        Parameters
-        ----------
-        split_size: int
-           value divided by total number of links it is used to create splits to relieve RAM memory
-        pages: list, optional
-            for which pages the links to the properties are to be downloaded (default for all)
-
-        Returns
-        ------
-        list
-            flatten properties links
-        """
-        
-        #Verify whether user want to specify specific pages
-        if any(pages):
-            results_pages = pages
-        else:
-            results_pages = self.get_pages()
-
-        #Create splits to relieve RAM memory
-        splitted = self.create_split(links=results_pages, split_size=split_size)
-
-        results_offers_all = list()
-        for split in splitted:
-
-            # Scrape all offers
-            results_offers = self.scraping_all_links(self.scraping_offers_links,results_pages[split[0]:split[1]])
-
-            # Verify weather there are some missing offers
-            missed_offers = [offers for offers in results_offers if "page" in offers]
-            results_offers = [properties for properties in self.flatten(results_offers) if ("page" not in properties)]
-
-            # Scrape missing offers and join them with scraped before
-            missed_offers_list = self.missed_links_all(missed_offers = missed_offers, func = self.missed_offers_pages, details = False, offers = True, func_pages_or_offers = self.scraping_offers_links)
-            results_offers = self.join_missed_with_scraped(missed_offers_list,results_offers)
-
-            results_offers_all.append(results_offers)
-
-        return self.flatten(results_offers_all)
-    
-    #Scrape missed details links
-    def missed_details_func(self, links: List[str]) -> Tuple[List[str], List[str]]:
-        """Scrape missed details links
-
-        Parameters
-        ----------
-        links: list
-            missing links
-            
-        Returns
-        ------
-        list, list
-            1. scraped missed links
-            2. links that are still missing
-        """
-        
-        links = self.scraping_all_links(self.scraping_offers_details_exceptions,links)
-        
-        #Assign missed links to variable
-        missed_links = [details for details in links if "www.morizon.pl" in details]
-        
-        return links, missed_links
-
-    #Get apartments details
-    def get_details(self, split_size: int, offers: List[str] = []) -> None:
-        """The method called up by the user to download all details about apartments.
-         Results are saved to number_of_links/split.csv files
-
-        Parameters
-        ----------
-        split_size: int
-           value divided by total number of links it is used to create splits to relieve RAM memory
-        offers: list, optional
-            for which offers links the properties are to be downloaded (default for all)
-
-        """
-
-        #Verify whether user want to specify specific pages
-        if any(offers):
-            results_offers = offers
-        else:
-            results_offers = self.get_offers()
-
-        #Create splits to relieve RAM memory
-        splitted = self.create_split(links=results_offers, split_size=split_size)
-        results_details_all = list()
-
-        for split in splitted:
-
-            results_details = self.scraping_all_links(self.scraping_offers_details_exceptions,results_offers[split[0]:split[1]])
-
-            #Assign to variables missed links and scraped properly
-            missed_details = [details for details in results_details if "www.morizon.pl" in details]
-            results_details = self.flatten([details for details in results_details if (details != None) & ("www.morizon.pl" not in details)])
-            
-            #Scrape missed links and join them to already scraped
-            missed_details_list = self.missed_links_all(missed_offers = missed_details, func = self.missed_details_func, restriction = 5, details = True)
-            results_details = self.join_missed_with_scraped(missed_details_list,results_details)
-            
-            #Information for user
-            #print("%s splits left" %(len(splitted) - (splitted.index(split) + 1)))
-
-            #Save scraped details as csv file
-            results_details = [result for result in results_details if (result != "Does not exist") & (result != None) & ("www.morizon.pl" not in result)]
-
-            results_details_all.append(results_details)
-
-        return pd.concat([pd.DataFrame(x) for x in results_details_all])
-    
-    #Scraping details from offer
-    def scraping_offers_details(self, link: str) -> Union[DefaultDict[str,str], str]:
-        """Try to connect with offer link, if it is not possible save link to global list
-
-        Parameters
-        ----------
-        link: str
-           offer link
-         
-        Returns
-        ------
-        defaultdict or str
-            1. the details of the flat
-            2. information that offer is no longer available
-        """
-        
-        #Scraping details from link
-        offer_infos = defaultdict(list)
-        soup_details = self.enterPage_parser(link)
-        try:
-            #Title and subtitle
-            title = self.extract_information(self.soup_find_information(soup = soup_details,
-                                                                   find_attr = ['div', 'class', 'summaryLocation clearfix row']).find_all("span"))
-               
-            subtitle = self.extract_information(self.soup_find_information(soup = soup_details,
-                                                                    find_attr = ['div', 'class', 'summaryTypeTransaction clearfix']))
-
-            # Localization path
-            localization_path = self.extract_information(self.soup_find_information(soup=soup_details,
-                                                                          find_attr=['nav', 'class',
-                                                                                     'breadcrumbs']).find_all("span"))
-            #Basic information
-            price = self.information_exists(self.soup_find_information(soup = soup_details,
-                                                                 find_attr = ['li', 'class', 'paramIconPrice']))
-            priceM2 = self.information_exists(self.soup_find_information(soup = soup_details,
-                                                                 find_attr = ['li', 'class', 'paramIconPriceM2']))
-            area = self.information_exists(self.soup_find_information(soup = soup_details,
-                                                                 find_attr = ['li', 'class', 'paramIconLivingArea']))
-            rooms = self.information_exists(self.soup_find_information(soup = soup_details,
-                                                                    find_attr = ['li', 'class', 'paramIconNumberOfRooms']))
-               
-               
-            #Params
-            params = soup_details.find(class_ = "propertyParams")
-            params_h3 = [element.text for element in params.findAll("h3")]
-            params_tables = [element.text for element in params.findAll("table")]
-            params_p = [element.text for element in params.findAll("p")]
-            
-            #Description
-            description = self.extract_information(self.soup_find_information(soup = soup_details,
-                                                                find_attr = ['div', 'class', 'description']),True, "p")
-            soup_details.find("section", attrs={"class": "propertyMap"})
-            
-            #Longitude and Latitude
-            google_map = self.soup_find_information(soup = soup_details, find_attr = ['div', 'class', 'GoogleMap'])
-            lat = self.spatial_data_exists(google_map, 'data-lat')
-            lng = self.spatial_data_exists(google_map, 'data-lng')
-            
-            #Assign information to dictionary
-            #offer_infos["city"] = city_name
-            #offer_infos["district"] = district.split("najnowsze/")[1].split("/")[1]
-            offer_infos["title"] = title
-            offer_infos["subtitle"] = subtitle
-            offer_infos["localization_path"] = localization_path
-            offer_infos["price"] = price
-            offer_infos["priceM2"] = priceM2
-            offer_infos["area"] = area
-            offer_infos["rooms"] = rooms
-            offer_infos["params_h3"] = params_h3
-            offer_infos["params_tables"] = params_tables
-            offer_infos["params_p"] = params_p
-            offer_infos["description"] = description
-            offer_infos["lat"] = lat
-            offer_infos["lng"] = lng
-            offer_infos["link"] = link
-            
-            return(offer_infos)
-            
-        except:
-            return "Does not exist"
-    
-    #Verify if basic information in 'em' tag exists
-    def information_exists(self, details: List[str]) -> Union[List[str], str]:
-        """Verify if basic information in 'em' tag exists
-
-        Parameters
-        ----------
-        details: list
-            elements with specific attributes
-            
-        Returns
-        ------
-        list or str
-            1. elements with specific attributes
-            2. "None" informs that information is not available
-        """
-        
-        try:
-            return self.extract_information(details.em)
-        except:
-            return None
-    
-    #Verify if information about apartment location exists
-    def spatial_data_exists(self, data: List[str], kind: str) -> Union[List[str], str]:
-        """Verify if information about apartment location exists
-
-        Parameters
-        ----------
-        data: list
-            extracted information about longitude and latitude
-        kind: str
-            determines whether longitude or latitude is searched
-
-        Returns
-        ------
-        list or str
-            1. elements with specific attributes
-            2. "None" informs that information is not available
-
-        """
-
-        try:
-            return data[kind]
-        except:
-            return None
+#Scraping Morizon
+import sys
+sys.path.append('Scraping')
+
+#Libraries
+from bs4 import BeautifulSoup
+from urllib.request import urlopen
+from collections import defaultdict
+from datetime import datetime
+import threading
+from scraper import Scraper
+from fetchResult import FetchResult, OK, FAILED, GONE
+from scraperMetrics import timed_stage
+from extractionSpec import DomField, DomSpec
+from locationTopology import LocationTopology
+import numpy as np
+import pandas as pd
+from typing import Tuple, List, Callable, DefaultDict, Union, Dict
+
+MAX_THREADS = 30
+PAGE_NAME = 'https://www.morizon.pl'
+
+#Fields of offer in HTML of detail page, all of them are found in one walk of the document
+DETAILS_SPEC = DomSpec({
+    "title": DomField("div", {"class": "summaryLocation clearfix row"},
+                      post=lambda tag, scraper: scraper.extract_information(tag.find_all("span"))),
+    "subtitle": DomField("div", {"class": "summaryTypeTransaction clearfix"},
+                         post=lambda tag, scraper: scraper.extract_information(tag)),
+    "localization_path": DomField("nav", {"class": "breadcrumbs"},
+                                  post=lambda tag, scraper: scraper.extract_information(tag.find_all("span"))),
+    #Basic information
+    "price": DomField("li", {"class": "paramIconPrice"}, post=lambda tag, scraper: scraper.information_exists(tag)),
+    "priceM2": DomField("li", {"class": "paramIconPriceM2"},
+                        post=lambda tag, scraper: scraper.information_exists(tag)),
+    "area": DomField("li", {"class": "paramIconLivingArea"},
+                     post=lambda tag, scraper: scraper.information_exists(tag)),
+    "rooms": DomField("li", {"class": "paramIconNumberOfRooms"},
+                      post=lambda tag, scraper: scraper.information_exists(tag)),
+    #Params
+    "params_h3": DomField(None, {"class": "propertyParams"},
+                          post=lambda tag, scraper: [element.text for element in tag.find_all("h3")]),
+    "params_tables": DomField(None, {"class": "propertyParams"},
+                              post=lambda tag, scraper: [element.text for element in tag.find_all("table")]),
+    "params_p": DomField(None, {"class": "propertyParams"},
+                         post=lambda tag, scraper: [element.text for element in tag.find_all("p")]),
+    #Description
+    "description": DomField("div", {"class": "description"},
+                            post=lambda tag, scraper: scraper.extract_information(tag, True, "p")),
+    #Longitude and Latitude
+    "lat": DomField("div", {"class": "GoogleMap"},
+                    post=lambda tag, scraper: scraper.spatial_data_exists(tag, 'data-lat')),
+    "lng": DomField("div", {"class": "GoogleMap"},
+                    post=lambda tag, scraper: scraper.spatial_data_exists(tag, 'data-lng'))})
+
+
+class ScrapingMorizon(Scraper):
+    """
+    A class used to scrape offers from morizon.pl
+
+    ...
+
+    Attributes
+    ----------
+    page : str
+        full main page name
+    page_name : str
+        specific page name which determines if you want to rent or buy/home or apartment etc.
+    max_threads : int
+        maximum number of threads (default 30)
+    topology : LocationTopology
+        cities, districts and page counts of districts kept between runs (None if topology_path is not set)
+
+    Methods
+    -------
+    scraping_cities_links(page: str) -> List[str]:
+        Scraping cities links
+
+    scraping_cities_page(page: str) -> FetchResult:
+        Scraping cities links from main page
+
+    scraping_cities_and_districts_links(page: str) -> Tuple[List[str], List[str]]
+        Scraping cities and running function to scrape districts
+
+    scraping_districts_links(city_link: str) -> FetchResult:
+        Scraping cities and districts
+
+    get_districts_cities() -> List[str]:
+        Get districts links
+
+    refresh_topology() -> None:
+        Scrape expired parts of topology
+
+    start_topology_refresh() -> threading.Thread:
+        Refresh topology in background thread
+
+    wait_topology_refresh() -> None:
+        Wait until background refresh of topology is finished
+
+    close() -> None:
+        Wait for background refresh of topology and close scraper
+
+    record_page_counts(results_pages: List[FetchResult]) -> None:
+        Save numbers of pages of scraped districts to topology
+
+    grown_pages() -> List[str]:
+        Pages added to districts since get_pages used their expired numbers of pages
+
+    page_sources() -> List[str]:
+        Districts links used to find all pages
+
+    newest_page_link(district_link: str, page_number: int) -> str:
+        Link to listing page of district sorted from the newest offers
+
+    scraping_pages_links(district_link: str) -> FetchResult:
+        Scraping pages links
+
+    get_pages(districts: List[str] = []) -> List[str]:
+        The method called up by the user to download all links of the pages from morizon.pl
+
+    scraping_offers_links(page_link: str) -> FetchResult:
+        Scraping offers links
+
+    get_offers(pages: List[str] = []) -> List[str]:
+        Get districts and cities links
+
+    scraping_offers_details(link: str) -> FetchResult:
+        Scraping details from offer
+
+    information_exists(details: List[str]) -> Union[List[str], str]:
+        Verify if basic information in 'em' tag exists
+
+    spatial_data_exists(data: List[str], kind: str) -> Union[List[str], str]:
+        Verify if information about apartment location exists
+    """
+
+    # Cities list is kept in on-disk cache for a week, districts lists and first pages of districts for 6 hours
+    cache_url_classes = {"cities": (r"^https?://www\.morizon\.pl/[^?]*mieszkania/?$", 7 * 24 * 3600),
+                         "locations": (r"^https?://www\.morizon\.pl/[^?]*mieszkania/najnowsze/[^?]*$", 6 * 3600)}
+
+    def __init__(self, page, page_name, max_threads=30, topology_path=None, topology_ttl=7 * 24 * 3600,
+                 pages_ttl=6 * 3600, **kwargs):
+        """
+        Parameters
+        ----------
+        page : str
+            full main page name
+        page_name : str
+            specific page name which determines if you want to rent or buy/home or apartment etc.
+        max_threads : int
+            maximum number of threads (default 30)
+        topology_path : str, optional
+            JSON file where cities, districts and page counts of districts are kept between runs (default they are
+            scraped in every run)
+        topology_ttl : float
+            seconds after which cities and districts are scraped again (default a week)
+        pages_ttl : float
+            seconds after which number of pages of district is scraped again (default 6 hours)
+        kwargs :
+            optional settings of Scraper e.g. fetch_backend
+        """
+
+        super().__init__(max_threads=max_threads, **kwargs)
+        self.page = page
+        self.page_name = page_name
+        self.topology = LocationTopology(topology_path, topology_ttl, pages_ttl) if topology_path else None
+        self._topology_refresh = None
+        self._topology_lock = threading.Lock()
+        self._expired_page_counts = {}
+
+    #Scraper sent to parse worker processes has no background refresh
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        state["topology"] = None
+        state["_topology_refresh"] = None
+        state["_topology_lock"] = None
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        self._topology_lock = threading.Lock()
+
+    #Scraping cities links
+    def scraping_cities_links(self, page: str) -> List[str]:
+        """Scraping cities links
+
+        Parameters
+        ----------
+        page: str
+            full main page name
+        Returns
+        ------
+        list
+            links to cities (empty if main page was not scraped after max_attempts, it is saved to failed_links)
+        """
+
+        #Main page is retried with backoff like other pages, a single error does not stop the run
+        cities = self.scraping_all_links(self.scraping_cities_page, [page])[0]
+
+        return cities.payload if cities.status == OK else []
+
+    #Scraping cities links from main page
+    def scraping_cities_page(self, page: str) -> FetchResult:
+        """Scraping cities links from main page
+
+        Parameters
+        ----------
+        page: str
+            full main page name
+        Returns
+        ------
+        FetchResult
+            links to cities (payload of OK result)
+        """
+
+        try:
+            #Read website, encode and create HTML parser
+            soup_cities = self.enterPage_parser(page)
+
+            #Extract cities names and links
+            cities_names, cities_newest_links = self.extract_links_idClass(isId = True, to_find = 'locationListChildren',soup = soup_cities, replace = True, replace_to = ["mieszkania", "mieszkania/najnowsze"])
+
+            cities_links = FetchResult(OK, page, cities_newest_links)
+
+        except Exception as error:
+            cities_links = FetchResult(FAILED, page, error=error)
+
+        return cities_links
+        
+    #Scraping cities and running function to scrape districts
+    def scraping_cities_and_districts_links(self, page: str) -> Tuple[List[str], List[str]]:
+        """Scraping cities and running function to scrape districts
+
+        Parameters
+        ----------
+        page: str
+            full main page name 
+        Returns
+        ------
+        list, list
+            1. links to cities
+            2. links to individual city districts
+        """
+        
+        cities_newest_links = self.scraping_cities_links(page)
+
+        #Districts of all cities, missing ones are retried
+        results = self.scraping_all_links(self.scraping_districts_links, cities_newest_links)
+            
+        return cities_newest_links, results
+    
+    #Scraping districts links
+    def scraping_districts_links(self, city_link: str) -> FetchResult:
+        """Scraping districts links
+
+        Parameters
+        ----------
+        city_link: str
+            link to specific city
+        Returns
+        ------
+        FetchResult
+            links to individual city districts (payload of OK result)
+        """
+        #Create city link
+        link = self.page_name + city_link
+
+        try:
+            #Read website, encode and create HTML parser
+            soup_districts = self.enterPage_parser(link)
+            
+            #Extract districts names and links
+            districts_names, districs_links = self.extract_links_idClass(isId = True, to_find = 'locationListChildren', soup = soup_districts, replace = True, replace_to = ["mieszkania", "mieszkania/najnowsze"])
+        
+            districs_newest_links = FetchResult(OK, city_link, districs_links)
+        
+        except Exception as error:
+            districs_newest_links = FetchResult(FAILED, city_link, error=error)
+            
+        return districs_newest_links
+            
+    #Get districts links
+    def get_districts_cities(self) -> List[str]:
+        """Scraping districts links
+
+        Returns
+        ------
+        list
+            links to individual city districts
+        """
+        
+        #Districts kept between runs are used at once, expired parts are scraped in background
+        if self.topology is not None:
+            if self.topology.is_empty():
+                self.refresh_topology()
+            elif self.topology.is_stale():
+                self.start_topology_refresh()
+            return self.topology.districts()
+
+        cities_newest_links, results_districts = self.scraping_cities_and_districts_links(self.page)
+        results_districts = [district for districts in results_districts if districts.status == OK for district in districts.payload]
+        
+        return results_districts
+
+    #Scrape expired parts of topology
+    def refresh_topology(self) -> None:
+        """Scrape expired parts of topology: list of cities, districts of cities which expired and then numbers of
+        pages of districts which expired. Cities and districts which were not scraped keep their previous values"""
+
+        #Cities which were not scraped keep their previous list
+        if self.topology.cities_expired():
+            cities_newest_links = self.scraping_cities_links(self.page)
+            if len(cities_newest_links) != 0:
+                self.topology.set_cities(cities_newest_links)
+
+        #Districts of new and expired cities, missing ones are retried
+        results_districts = self.scraping_all_links(self.scraping_districts_links, self.topology.stale_cities())
+        for districts in results_districts:
+            if districts.status == OK:
+                self.topology.set_districts(districts.link, districts.payload)
+        self.topology.save()
+
+        #Numbers of pages of new and expired districts
+        self.record_page_counts(self.scraping_all_links(self.scraping_pages_links, self.topology.stale_districts()))
+
+    #Refresh topology in background thread
+    def start_topology_refresh(self) -> threading.Thread:
+        """Refresh topology in background thread, scraping goes on with the last known topology
+
+        Returns
+        ------
+        Thread
+            thread of refresh (the running one if refresh was already started)
+        """
+
+        with self._topology_lock:
+            if (self._topology_refresh is None) or (not self._topology_refresh.is_alive()):
+                self._topology_refresh = threading.Thread(target=self.refresh_topology, name="topology-refresh")
+                self._topology_refresh.start()
+
+            return self._topology_refresh
+
+    #Wait until background refresh of topology is finished
+    def wait_topology_refresh(self) -> None:
+        with self._topology_lock:
+            refresh = self._topology_refresh
+        if refresh is not None:
+            refresh.join()
+
+    #Wait for background refresh of topology and close scraper
+    def close(self) -> None:
+        self.wait_topology_refresh()
+        super().close()
+
+    #Save numbers of pages of scraped districts to topology
+    def record_page_counts(self, results_pages: List[FetchResult]) -> None:
+        """Save numbers of pages of scraped districts to topology
+
+        Parameters
+        ----------
+        results_pages: list
+            results of scraping_pages_links
+        """
+
+        for pages in results_pages:
+            if pages.status == OK:
+                self.topology.set_page_count(pages.link, len(pages.payload))
+        self.topology.save()
+
+    #Pages added to districts since get_pages used their expired numbers of pages
+    def grown_pages(self) -> List[str]:
+        """Pages added to districts since get_pages used their expired numbers of pages, they are known when
+        background refresh of topology is finished
+
+        Returns
+        ------
+        list
+            links to pages beyond numbers used by get_pages (empty while refresh is running)
+        """
+
+        with self._topology_lock:
+            refresh = self._topology_refresh
+        if (len(self._expired_page_counts) == 0) or ((refresh is not None) and refresh.is_alive()):
+            return []
+
+        page_counts = self.topology.page_counts(list(self._expired_page_counts))
+        pages_links = [self.page_name + district + '?page=' + str(page)
+                       for district, count in self._expired_page_counts.items()
+                       for page in range(count + 1, page_counts.get(district, count) + 1)]
+        self._expired_page_counts = {}
+
+        return pages_links
+
+    #Districts links used to find all pages
+    def page_sources(self) -> List[str]:
+        """Districts links used to find all pages
+
+        Returns
+        ------
+        list
+            links to individual city districts
+        """
+
+        return list(self.get_districts_cities())
+
+    #Link to listing page sorted from the newest offers
+    def newest_page_link(self, district_link: str, page_number: int) -> str:
+        """Link to listing page of district sorted from the newest offers, districts links already point to
+        the newest offers
+
+        Parameters
+        ----------
+        district_link: str
+            link to specific district
+        page_number: int
+            number of page (from 1)
+
+        Returns
+        ------
+        str
+            link to page
+        """
+
+        return self.page_name + district_link + '?page=' + str(page_number)
+
+    #Scraping pages links
+    def scraping_pages_links(self, district_link: str) -> FetchResult:
+        """Scraping pages links
+
+        Parameters
+        ----------
+        district_link: str
+            link to specific district
+
+        Returns
+        ------
+        FetchResult
+            scraped pages links (payload of OK result)
+        """
+        
+        #Create link
+        link = self.page_name + district_link
+        
+        try:
+            #Read website, encode and create HTML parser
+            soup_pages = self.enterPage_parser(link)
+             
+            #Extract pages numbers and links
+            pages_names, pages_newest_links = self.extract_links_idClass(isId = False, to_find = 'nav nav-pills mz-pagination-number', soup = soup_pages,replace = False)
+
+            pages_range = self.prepare_range(pages_names)
+            
+            #Create all pages links
+            pages_links = [link + '?page=' + str(page) for page in pages_range]
+            
+            all_pages_links = FetchResult(OK, district_link, pages_links)
+        
+        except Exception as error:
+            all_pages_links = FetchResult(FAILED, district_link, error=error)
+            
+        return all_pages_links
+    
+    #The method called up by the user to download all links of the pages from morizon.pl
+    @timed_stage("pages")
+    def get_pages(self, districts: List[str] = []) -> List[str]:
+        """The method called up by the user to download all links of the pages from morizon.pl. If topology is
+        kept, districts with known number of pages are not requested, their numbers are refreshed in background
+        and pages added since then are scraped by get_offers (see grown_pages)
+
+        Parameters
+        ----------
+        districts: list, optional
+            for which districts the links to the pages are to be downloaded (default for all)
+
+        Returns
+        ------
+        list
+            flatten pages links
+        """
+        
+        #Verify whether user want to specify specific districts
+        if any(districts):
+            results_districts = districts
+        else:
+            results_districts = self.get_districts_cities()
+        
+        #Pages of districts with known number of pages are not counted again, districts refreshed in background
+        #after stale_districts have their new numbers
+        stale_districts = set() if self.topology is None else set(self.topology.stale_districts())
+        page_counts = {} if self.topology is None else self.topology.page_counts(results_districts)
+
+        #Pages added to districts with expired number of pages are found when background refresh is finished
+        self._expired_page_counts.update((district, count) for district, count in page_counts.items()
+                                         if district in stale_districts)
+
+        #Scrape pages of other districts, missing ones are retried
+        results_pages = self.scraping_all_links(self.scraping_pages_links,
+                                                [district for district in results_districts if district not in page_counts])
+        if self.topology is not None:
+            self.record_page_counts(results_pages)
+        results_pages = {pages.link: pages.payload for pages in results_pages if pages.status == OK}
+
+        pages_links = []
+        for district in results_districts:
+            if district in page_counts:
+                pages_links.extend(self.page_name + district + '?page=' + str(page)
+                                   for page in range(1, page_counts[district] + 1))
+            else:
+                pages_links.extend(results_pages.get(district, []))
+
+        return pages_links
+    
+    #Scraping offers links
+    def scraping_offers_links(self, page_link: str) -> FetchResult:
+        """Scraping offers links
+
+        Parameters
+        ----------
+        page_link: str
+            link to specific page
+
+        Returns
+        ------
+        FetchResult
+            scraped offers links (payload of OK result)
+        """
+        
+        try:
+            #Read website and extract links from property links
+            properties_links = self.extract_links_streaming(page_link, attribute="href", class_="property_link")
+            properties_links = [link for link in properties_links if ("oferta" in link)]
+            
+            all_properties_links = FetchResult(OK, page_link, properties_links)
+    
+        except Exception as error:
+            all_properties_links = FetchResult(FAILED, page_link, error=error)
+            
+        return all_properties_links
+    
+    #Get districts and cities links
+    @timed_stage("offers")
+    def get_offers(self, split_size: int, pages: List[str] = []) -> List[str]:
+        """The method called up by the user to download all links of the properties from morizon.pl. Pages added
+        to districts whose expired numbers of pages were used by get_pages are also scraped, if background refresh
+        of topology is finished before or while offers are scraped
+
+        Parameters
+        ----------
+        split_size: int
+           value divided by total number of links it is used to create splits to relieve RAM memory
+        pages: list, optional
+            for which pages the links to the properties are to be downloaded (default for all)
+
+        Returns
+        ------
+        list
+            flatten properties links
+        """
+        
+        #Verify whether user want to specify specific pages
+        if any(pages):
+            results_pages = pages
+        else:
+            results_pages = self.get_pages()
+
+        #Pages added to districts whose expired numbers of pages were used, if their refresh is finished
+        results_pages = list(results_pages) + self.grown_pages()
+
+        #Create splits to relieve RAM memory
+        splitted = self.create_split(links=results_pages, split_size=split_size)
+
+        results_offers_all = list()
+        for split in splitted:
+
+            # Scrape all offers, missing ones are retried
+            results_offers = self.scraping_all_links(self.scraping_offers_links,results_pages[split[0]:split[1]])
+
+            results_offers_all.extend(offer for offers in results_offers if offers.status == OK for offer in offers.payload)
+
+        #Refresh finished while offers were scraped
+        results_offers = self.scraping_all_links(self.scraping_offers_links, self.grown_pages())
+        results_offers_all.extend(offer for offers in results_offers if offers.status == OK for offer in offers.payload)
+
+        return results_offers_all
+    
+    #Scraping details from offer
+    def scraping_offers_details(self, link: str) -> FetchResult:
+        """Try to connect with offer link, if it is not possible save link to global list
+
+        Parameters
+        ----------
+        link: str
+           offer link
+         
+        Returns
+        ------
+        FetchResult
+            1. OK with the details of the flat
+            2. GONE if offer is no longer available
+        """
+        
+        #Scraping details from link
+        offer_infos = defaultdict(list)
+        soup_details = self.enterPage_parser(link)
+        try:
+            #Target nodes of all fields are collected in one walk of the document
+            offer_infos.update(DETAILS_SPEC.extract(soup_details, self))
+            offer_infos["link"] = link
+            
+            return FetchResult(OK, link, offer_infos)
+            
+        except:
+            return FetchResult(GONE, link)
+    
+    #Verify if basic information in 'em' tag exists
+    def information_exists(self, details: List[str]) -> Union[List[str], str]:
+        """Verify if basic information in 'em' tag exists
+
+        Parameters
+        ----------
+        details: list
+            elements with specific attributes
+            
+        Returns
+        ------
+        list or str
+            1. elements with specific attributes
+            2. "None" informs that information is not available
+        """
+        
+        try:
+            return self.extract_information(details.em)
+        except:
+            return None
+    
+    #Verify if information about apartment location exists
+    def spatial_data_exists(self, data: List[str], kind: str) -> Union[List[str], str]:
+        """Verify if information about apartment location exists
+
+        Parameters
+        ----------
+        data: list
+            extracted information about longitude and latitude
+        kind: str
+            determines whether longitude or latitude is searched
+
+        Returns
+        ------
+        list or str
+            1. elements with specific attributes
+            2. "None" informs that information is not available
+
+        """
+
+        try:
+            return data[kind]
+        except:
+            return None
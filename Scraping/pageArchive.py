@@ -0,0 +1,208 @@
+# Archive of downloaded pages
+
+# Libraries
+import hashlib
+import os
+import sqlite3
+import threading
+import weakref
+from datetime import datetime
+from typing import List
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Write pages, commit the index and close files of archive
+def close_files(data, index) -> None:
+    data.flush()
+    index.commit()
+    data.close()
+    index.close()
+
+
+class PageNotArchived(KeyError):
+    """Raised by PageArchive.load for page which is not in archive, reading it again would not help"""
+
+
+class PageArchive:
+    """
+    A class used to keep every downloaded page in an append-only, zstd compressed, content-addressed archive
+
+    Pages are saved to pages.zst as separate zstd frames, the same content is saved only once. index.sqlite maps
+    link and date to content hash and the hash to offset and length of the frame. Pages are hashed and compressed
+    outside of the lock and the index is committed every commit_every pages (and by flush, close and when archive
+    is collected or the interpreter exits).
+
+    ...
+
+    Attributes
+    ----------
+    directory : str
+        directory of the archive
+    level : int
+        zstd compression level (default 10)
+    commit_every : int
+        number of stored pages after which the index is committed (default 100)
+
+    Methods
+    -------
+    store(link: str, content: bytes, date: str = None) -> str:
+        Save page, returns hash of its content
+
+    load(link: str, date: str = None) -> bytes:
+        Read page archived on date (or the latest one archived before)
+
+    links(date: str = None) -> List[str]:
+        Links archived on date
+
+    flush() -> None:
+        Write pages and commit the index
+
+    close() -> None:
+        Close archive files
+    """
+
+    def __init__(self, directory: str, level: int = 10, commit_every: int = 100):
+        """
+        Parameters
+        ----------
+        directory : str
+            directory of the archive
+        level : int
+            zstd compression level (default 10)
+        commit_every : int
+            number of stored pages after which the index is committed (default 100)
+        """
+
+        if zstandard is None:
+            raise ImportError("PageArchive requires the zstandard package")
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.level = level
+        self.commit_every = commit_every
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+        self._data = open(os.path.join(directory, "pages.zst"), "a+b")
+        self._index = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False)
+        self._index.execute("CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, offset INTEGER, length INTEGER)")
+        self._index.execute("CREATE TABLE IF NOT EXISTS pages (link TEXT, date TEXT, hash TEXT, "
+                            "PRIMARY KEY (link, date))")
+        self._index.commit()
+        # Pages stored after the last commit are not lost when scraper ends without close, finalizer does not
+        # keep archive alive
+        self._finalizer = weakref.finalize(self, close_files, self._data, self._index)
+
+    # Save page
+    def store(self, link: str, content: bytes, date: str = None) -> str:
+        """Save page, content which is already in archive is only indexed
+
+        Parameters
+        ----------
+        link: str
+            link to web page
+        content: bytes
+            raw HTML of the page
+        date: str, optional
+            date of download in YYYY-MM-DD format (default today)
+
+        Returns
+        ------
+        str
+            sha256 hash of the content
+        """
+
+        # Other threads can store pages while this one compresses
+        content_hash = hashlib.sha256(content).hexdigest()
+        frame = zstandard.ZstdCompressor(level=self.level).compress(content)
+        date = date or datetime.now().date().isoformat()
+
+        with self._lock:
+            exists = self._index.execute("SELECT 1 FROM blobs WHERE hash = ?", (content_hash,)).fetchone()
+            if exists is None:
+                self._data.seek(0, os.SEEK_END)
+                offset = self._data.tell()
+                self._data.write(frame)
+                self._index.execute("INSERT INTO blobs VALUES (?, ?, ?)", (content_hash, offset, len(frame)))
+            self._index.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", (link, date, content_hash))
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self._commit()
+
+        return content_hash
+
+    # Read page archived on date
+    def load(self, link: str, date: str = None) -> bytes:
+        """Read page archived on date (or the latest one archived before)
+
+        Parameters
+        ----------
+        link: str
+            link to web page
+        date: str, optional
+            date in YYYY-MM-DD format (default the latest page)
+
+        Returns
+        ------
+        bytes
+            raw HTML of the page, PageNotArchived (KeyError) is raised if the page is not in archive
+        """
+
+        with self._lock:
+            found = self._index.execute("SELECT blobs.offset, blobs.length FROM pages "
+                                        "JOIN blobs ON pages.hash = blobs.hash "
+                                        "WHERE pages.link = ? AND pages.date <= ? "
+                                        "ORDER BY pages.date DESC LIMIT 1", (link, date or "9999-12-31")).fetchone()
+            if found is None:
+                raise PageNotArchived(link)
+            self._data.seek(found[0])
+            frame = self._data.read(found[1])
+
+        return zstandard.ZstdDecompressor().decompress(frame)
+
+    # Links archived on date
+    def links(self, date: str = None) -> List[str]:
+        """Links archived on date
+
+        Parameters
+        ----------
+        date: str, optional
+            date in YYYY-MM-DD format (default all links)
+
+        Returns
+        ------
+        list
+            archived links
+        """
+
+        with self._lock:
+            if date is None:
+                rows = self._index.execute("SELECT DISTINCT link FROM pages").fetchall()
+            else:
+                rows = self._index.execute("SELECT link FROM pages WHERE date = ?", (date,)).fetchall()
+
+        return [row[0] for row in rows]
+
+    # Write pages and commit the index
+    def flush(self) -> None:
+        """Write pages and commit the index"""
+
+        with self._lock:
+            if self._finalizer.alive:
+                self._commit()
+
+    # Close archive files
+    def close(self) -> None:
+        """Commit the index and close archive files"""
+
+        with self._lock:
+            self._finalizer()
+
+    # Commit the index, frames are written before so committed index never points past the end of pages.zst
+    def _commit(self) -> None:
+        self._data.flush()
+        self._index.commit()
+        self._uncommitted = 0
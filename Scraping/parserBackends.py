@@ -0,0 +1,260 @@
+# HTML parser backends
+
+# Libraries
+from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+from typing import Dict, List, Union
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+
+
+# Create parser with specified backend
+def create_soup(html: str, backend: str = "html.parser") -> Union[BeautifulSoup, "LexborTag"]:
+    """Create parser with specified backend
+
+    Parameters
+    ----------
+    html: str
+        decoded HTML of the page
+    backend: str
+        "html.parser" or "lxml" (BeautifulSoup tree builders) or "selectolax" (lexbor engine)
+
+    Returns
+    ------
+    BeautifulSoup or LexborTag
+        object used to extract information, both have the same methods used by scrapers
+    """
+
+    if backend == "selectolax":
+        if LexborHTMLParser is None:
+            raise ImportError("parser_backend 'selectolax' requires the selectolax package")
+        return LexborTag(LexborHTMLParser(html).root)
+
+    return BeautifulSoup(html, backend)
+
+
+class AttributeCollector(HTMLParser):
+    """
+    A class used to collect attribute values of matching tags from streamed HTML without building any tree
+
+    ...
+
+    Attributes
+    ----------
+    attribute : str
+        name of attribute which values are collected
+    tag : str
+        only tags with that name are matched (None matches every tag)
+    class_ : str
+        only tags with that class are matched (None matches every class)
+    values : list
+        collected values
+    """
+
+    def __init__(self, attribute: str, tag: str = None, class_: str = None):
+        super().__init__(convert_charrefs=True)
+        self.attribute = attribute
+        self.tag = tag
+        self.class_ = class_
+        self.values = []
+
+    def handle_starttag(self, tag, attrs):
+        if (self.tag is not None) and (tag != self.tag):
+            return
+        attrs = dict(attrs)
+        if (self.class_ is not None) and (self.class_ not in (attrs.get("class") or "").split()):
+            return
+        if attrs.get(self.attribute) is not None:
+            self.values.append(attrs[self.attribute])
+
+
+# Collect attribute values of matching tags
+def collect_attribute(html: str, attribute: str, tag: str = None, class_: str = None) -> List[str]:
+    """Collect attribute values of matching tags, HTML is only tokenized (no tree is built)
+
+    Parameters
+    ----------
+    html: str
+        decoded HTML of the page
+    attribute: str
+        name of attribute which values are collected
+    tag: str, optional
+        only tags with that name are matched
+    class_: str, optional
+        only tags with that class are matched
+
+    Returns
+    ------
+    list
+        attribute values in the order of the document
+    """
+
+    collector = AttributeCollector(attribute, tag, class_)
+    collector.feed(html)
+    collector.close()
+
+    return collector.values
+
+
+class LexborText(str):
+    """Text node of lexbor document, behaves like BeautifulSoup NavigableString"""
+
+    @property
+    def string(self) -> str:
+        return self
+
+    @property
+    def text(self) -> str:
+        return str(self)
+
+
+class LexborTag:
+    """
+    A class used to give lexbor (selectolax) nodes the part of BeautifulSoup API used by scrapers
+
+    find/find_all arguments are translated to CSS selectors which are matched by lexbor, class is matched the same
+    way as in BeautifulSoup (single class name or the whole class attribute)
+
+    ...
+
+    Attributes
+    ----------
+    node : LexborNode
+        wrapped selectolax node
+
+    Methods
+    -------
+    find(name=None, attrs={}, **kwargs) -> LexborTag:
+        First element matching arguments
+
+    find_all(name=None, attrs={}, **kwargs) -> List[LexborTag]:
+        All elements matching arguments (also findAll and calling the object)
+
+    select(selector: str) -> List[LexborTag]:
+        Elements matching CSS selector
+
+    get(key: str, default=None) -> str:
+        Value of attribute
+
+    has_attr(key: str) -> bool:
+        Verify whether element has attribute
+
+    replace_with(text: str) -> None:
+        Replace element with text
+    """
+
+    def __init__(self, node):
+        self.node = node
+
+    # Translate BeautifulSoup arguments to CSS selector
+    def selector(self, name=None, attrs: Union[Dict[str, str], List[str], str] = {}, **kwargs) -> str:
+        """Translate BeautifulSoup arguments to CSS selector
+
+        Parameters
+        ----------
+        name: str, list or True
+            tag name(s)
+        attrs: dict, list or str
+            attributes, if it is not a dict it is matched with class
+        kwargs:
+            attributes e.g. class_, id
+
+        Returns
+        ------
+        str
+            CSS selector
+        """
+
+        if not isinstance(attrs, dict):
+            attrs = {"class": attrs}
+        attrs = dict(attrs)
+        for key, value in kwargs.items():
+            attrs[key.rstrip("_")] = value
+
+        if (name is None) or (name is True):
+            names = ["*"]
+        elif isinstance(name, str):
+            names = [name]
+        else:
+            names = list(name)
+
+        selectors = names
+        for key, values in attrs.items():
+            if isinstance(values, str):
+                values = [values]
+            conditions = []
+            for value in values:
+                value = value.replace('"', '\\"')
+                # Single class name is matched with every class of element, otherwise the whole attribute
+                if (key == "class") and (" " not in value):
+                    conditions.append('[class~="%s"]' % value)
+                else:
+                    conditions.append('[%s="%s"]' % (key, value))
+            selectors = [selector + condition for selector in selectors for condition in conditions]
+
+        return ", ".join(selectors)
+
+    def find(self, name=None, attrs={}, **kwargs) -> "LexborTag":
+        found = self.node.css_first(self.selector(name, attrs, **kwargs))
+        return None if found is None else LexborTag(found)
+
+    def find_all(self, name=None, attrs={}, **kwargs) -> List["LexborTag"]:
+        return [LexborTag(node) for node in self.node.css(self.selector(name, attrs, **kwargs))]
+
+    findAll = find_all
+    __call__ = find_all
+
+    def select(self, selector: str) -> List["LexborTag"]:
+        return [LexborTag(node) for node in self.node.css(selector)]
+
+    def get(self, key: str, default=None) -> str:
+        return self.node.attributes.get(key, default)
+
+    def has_attr(self, key: str) -> bool:
+        return key in self.node.attributes
+
+    def __getitem__(self, key: str) -> str:
+        return self.node.attributes[key]
+
+    # First descendant with tag name, like soup.em
+    def __getattr__(self, name: str) -> "LexborTag":
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.find(name)
+
+    @property
+    def name(self) -> str:
+        return self.node.tag
+
+    @property
+    def contents(self) -> List[Union["LexborTag", LexborText]]:
+        return [LexborText(child.text(deep=False)) if child.tag == "-text" else LexborTag(child)
+                for child in self.node.iter(include_text=True) if child.tag != "-comment"]
+
+    def __iter__(self):
+        return iter(self.contents)
+
+    @property
+    def string(self) -> str:
+        contents = self.contents
+        if len(contents) != 1:
+            return None
+        return contents[0].string
+
+    @property
+    def text(self) -> str:
+        return self.node.text(deep=True)
+
+    def get_text(self) -> str:
+        return self.text
+
+    def replace_with(self, text: str) -> None:
+        self.node.replace_with(text)
+
+    def __str__(self) -> str:
+        return self.node.html
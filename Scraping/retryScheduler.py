@@ -0,0 +1,209 @@
+# Retries of links which were not scraped
+
+# Libraries
+import heapq
+import random
+import threading
+import time
+from typing import Dict, Hashable, Union
+
+
+class RetryScheduler:
+    """
+    A class used to retry links which were not scraped with exponential backoff and jitter
+
+    Failed links wait in a heap ordered by the time of the next attempt, so they are retried together with fresh
+    links instead of in a separate pass. Links which fail max_attempts times are reported as permanent failures.
+
+    ...
+
+    Attributes
+    ----------
+    max_attempts : int
+        maximum number of attempts of every link (default 6)
+    base_delay : float
+        delay before the second attempt in seconds, it doubles with every attempt (default 1)
+    max_delay : float
+        maximum delay in seconds (default 60)
+    attempts : dict
+        link: number of attempts
+    errors : dict
+        link: the last error
+    permanent : set
+        links which failed with error which would repeat in every attempt
+    retries : int
+        number of scheduled retries
+
+    Methods
+    -------
+    retry(link: Hashable, error: str, permanent: bool = False) -> bool:
+        Schedule the next attempt of failed link
+
+    backoff(attempts: int) -> float:
+        Full jitter delay in seconds before the next attempt of link which failed attempts times
+
+    succeeded(link: Hashable) -> None:
+        Forget link which was scraped
+
+    pop_due() -> Hashable:
+        Link which should be retried now (None if there is no such link)
+
+    wait() -> float:
+        Seconds to the next retry (None if there are no retries)
+
+    pending() -> int:
+        Number of links waiting for retry
+
+    permanent_failures() -> Dict[Hashable, Dict[str, Union[int, str]]]:
+        Links which failed max_attempts times (or with permanent error) with the last error
+    """
+
+    def __init__(self, max_attempts: int = 6, base_delay: float = 1.0, max_delay: float = 60.0):
+        """
+        Parameters
+        ----------
+        max_attempts : int
+            maximum number of attempts of every link (default 6)
+        base_delay : float
+            delay before the second attempt in seconds, it doubles with every attempt (default 1)
+        max_delay : float
+            maximum delay in seconds (default 60)
+        """
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempts = {}
+        self.errors = {}
+        self.permanent = set()
+        self.retries = 0
+        self._due = []
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    # Schedule the next attempt of failed link
+    def retry(self, link: Hashable, error: str, permanent: bool = False) -> bool:
+        """Schedule the next attempt of failed link
+
+        Parameters
+        ----------
+        link: str
+            argument of scraping function
+        error: str
+            description of the failure
+        permanent: bool
+            True if the next attempt would fail the same way, link is a permanent failure at once
+
+        Returns
+        ------
+        bool
+            False if link failed max_attempts times (or permanently) and will not be retried
+        """
+
+        with self._lock:
+            attempts = self.attempts.get(link, 0) + 1
+            self.attempts[link] = attempts
+            self.errors[link] = error
+            if permanent:
+                self.permanent.add(link)
+            if permanent or (attempts >= self.max_attempts):
+                return False
+
+            delay = self.backoff(attempts)
+            self._counter += 1
+            self.retries += 1
+            heapq.heappush(self._due, (time.monotonic() + delay, self._counter, link))
+
+        return True
+
+    # Full jitter delay before the next attempt
+    def backoff(self, attempts: int) -> float:
+        """Full jitter delay in seconds before the next attempt of link which failed attempts times
+
+        Parameters
+        ----------
+        attempts: int
+            number of failed attempts of link
+
+        Returns
+        ------
+        float
+            random delay between 0 and base_delay * 2 ** (attempts - 1), at most max_delay
+        """
+
+        # Full jitter spreads retries of links which failed at the same time
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempts - 1)))
+
+    # Forget link which was scraped
+    def succeeded(self, link: Hashable) -> None:
+        """Forget link which was scraped
+
+        Parameters
+        ----------
+        link: str
+            argument of scraping function
+        """
+
+        with self._lock:
+            self.attempts.pop(link, None)
+            self.errors.pop(link, None)
+            self.permanent.discard(link)
+
+    # Link which should be retried now
+    def pop_due(self) -> Hashable:
+        """Link which should be retried now
+
+        Returns
+        ------
+        str
+            argument of scraping function (None if there is no link to retry now)
+        """
+
+        with self._lock:
+            if (len(self._due) != 0) and (self._due[0][0] <= time.monotonic()):
+                return heapq.heappop(self._due)[2]
+
+        return None
+
+    # Seconds to the next retry
+    def wait(self) -> float:
+        """Seconds to the next retry
+
+        Returns
+        ------
+        float
+            seconds to the next retry, 0 if it is due (None if there are no retries)
+        """
+
+        with self._lock:
+            if len(self._due) == 0:
+                return None
+            return max(0.0, self._due[0][0] - time.monotonic())
+
+    # Number of links waiting for retry
+    def pending(self) -> int:
+        """Number of links waiting for retry
+
+        Returns
+        ------
+        int
+            number of links in heap
+        """
+
+        with self._lock:
+            return len(self._due)
+
+    # Links which failed max_attempts times
+    def permanent_failures(self) -> Dict[Hashable, Dict[str, Union[int, str]]]:
+        """Links which failed max_attempts times (or with permanent error) with the last error
+
+        Returns
+        ------
+        dict
+            link: {"attempts": number of attempts, "error": the last error}
+        """
+
+        with self._lock:
+            return {link: {"attempts": attempts, "error": self.errors[link]}
+                    for link, attempts in self.attempts.items()
+                    if (attempts >= self.max_attempts) or (link in self.permanent)}
@@ -1,393 +1,1136 @@
-# Libraries
-from bs4 import BeautifulSoup
-from urllib.request import urlopen
-import concurrent.futures
-import numpy as np
-from typing import Tuple, List, Callable, DefaultDict, Union
-import pandas as pd
-
-class Scraper:
-    """
-    General class from which classes to scrape specific offer pages inherit
-
-    Methods
-    -------
-    enterPage_parser(link: str) -> BeautifulSoup:
-        Read website, encode and create HTML parser
-
-    extract_links_idClass(isId: bool, to_find: str, soup: BeautifulSoup, replace: bool,
-                        replace_to: List[str] = []) -> Tuple[List[str], List[str]]:
-        Extract links with id or class tag
-
-    prepare_range(pages_names: List[str]) -> range:
-        Prepare pages range
-
-    create_split(links: List[str], split_size: int) -> List[range]:
-        Create splits to relieve RAM memory
-
-    flatten(result_to_flatt: List[List[str]]) -> Union[List[List[str]],List[str]]:
-        Flatten a list
-
-    scraping_all_links(func: Callable, all_links: List[str]) -> List[DefaultDict[str, str]]:
-        General function to scrape links that activates ThreadPoolExecutor
-
-    missed_offers_pages(links: List[str], offers: bool, func: Callable) -> Tuple[List[DefaultDict[str, str]],List[str]]:
-        Scrape missed offers and pages links
-
-    missed_links_all(missed_offers: List[str], func: Callable, details: bool, restriction: int = 5, offers: bool = None,
-                    func_pages_or_offers: Callable = None) -> List:
-        Scrape omitted data until you have scraped all
-
-    join_missed_with_scraped(missed: List[str], scraped: List[str]) -> List:
-        Join missed information with already scraped
-
-    scraping_offers_details_exceptions(link: str) -> Union[DefaultDict[str, str], str]:
-        Try to connect with offer link, if it is not possible save link to global list
-
-    soup_find_information(soup: BeautifulSoup, find_attr: List[str]) -> List[str]:
-        Find in soup with 3 args
-
-    extract_information(find_in: BeautifulSoup, find_with_obj: bool = False, obj: str = None) -> Union[List[str], str]:
-        Extract strings from infos founded in soup
-    """
-
-    # Read website, encode and create HTML parser
-    def enterPage_parser(self, link: str) -> BeautifulSoup:
-        """Read website, encode and create HTML parser
-
-        try to encode with "utf-8" if it creates error then use "laitn-1"
-
-        Parameters
-        ----------
-        link : str
-            link to web page which you want to parse
-
-        Returns
-        ------
-        BeautifulSoup
-            a beautifulsoup object used to extract useful information
-        """
-
-        # Get website
-        URL = link
-        page = urlopen(URL)
-
-        # Read website, encode and create HTML parser
-        html_bytes = page.read()
-        try:
-            html = html_bytes.decode("utf-8")
-        except:
-            html = html_bytes.decode("latin-1")
-
-        return BeautifulSoup(html, "html.parser")
-
-    # Extract links with id or class tag
-    def extract_links_idClass(self, isId: bool, to_find: str, soup: BeautifulSoup, replace: bool,
-                              replace_to: List[str] = []) -> Tuple[List[str], List[str]]:
-        """Extract links with id or class tag
-
-        extracting links with id or class tag
-
-        Parameters
-        ----------
-        isId: boolean
-            determines whether to look for an id or a class
-        to_find: str
-            name of class or id
-        soup: BeautifulSoup
-            object used to extract information
-        replace: boolean
-            determines whether part of the link is to be replaced
-        replace_to: list, optional
-            two elements list containing what [0] has to be replaces with what [1]
-
-        Returns
-        ------
-        list, list
-            1. list containing names of extracted links e.g.  districts, cities.
-            2. list containing extrated links e.g. districts, pages
-        """
-
-        # Find by id or class
-        if (isId):
-            extracted = soup.find(id=to_find)
-        else:
-            extracted = soup.find(class_=to_find)
-
-        # If there is only one page assign empty arrays to variables
-        try:
-            # Find all a tag's
-            extracted_names = [name.string for name in extracted.findAll('a') if (name.string != None)]
-            # Extract links and replace part of string to create link with newest observations
-            extracted_links = [link.get("href") for link in extracted.findAll('a') if (link.get("href") != None)]
-            if (replace):
-                extracted_links = [link.replace(replace_to[0], replace_to[1]) for link in extracted_links]
-        except:
-            extracted_names = []
-            extracted_links = []
-
-        return extracted_names, extracted_links
-
-    # Prepare pages range
-    def prepare_range(self, pages_names: List[str]) -> range:
-        """Preparing the range of pages to create links
-
-        Parameters
-        ----------
-        pages_names: list
-            links to individual city districts
-        Returns
-        ------
-        range
-            range of pages at morizon for specific page_name
-        """
-
-        # if length is 0 then there is only 1 page
-        if len(pages_names) != 0:
-            last_page = int(pages_names[len(pages_names) - 1])
-        else:
-            last_page = 1
-
-        return range(1, last_page + 1)
-
-    # Create splits to relieve RAM memory
-    def create_split(self, links: object, split_size: object) -> object:
-        """Create splits to relieve RAM memory
-
-        Parameters
-        ----------
-        links: list
-            list with list based on which length of splits is created
-        split_size: int
-            value divided by total number of links it is used to create splits to relieve RAM memory
-        Returns
-        ------
-        list
-            list with ranges
-        """
-
-        if (len(links) < split_size):
-            splitted = [[0, len(links)]]
-        else:
-            splitted = np.array_split(list(range(0, len(links))), len(links) / split_size)
-            splitted = [[elements[0] - 1, elements[-1]] if elements[0] != 0 else [elements[0], elements[-1]] for
-                        elements in splitted]
-            splitted[len(splitted) - 1][1] += 1
-
-
-        return splitted
-
-    # Flatten a list
-    def flatten(self, result_to_flatt: List[List[str]]) -> Union[List[List[str]],List[str]]:
-        """Flatten a list
-
-        Parameters
-        ----------
-        result_to_flatt: list
-            which has to be flatten
-
-        Returns
-        ------
-        list
-            flatten list
-        """
-
-        rt = []
-        for i in result_to_flatt:
-            if isinstance(i, list):
-                rt.extend(self.flatten(i))
-            else:
-                rt.append(i)
-        return rt
-
-    # General function to scrape links that activates ThreadPoolExecutor
-    def scraping_all_links(self, func: Callable, all_links: List[str]) -> List[DefaultDict[str, str]]:
-        """General function to scrape links that activates ThreadPoolExecutor
-
-        Parameters
-        ----------
-        func: function
-            function which will be activated in ThreadPoolExecutor
-        all_links: list
-            list with links to scrape
-        Returns
-        ------
-        list
-            scraped elements: details, and links e.g. pages
-        """
-
-        threads = min(self.max_threads, len(all_links))
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
-            results = list(executor.map(func, all_links))
-
-        return results
-
-    # Scrape missed offers and pages links
-    def missed_offers_pages(self, links: List[str], offers: bool,
-                            func: Callable) -> Tuple[List[DefaultDict[str, str]], List[str]]:
-        """Scrape missed offers and pages links
-
-        Parameters
-        ----------
-        links: list
-            missing links
-        offers: boolean
-            determines whether the missing links relate to properties
-        func: function
-            function which will be activated in ThreadPoolExecutor
-
-        Returns
-        ------
-        defaultdict, list
-            1. scraped missed links
-            2. links that are still missing
-        """
-
-        links = self.scraping_all_links(func, links)
-
-        # Assign missed links to variable
-        if offers:
-            missed_links = [offers for offers in links if "page" in offers]
-        else:
-            missed_links = [offers for offers in links if "page" not in offers]
-
-        return links, missed_links
-
-    # Scrape omitted data until you have scraped all
-    def missed_links_all(self, missed_offers: List[str], func: Callable, details: bool, restriction: int = 5,
-                         offers: bool = None, func_pages_or_offers: Callable = None) -> List:
-        """General function to scrape missing links that activates ThreadPoolExecutor until all are scraped
-
-        Parameters
-        ----------
-        missed_offers: list
-            missing links
-        func: function
-            function which will be activated in ThreadPoolExecutor
-        details: boolean
-            determines whether the missing links relate to details
-        restriction: int
-            restriction for while loop
-        offers: boolean, default(None)
-            determines whether the missing links relate to properties
-        func_pages_or_offers: function, default(None)
-            function to scrape pages or offers
-
-        Returns
-        ------
-        list
-            scraped elements: details, and links e.g. pages
-        """
-
-        missed_offers_list = []
-        n_times = 0
-
-        # If there are some missed links left scrape them
-        while (len(missed_offers) != 0) & (n_times <= restriction):
-            if details:
-                missed_scraped, missed_offers = func(missed_offers)
-            else:
-                missed_scraped, missed_offers = func(missed_offers, offers, func_pages_or_offers)
-            missed_offers_list.append(missed_scraped)
-            n_times += 1
-
-
-        return missed_offers_list
-
-    # Join missed information with already scraped
-    def join_missed_with_scraped(self, missed: List[str], scraped: List[str]) -> List:
-        """Join missed information with already scraped
-
-        Parameters
-        ----------
-        missed: list
-            scraped missed links
-        scraped: list
-            links scraped without problems
-
-        Returns
-        ------
-        list
-            scraped elements: details, and links e.g. pages
-        """
-
-        if len(missed) > 1:
-            missed = [properties for properties in self.flatten(missed) if properties != None]
-            scraped = np.concatenate([self.flatten(scraped), missed], axis=0)
-        elif len(missed) == 1:
-            scraped = np.concatenate([self.flatten(scraped), self.flatten(missed[0])], axis=0)
-        elif len(missed) == 0:
-            scraped = self.flatten(scraped)
-
-        return scraped
-
-    # Try to connect with offer link, if it is not possible save link to global list
-    def scraping_offers_details_exceptions(self, link: str) -> Union[DefaultDict[str, str], str]:
-        """Try to connect with offer link, if it is not possible save link to global list
-
-        Parameters
-        ----------
-        link: str
-           offer link
-
-        Returns
-        ------
-        defaultdict or str
-            If scraping succeeds, it is the details of the flat and otherwise a link to the offer
-        """
-
-        try:
-            offer_infos = self.scraping_offers_details(link)
-        except:
-            offer_infos = link
-
-        return offer_infos
-
-    # Find in Beautifulsoup with 3 args
-    def soup_find_information(self, soup: BeautifulSoup, find_attr: List[str]) -> List[str]:
-        """Find in soup with 3 args
-
-        Parameters
-        ----------
-        soup: str
-            offer link
-        find_attr: list
-            attributes of tag
-
-        Returns
-        ------
-        list
-            elements with specific attributes
-        """
-
-        return soup.find(find_attr[0], attrs={find_attr[1]: find_attr[2]})
-
-    # Extract strings from information founded in soup
-    def extract_information(self, find_in: BeautifulSoup, find_with_obj: bool = False,
-                            obj: str = None) -> Union[List[str], str]:
-        """Find in soup with 3 args
-
-        Parameters
-        ----------
-        find_in: BeautifulSoup
-            object where used to find information
-        find_with_obj: boolean, (default False)
-            determines whether user wants to find elements by "obj"
-        obj: str, (default None)
-            find all elements with that object
-
-        Returns
-        ------
-        list or str
-            1. elements with specific attributes
-            2. "None" informs that information is not available
-        """
-
-        try:
-            if find_with_obj:
-                return [info_part.string.strip() for info_part in find_in.find_all(obj) if (info_part.string != None)]
-            else:
-                return [info_part.string.strip() for info_part in find_in if (info_part.string != None)]
-        except:
-            return None
+# Libraries
+from bs4 import BeautifulSoup
+import concurrent.futures
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+import numpy as np
+from typing import Tuple, List, Callable, DefaultDict, Union, Dict, Iterator, Set
+from urllib.parse import urljoin, urlsplit
+import pandas as pd
+from asyncFetcher import AsyncFetcher
+from concurrencyControl import ConcurrencyController
+from httpSession import HttpSession, ACCEPT_ENCODING
+from httpCache import HttpCache
+from pageArchive import PageArchive, PageNotArchived
+from parserBackends import create_soup, collect_attribute, PARSER_BACKENDS
+from scrapingPipeline import ScrapingPipeline
+from retryScheduler import RetryScheduler
+from fetchResult import FetchResult, OK, FAILED, GONE
+from scraperMetrics import ScraperMetrics, failure_reason, timed_stage
+from workerPool import WorkerPool
+
+FETCH_BACKENDS = ("threads", "asyncio")
+
+# Scraper used by parse worker processes, see Scraper.parse_pool
+_worker_scraper = None
+
+
+class PageRequested(Exception):
+    """Raised by read_page while the pages needed by a scraping function are being recorded"""
+
+    def __init__(self, link: str):
+        super().__init__(link)
+        self.link = link
+
+
+# Keep scraper in parse worker process
+def init_parse_worker(scraper_state: bytes) -> None:
+    global _worker_scraper
+    _worker_scraper = pickle.loads(scraper_state)
+
+
+# Parse already downloaded pages in worker process
+def parse_in_worker(func_name: str, link: str, pages: Dict[str, bytes]) -> FetchResult:
+    """Parse already downloaded pages in worker process
+
+    Parameters
+    ----------
+    func_name: str
+        name of scraping function e.g. scraping_offers_details
+    link: str
+        argument of the scraping function
+    pages: dict
+        raw HTML of pages read by the function
+
+    Returns
+    ------
+    FetchResult
+        result of the function, details are sent back as a plain dict
+    """
+
+    scraper = _worker_scraper
+    result = scraper.call_with_pages(lambda page_link: scraper.attempt(getattr(scraper, func_name), page_link)[0],
+                                     link, pages)
+    if isinstance(result.payload, dict):
+        result.payload = dict(result.payload)
+
+    return result
+
+
+class Scraper:
+    """
+    General class from which classes to scrape specific offer pages inherit
+
+    Attributes
+    ----------
+    max_threads : int
+        maximum number of threads (default 30)
+    concurrency : ConcurrencyController
+        adaptive limit of requests in flight for every host, its report() shows settled limits (None if
+        adaptive_concurrency is not set)
+    fetch_backend : str
+        "threads" (worker_pool) or "asyncio" (single event loop) engine used by scraping_all_links
+    worker_pool : WorkerPool
+        long-lived threads shared by all stages, stages are named after scraping functions
+    async_concurrency : int
+        maximum number of requests in flight when fetch_backend is "asyncio" (default 1000)
+    session : HttpSession
+        keep-alive connection pools shared by all threads
+    http_cache : HttpCache
+        on-disk cache of pages matching cache_url_classes (None if cache_dir is not set)
+    cache_url_classes : dict
+        name of class: (regular expression matched with link, time to live in seconds), set by specific scrapers
+    archive : PageArchive
+        archive of every downloaded page (None if archive_dir is not set)
+    replay_date : str
+        date (YYYY-MM-DD) of archived pages read instead of the network (None reads from the network)
+    parser_backend : str
+        "html.parser", "lxml" or "selectolax" used to parse pages (default "html.parser")
+    max_attempts : int
+        maximum number of attempts of every link (default 6)
+    retry_delay : float
+        delay before the second attempt in seconds, it doubles with every attempt (default 1)
+    failed_links : dict
+        links which were not scraped after max_attempts with number of attempts and the last error
+    parse_processes : int
+        number of processes parsing pages, pages are still read by threads or event loop (None parses in threads)
+    host_overrides : dict
+        origin: replacement, requests are sent to replacement e.g. local fixture server (None sends to origin)
+    metrics : ScraperMetrics
+        requests, bytes, retries, failures by reason, dead offers, fetch and parse latency and stage durations
+
+    Methods
+    -------
+    read_page(link: str) -> bytes:
+        Read website and return raw HTML
+
+    archive_page(link: str, html_bytes: bytes) -> None:
+        Save downloaded page to archive
+
+    flush_archive() -> None:
+        Commit pages saved to archive
+
+    create_parser(html_bytes: bytes) -> BeautifulSoup:
+        Encode HTML and create HTML parser with parser_backend
+
+    enterPage_parser(link: str) -> BeautifulSoup:
+        Read website, encode and create HTML parser
+
+    extract_links_streaming(link: str, attribute: str, tag: str = None, class_: str = None) -> List[str]:
+        Read website and extract links from attribute of matching tags without building HTML tree
+
+    page_requests(func: Callable, link: str) -> List[str]:
+        Record links to pages which func reads for specified link
+
+    call_with_pages(func: Callable, link: str, pages: Dict[str, Union[bytes, Exception]]):
+        Call func for link using already downloaded pages
+
+    extract_links_idClass(isId: bool, to_find: str, soup: BeautifulSoup, replace: bool,
+                        replace_to: List[str] = []) -> Tuple[List[str], List[str]]:
+        Extract links with id or class tag
+
+    prepare_range(pages_names: List[str]) -> range:
+        Prepare pages range
+
+    create_split(links: List[str], split_size: int) -> List[range]:
+        Create splits to relieve RAM memory
+
+    flatten(result_to_flatt: List[List[str]]) -> Union[List[List[str]],List[str]]:
+        Flatten a list
+
+    attempt(func: Callable, link: str) -> Tuple[FetchResult, str]:
+        Call func for link, measure it and describe the failure
+
+    parse_pool() -> concurrent.futures.ProcessPoolExecutor:
+        Processes parsing pages, created with the first use
+
+    shutdown_parse_pool() -> None:
+        Stop processes parsing pages
+
+    close() -> None:
+        Stop threads and processes of scraper and close archive
+
+    scraping_all_links(func: Callable, all_links: List[str]) -> List[FetchResult]:
+        General function to scrape links with the engine set in fetch_backend, failed links are retried with backoff
+
+    permanent_failure(result: FetchResult) -> bool:
+        Check if failure would repeat in every attempt
+
+    record_retries(scheduler: RetryScheduler) -> None:
+        Save links which failed max_attempts times to failed_links and count retries in metrics
+
+    page_sources() -> List[str]:
+        Arguments of scraping_pages_links used to find all pages
+
+    clean_offer_link(link: str) -> str:
+        Prepare offer link scraped from page
+
+    newest_page_link(source: str, page_number: int) -> str:
+        Link to listing page of source sorted from the newest offers
+
+    get_new_offers(known_links: Set[str], sources: List[str] = None, max_pages: int = None) -> List[str]:
+        Walk listings from the newest offers and stop at pages which have only known offers
+
+    find_removed_offers(links: List[str]) -> List[str]:
+        Known offers which were removed from website, checked with HEAD requests
+
+    get_details(split_size: int, offers: List[str] = [], checkpoint_dir: str = None) -> pd.DataFrame:
+        The method called up by the user to download all details about apartments, splits can be saved to resume
+
+    save_split(path: str, details: List[DefaultDict[str, str]]) -> None:
+        Save details of split at once, so a crash never leaves half written file
+
+    stream_details(sources: List[str] = None, batch_size: int = 500, queue_size: int = 1000) -> Iterator[pd.DataFrame]:
+        Scrape pages, offers and details at the same time and return details in batches as soon as they are scraped
+
+    soup_find_information(soup: BeautifulSoup, find_attr: List[str]) -> List[str]:
+        Find in soup with 3 args
+
+    extract_information(find_in: BeautifulSoup, find_with_obj: bool = False, obj: str = None) -> Union[List[str], str]:
+        Extract strings from infos founded in soup
+    """
+
+    # Pages kept in on-disk cache, see HttpCache
+    cache_url_classes = {}
+
+    def __init__(self, max_threads: int = 30, fetch_backend: str = "threads", async_concurrency: int = 1000,
+                 host_pool_sizes: Dict[str, int] = None, cache_dir: str = None, archive_dir: str = None,
+                 replay_date: str = None, parser_backend: str = "html.parser", adaptive_concurrency: bool = False,
+                 max_attempts: int = 6, retry_delay: float = 1.0, parse_processes: int = None,
+                 host_overrides: Dict[str, str] = None, stage_quotas: Dict[str, int] = None):
+        """
+        Parameters
+        ----------
+        max_threads : int
+            maximum number of threads (default 30)
+        fetch_backend : str
+            "threads" or "asyncio" engine used by scraping_all_links (default "threads")
+        async_concurrency : int
+            maximum number of requests in flight when fetch_backend is "asyncio" (default 1000)
+        host_pool_sizes : dict, optional
+            maximum number of keep-alive connections for specific hosts (default max_threads for every host)
+        cache_dir : str, optional
+            directory of on-disk cache for pages matching cache_url_classes (default cache is not used)
+        archive_dir : str, optional
+            directory of archive where every downloaded page is saved (default archive is not used)
+        replay_date : str, optional
+            read pages archived on that date (YYYY-MM-DD) instead of the network, requires archive_dir
+        parser_backend : str
+            "html.parser", "lxml" or "selectolax" used to parse pages (default "html.parser")
+        adaptive_concurrency : bool
+            adapt number of requests in flight to every host (AIMD), max_threads or async_concurrency is the upper
+            limit (default False)
+        max_attempts : int
+            maximum number of attempts of every link (default 6)
+        retry_delay : float
+            delay before the second attempt in seconds, it doubles with every attempt (default 1)
+        parse_processes : int, optional
+            number of processes parsing pages and extracting information, pages are still read by threads or
+            event loop (default pages are parsed by threads which read them)
+        host_overrides : dict, optional
+            origin: replacement, requests are sent to replacement e.g.
+            {"https://www.otodom.pl": "http://127.0.0.1:8000/www.otodom.pl"} (default requests are sent to origin)
+        stage_quotas : dict, optional
+            name of scraping function (or "find_removed_offers"): maximum number of its threads, e.g.
+            {"scraping_offers_links": 10} (default every stage can use max_threads)
+        """
+
+        if fetch_backend not in FETCH_BACKENDS:
+            raise ValueError("fetch_backend has to be one of: %s" % ", ".join(FETCH_BACKENDS))
+        if parser_backend not in PARSER_BACKENDS:
+            raise ValueError("parser_backend has to be one of: %s" % ", ".join(PARSER_BACKENDS))
+        if (replay_date is not None) and (archive_dir is None):
+            raise ValueError("replay_date requires archive_dir")
+
+        self.max_threads = max_threads
+        self.fetch_backend = fetch_backend
+        self.worker_pool = WorkerPool(max_workers=max_threads, quotas=stage_quotas)
+        self.async_concurrency = async_concurrency
+        self.concurrency = None
+        if adaptive_concurrency:
+            self.concurrency = ConcurrencyController(maximum=async_concurrency if fetch_backend == "asyncio"
+                                                     else max_threads)
+        self.http_cache = HttpCache(cache_dir, self.cache_url_classes) if cache_dir else None
+        self.host_overrides = host_overrides
+        self.metrics = ScraperMetrics(labels={"scraper": type(self).__name__})
+        self.session = HttpSession(pool_size=max_threads, host_pool_sizes=host_pool_sizes, cache=self.http_cache,
+                                   concurrency=self.concurrency, host_overrides=host_overrides, metrics=self.metrics)
+        self.archive = PageArchive(archive_dir) if archive_dir else None
+        self.replay_date = replay_date
+        self.parser_backend = parser_backend
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.failed_links = {}
+        self.parse_processes = parse_processes
+        self._parse_pool = None
+        self._parse_pool_lock = threading.Lock()
+        self._prefetched = threading.local()
+        self._timing = threading.local()
+
+    # Scraper sent to parse worker processes has no connections, files or locks
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for name in ("session", "http_cache", "archive", "concurrency", "worker_pool", "_parse_pool",
+                     "_parse_pool_lock", "_prefetched", "_timing"):
+            state[name] = None
+        state["parse_processes"] = None
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._parse_pool_lock = threading.Lock()
+        self._prefetched = threading.local()
+        self._timing = threading.local()
+
+    # Read website and return raw HTML
+    def read_page(self, link: str) -> bytes:
+        """Read website and return raw HTML
+
+        If pages were downloaded before (see call_with_pages) they are used instead of the network, in replay mode
+        pages are read from archive
+
+        Parameters
+        ----------
+        link : str
+            link to web page which you want to read
+
+        Returns
+        ------
+        bytes
+            raw HTML of the page
+        """
+
+        # Pages requested by scraping function are only recorded
+        recorded = getattr(self._prefetched, "recorded", None)
+        if recorded is not None:
+            recorded.append(link)
+            raise PageRequested(link)
+
+        start = time.perf_counter()
+
+        # Use already downloaded page
+        pages = getattr(self._prefetched, "pages", None)
+        if (pages is not None) and (link in pages):
+            html_bytes = pages[link]
+            if isinstance(html_bytes, Exception):
+                raise html_bytes
+        # Replay pages from archive
+        elif self.replay_date is not None:
+            html_bytes = self.archive.load(link, self.replay_date)
+        else:
+            html_bytes = self.session.get(link)
+            self.archive_page(link, html_bytes)
+
+        # Time and size of pages read during attempt
+        self._timing.fetch_time = getattr(self._timing, "fetch_time", 0.0) + time.perf_counter() - start
+        self._timing.n_bytes = getattr(self._timing, "n_bytes", 0) + len(html_bytes)
+
+        return html_bytes
+
+    # Save downloaded page to archive
+    def archive_page(self, link: str, html_bytes: bytes) -> None:
+        """Save downloaded page to archive if it is used
+
+        Parameters
+        ----------
+        link : str
+            link to web page
+        html_bytes : bytes
+            raw HTML of the page
+        """
+
+        if self.archive is not None:
+            self.archive.store(link, html_bytes)
+
+    # Commit pages saved to archive
+    def flush_archive(self) -> None:
+        """Commit pages saved to archive if it is used, archive commits its index only every few pages"""
+
+        if self.archive is not None:
+            self.archive.flush()
+
+    # Encode HTML and create HTML parser with parser_backend
+    def create_parser(self, html_bytes: bytes) -> BeautifulSoup:
+        """Encode HTML and create HTML parser with parser_backend
+
+        try to encode with "utf-8" if it creates error then use "laitn-1"
+
+        Parameters
+        ----------
+        html_bytes : bytes
+            raw HTML of the page
+
+        Returns
+        ------
+        BeautifulSoup
+            a beautifulsoup object (or object with the same methods for "selectolax") used to extract useful
+            information
+        """
+
+        try:
+            html = html_bytes.decode("utf-8")
+        except:
+            html = html_bytes.decode("latin-1")
+
+        return create_soup(html, self.parser_backend)
+
+    # Read website, encode and create HTML parser
+    def enterPage_parser(self, link: str) -> BeautifulSoup:
+        """Read website, encode and create HTML parser
+
+        Parameters
+        ----------
+        link : str
+            link to web page which you want to parse
+
+        Returns
+        ------
+        BeautifulSoup
+            a beautifulsoup object used to extract useful information
+        """
+
+        return self.create_parser(self.read_page(link))
+
+    # Read website and extract links without building HTML tree
+    def extract_links_streaming(self, link: str, attribute: str, tag: str = None, class_: str = None) -> List[str]:
+        """Read website and extract links from attribute of matching tags without building HTML tree
+
+        Listing pages are only tokenized, so it is much cheaper than enterPage_parser when only links are needed
+
+        Parameters
+        ----------
+        link : str
+            link to web page
+        attribute : str
+            attribute with link e.g. "href", "data-url"
+        tag : str, optional
+            only tags with that name are matched e.g. "article"
+        class_ : str, optional
+            only tags with that class are matched
+
+        Returns
+        ------
+        list
+            extracted links
+        """
+
+        html_bytes = self.read_page(link)
+        try:
+            html = html_bytes.decode("utf-8")
+        except:
+            html = html_bytes.decode("latin-1")
+
+        return collect_attribute(html, attribute, tag, class_)
+
+    # Record links to pages which func reads for specified link
+    def page_requests(self, func: Callable, link: str) -> List[str]:
+        """Record links to pages which func reads for specified link
+
+        func is called without network access, the first read_page call stops it and its link is recorded
+
+        Parameters
+        ----------
+        func: function
+            scraping function e.g. scraping_offers_links
+        link: str
+            argument of the scraping function
+
+        Returns
+        ------
+        list
+            links to pages read by func
+        """
+
+        self._prefetched.recorded = []
+        try:
+            func(link)
+        except PageRequested:
+            pass
+        finally:
+            recorded = self._prefetched.recorded
+            self._prefetched.recorded = None
+
+        return recorded
+
+    # Call func for link using already downloaded pages
+    def call_with_pages(self, func: Callable, link: str, pages: Dict[str, Union[bytes, Exception]]):
+        """Call func for link using already downloaded pages
+
+        Parameters
+        ----------
+        func: function
+            scraping function e.g. scraping_offers_links
+        link: str
+            argument of the scraping function
+        pages: dict
+            raw HTML (or exception raised while downloading) of pages read by func
+
+        Returns
+        ------
+        object
+            result of func
+        """
+
+        for page_link, page in pages.items():
+            if isinstance(page, bytes):
+                self.archive_page(page_link, page)
+
+        self._prefetched.pages = pages
+        try:
+            return func(link)
+        finally:
+            self._prefetched.pages = None
+
+    # Extract links with id or class tag
+    def extract_links_idClass(self, isId: bool, to_find: str, soup: BeautifulSoup, replace: bool,
+                              replace_to: List[str] = []) -> Tuple[List[str], List[str]]:
+        """Extract links with id or class tag
+
+        extracting links with id or class tag
+
+        Parameters
+        ----------
+        isId: boolean
+            determines whether to look for an id or a class
+        to_find: str
+            name of class or id
+        soup: BeautifulSoup
+            object used to extract information
+        replace: boolean
+            determines whether part of the link is to be replaced
+        replace_to: list, optional
+            two elements list containing what [0] has to be replaces with what [1]
+
+        Returns
+        ------
+        list, list
+            1. list containing names of extracted links e.g.  districts, cities.
+            2. list containing extrated links e.g. districts, pages
+        """
+
+        # Find by id or class
+        if (isId):
+            extracted = soup.find(id=to_find)
+        else:
+            extracted = soup.find(class_=to_find)
+
+        # If there is only one page assign empty arrays to variables
+        try:
+            # Find all a tag's
+            extracted_names = [name.string for name in extracted.findAll('a') if (name.string != None)]
+            # Extract links and replace part of string to create link with newest observations
+            extracted_links = [link.get("href") for link in extracted.findAll('a') if (link.get("href") != None)]
+            if (replace):
+                extracted_links = [link.replace(replace_to[0], replace_to[1]) for link in extracted_links]
+        except:
+            extracted_names = []
+            extracted_links = []
+
+        return extracted_names, extracted_links
+
+    # Prepare pages range
+    def prepare_range(self, pages_names: List[str]) -> range:
+        """Preparing the range of pages to create links
+
+        Parameters
+        ----------
+        pages_names: list
+            links to individual city districts
+        Returns
+        ------
+        range
+            range of pages at morizon for specific page_name
+        """
+
+        # if length is 0 then there is only 1 page
+        if len(pages_names) != 0:
+            last_page = int(pages_names[len(pages_names) - 1])
+        else:
+            last_page = 1
+
+        return range(1, last_page + 1)
+
+    # Create splits to relieve RAM memory
+    def create_split(self, links: object, split_size: object) -> object:
+        """Create splits to relieve RAM memory
+
+        Parameters
+        ----------
+        links: list
+            list with list based on which length of splits is created
+        split_size: int
+            value divided by total number of links it is used to create splits to relieve RAM memory
+        Returns
+        ------
+        list
+            list with ranges
+        """
+
+        if (len(links) < split_size):
+            splitted = [[0, len(links)]]
+        else:
+            splitted = np.array_split(list(range(0, len(links))), len(links) / split_size)
+            splitted = [[elements[0] - 1, elements[-1]] if elements[0] != 0 else [elements[0], elements[-1]] for
+                        elements in splitted]
+            splitted[len(splitted) - 1][1] += 1
+
+
+        return splitted
+
+    # Flatten a list
+    def flatten(self, result_to_flatt: List[List[str]]) -> Union[List[List[str]],List[str]]:
+        """Flatten a list
+
+        Parameters
+        ----------
+        result_to_flatt: list
+            which has to be flatten
+
+        Returns
+        ------
+        list
+            flatten list
+        """
+
+        rt = []
+        for i in result_to_flatt:
+            if isinstance(i, list):
+                rt.extend(self.flatten(i))
+            else:
+                rt.append(i)
+        return rt
+
+    # Call func for link, measure it and describe the failure
+    def attempt(self, func: Callable, link: str) -> Tuple[FetchResult, str]:
+        """Call func for link, measure it and describe the failure
+
+        Parameters
+        ----------
+        func: function
+            scraping function which returns FetchResult
+        link: str
+            argument of scraping function
+
+        Returns
+        ------
+        FetchResult, str
+            1. result of func with fetch and parse time and number of read bytes (FAILED if func raised exception),
+            it is parsed in parse_pool if parse_processes is set
+            2. description of the failure (None if status is not FAILED)
+        """
+
+        self._timing.fetch_time = 0.0
+        self._timing.n_bytes = 0
+        start = time.perf_counter()
+
+        try:
+            if self.parse_processes:
+                # Pages are read in this thread and parsed in worker process
+                pages = {page_link: self.read_page(page_link) for page_link in self.page_requests(func, link)}
+                result = self.parse_pool().submit(parse_in_worker, func.__name__, link, pages).result()
+            else:
+                result = func(link)
+                result.parse_time = time.perf_counter() - start - self._timing.fetch_time
+        except Exception as error:
+            result = FetchResult(FAILED, link, error=error)
+
+        result.fetch_time = self._timing.fetch_time
+        result.n_bytes = self._timing.n_bytes
+
+        if result.status == FAILED:
+            self.metrics.count("failures_total", reason=failure_reason(result.error))
+            return result, "%s: %s" % (type(result.error).__name__, result.error)
+
+        self.metrics.observe("parse_seconds", result.parse_time)
+        if result.status == GONE:
+            self.metrics.count("gone_offers_total")
+
+        return result, None
+
+    # Processes parsing pages
+    def parse_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Processes parsing pages, created with the first use and kept until shutdown_parse_pool
+
+        Returns
+        ------
+        ProcessPoolExecutor
+            parse_processes worker processes, each has a copy of scraper without connections and archive
+        """
+
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                self._parse_pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.parse_processes,
+                                                                          initializer=init_parse_worker,
+                                                                          initargs=(pickle.dumps(self),))
+            return self._parse_pool
+
+    # Stop processes parsing pages
+    def shutdown_parse_pool(self) -> None:
+        """Stop processes parsing pages"""
+
+        with self._parse_pool_lock:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
+
+    # Stop threads and processes of scraper and close archive
+    def close(self) -> None:
+        """Stop worker_pool and processes parsing pages and commit and close archive, scraper is not used after
+        close"""
+
+        self.shutdown_parse_pool()
+        self.worker_pool.shutdown()
+        if self.archive is not None:
+            self.archive.close()
+
+    # General function to scrape links with the engine set in fetch_backend
+    def scraping_all_links(self, func: Callable, all_links: List[str]) -> List[FetchResult]:
+        """General function to scrape links with the engine set in fetch_backend
+
+        "threads" runs func in worker_pool as stage named after func, "asyncio" downloads pages on a single event loop and passes them
+        to func. Replay from archive always uses threads. FAILED links are retried with exponential backoff
+        together with fresh links, links which failed max_attempts times are saved to failed_links.
+
+        Parameters
+        ----------
+        func: function
+            function which will be activated for every link, it returns FetchResult
+        all_links: list
+            list with links to scrape
+        Returns
+        ------
+        list
+            results in the order of links, payload of OK results are scraped elements: details, and links e.g. pages
+        """
+
+        if len(all_links) == 0:
+            return []
+
+        scheduler = RetryScheduler(max_attempts=self.max_attempts, base_delay=self.retry_delay)
+
+        if (self.fetch_backend == "asyncio") and (self.replay_date is None):
+            fetcher = AsyncFetcher(concurrency=self.async_concurrency, headers={"Accept-Encoding": ACCEPT_ENCODING},
+                                   cache=self.http_cache, adaptive=self.concurrency,
+                                   parse_workers=self.parse_processes or 1, host_overrides=self.host_overrides,
+                                   metrics=self.metrics)
+            results = fetcher.map(links=all_links,
+                                  resolve=lambda link: self.page_requests(func, link),
+                                  process=lambda link, pages: self.call_with_pages(
+                                      lambda page_link: self.attempt(func, page_link), link, pages),
+                                  scheduler=scheduler)
+            self.record_retries(scheduler)
+            self.flush_archive()
+            return results
+
+        stage = func.__name__
+        threads = min(self.worker_pool.quota(stage), len(all_links))
+        to_do = iter(dict.fromkeys(all_links))
+        results = {}
+        in_flight = {}
+
+        while True:
+            # Due retries go before fresh links, a few links wait in pool so threads are never idle
+            while len(in_flight) < 2 * threads:
+                link = scheduler.pop_due()
+                if link is None:
+                    link = next(to_do, None)
+                if link is None:
+                    break
+                in_flight[self.worker_pool.submit(stage, self.attempt, func, link)] = link
+
+            if len(in_flight) == 0:
+                if scheduler.pending() == 0:
+                    break
+                time.sleep(scheduler.wait())
+                continue
+
+            done, _ = concurrent.futures.wait(in_flight, timeout=scheduler.wait(),
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                link = in_flight.pop(future)
+                result, error = future.result()
+                if error is None:
+                    scheduler.succeeded(link)
+                elif scheduler.retry(link, error, permanent=self.permanent_failure(result)):
+                    continue
+                results[link] = result
+
+        self.record_retries(scheduler)
+        self.flush_archive()
+
+        return [results[link] for link in all_links]
+
+    # Failure which is not retried
+    def permanent_failure(self, result: FetchResult) -> bool:
+        """Check if failure would repeat in every attempt, page missing from archive in replay mode is a permanent
+        failure at once instead of being retried with backoff
+
+        Parameters
+        ----------
+        result: FetchResult
+            FAILED result of attempt
+
+        Returns
+        ------
+        bool
+            True if link should not be retried
+        """
+
+        return isinstance(result.error, PageNotArchived)
+
+    # Save links which were not scraped and count retries
+    def record_retries(self, scheduler: RetryScheduler) -> None:
+        """Save links which failed max_attempts times to failed_links and count retries in metrics
+
+        Parameters
+        ----------
+        scheduler: RetryScheduler
+            scheduler used by scraping_all_links
+        """
+
+        permanent_failures = scheduler.permanent_failures()
+        self.failed_links.update(permanent_failures)
+        self.metrics.count("retries_total", scheduler.retries)
+        self.metrics.count("permanent_failures_total", len(permanent_failures))
+
+    # Arguments of scraping_pages_links used to find all pages
+    def page_sources(self) -> List[str]:
+        """Arguments of scraping_pages_links used to find all pages
+
+        Returns
+        ------
+        list
+            voivodeships (scrapers of pages with other sources override it)
+        """
+
+        return self.voivodeships
+
+    # Prepare offer link scraped from page
+    def clean_offer_link(self, link: str) -> str:
+        """Prepare offer link scraped from page
+
+        Parameters
+        ----------
+        link: str
+            offer link
+
+        Returns
+        ------
+        str
+            offer link (scrapers of pages which need it override it)
+        """
+
+        return link
+
+    # Link to listing page sorted from the newest offers
+    def newest_page_link(self, source: str, page_number: int) -> str:
+        """Link to listing page of source sorted from the newest offers
+
+        Parameters
+        ----------
+        source: str
+            argument of scraping_pages_links e.g. voivodeship, district
+        page_number: int
+            number of page (from 1)
+
+        Returns
+        ------
+        str
+            link to page (scrapers of pages which can sort listings override it)
+        """
+
+        raise ValueError("%s has no listing sorted from the newest offers" % type(self).__name__)
+
+    # Offers added since the last crawl
+    @timed_stage("offers")
+    def get_new_offers(self, known_links: Set[str], sources: List[str] = None, max_pages: int = None) -> List[str]:
+        """Walk listing pages of every source from the newest offers and stop at the first page which has only
+        known offers. Pages with the same number are scraped at once for all sources which are not finished.
+        A source whose page was not scraped is stopped too, its new offers are found by the next crawl because
+        they are still not known
+
+        Parameters
+        ----------
+        known_links: set
+            offers links which are already in database
+        sources: list, optional
+            arguments of scraping_pages_links e.g. voivodeships, districts (default page_sources())
+        max_pages: int, optional
+            maximum number of pages of every source (default until known offers)
+
+        Returns
+        ------
+        list
+            links of new offers
+        """
+
+        sources = list(self.page_sources() if sources is None else sources)
+        seen = set()
+        new_offers = []
+        page_number = 1
+
+        while (len(sources) != 0) and ((max_pages is None) or (page_number <= max_pages)):
+            pages_links = {self.newest_page_link(source, page_number): source for source in sources}
+            results_offers = self.scraping_all_links(self.scraping_offers_links, list(pages_links))
+
+            sources = []
+            for offers in results_offers:
+                if offers.status != OK:
+                    continue
+                # Pages past the last one can repeat offers, so only offers not seen in this crawl count
+                fresh = [link for link in map(self.clean_offer_link, offers.payload) if link not in seen]
+                seen.update(fresh)
+                unknown = [link for link in fresh if link not in known_links]
+                new_offers.extend(unknown)
+                if len(unknown) != 0:
+                    sources.append(pages_links[offers.link])
+
+            page_number += 1
+
+        return new_offers
+
+    # Known offers which were removed from website
+    def find_removed_offers(self, links: List[str]) -> List[str]:
+        """Known offers which were removed from website. HEAD request is sent for every link, 404 or 410 status
+        or redirect to other page means that offer was removed. Links which could not be checked are kept, offers
+        which still answer 200 are found when their details are scraped (GONE)
+
+        Parameters
+        ----------
+        links: list
+            offers links which are in database
+
+        Returns
+        ------
+        list
+            links of removed offers
+        """
+
+        def removed(link):
+            try:
+                status, location = self.session.head(link)
+            except Exception:
+                return False
+            if status in (404, 410):
+                return True
+            if (300 <= status < 400) and (location is not None):
+                return urlsplit(urljoin(link, location)).path.rstrip("/") != urlsplit(link).path.rstrip("/")
+            return False
+
+        if len(links) == 0:
+            return []
+
+        flags = self.worker_pool.map("find_removed_offers", removed, links)
+
+        removed_links = [link for link, flag in zip(links, flags) if flag]
+        self.metrics.count("removed_offers_total", len(removed_links))
+
+        return removed_links
+
+    # Get apartments details
+    @timed_stage("details")
+    def get_details(self, split_size: int, offers: List[str] = [], checkpoint_dir: str = None) -> pd.DataFrame:
+        """The method called up by the user to download all details about apartments. If checkpoint_dir is set
+        results are saved to checkpoint_dir/hash_of_links/first-last.pkl files (first-last.N.pkl for links of
+        split scraped again after a failure) and links of saved splits to manifest.txt, so get_details run again
+        for the same list of offers skips links which are already scraped. Other lists of offers have their own
+        directories.
+
+        Parameters
+        ----------
+        split_size: int
+           value divided by total number of links it is used to create splits to relieve RAM memory
+        offers: list, optional
+            for which offers links the properties details are to be scraped (default for all)
+        checkpoint_dir: str, optional
+            directory where scraped splits are saved (default splits are only kept in memory)
+
+        Returns
+        ------
+        DataFrame
+            details about apartments in the order of offers
+        """
+
+        # Verify whether user want to specify specific pages
+        if any(offers):
+            results_offers = offers
+        else:
+            results_offers = self.get_offers(split_size=split_size)
+
+        # Splits saved by previous runs
+        results = list()
+        done = set()
+        if checkpoint_dir is not None:
+            # Only a run for the same links in the same order resumes from saved splits
+            run_hash = hashlib.sha256("\n".join(results_offers).encode("utf-8")).hexdigest()[:16]
+            run_dir = os.path.join(checkpoint_dir, run_hash)
+            manifest_path = os.path.join(run_dir, "manifest.txt")
+            os.makedirs(run_dir, exist_ok=True)
+            if os.path.exists(manifest_path):
+                with open(manifest_path, encoding="utf-8") as manifest:
+                    done = set(manifest.read().split())
+            split_files = [file_name for file_name in os.listdir(run_dir) if file_name.endswith(".pkl")]
+            # Files of a split resumed later (first-last.N.pkl) follow its first file
+            def split_order(file_name):
+                return tuple(int(part) for part in file_name[:-len(".pkl")].replace("-", ".").split("."))
+
+            for file_name in sorted(split_files, key=split_order):
+                with open(os.path.join(run_dir, file_name), "rb") as split_file:
+                    results.append(pickle.load(split_file))
+
+        # Create splits to relieve RAM memory
+        splitted = self.create_split(links=results_offers, split_size=split_size)
+
+        # Scrape details, links which raised an exception are retried
+        for number, split in enumerate(splitted):
+            self.metrics.set("details_splits_left", len(splitted) - number)
+            links = [link for link in results_offers[split[0]:split[1]] if link not in done]
+            if len(links) == 0:
+                continue
+
+            results_details = self.scraping_all_links(self.scraping_offers_details, links)
+            scraped = [result.link for result in results_details if result.status != FAILED]
+
+            # Skip offers which no longer exist and links which were not scraped
+            results_details = [result.payload for result in results_details if result.status == OK]
+            results.append(results_details)
+
+            # Save split and then its links (also offers which no longer exist), failed links are scraped again
+            if checkpoint_dir is not None:
+                # Split resumed after a failure keeps records of earlier runs, its new records go to the next file
+                split_path = os.path.join(run_dir, "%d-%d.pkl" % (split[0], split[1]))
+                sequence = 0
+                while os.path.exists(split_path):
+                    sequence += 1
+                    split_path = os.path.join(run_dir, "%d-%d.%d.pkl" % (split[0], split[1], sequence))
+                self.save_split(split_path, results_details)
+                with open(manifest_path, "a", encoding="utf-8") as manifest:
+                    manifest.write("".join(link + "\n" for link in scraped))
+                    manifest.flush()
+                    os.fsync(manifest.fileno())
+
+        self.metrics.set("details_splits_left", 0)
+
+        # Records of resumed splits are saved after records of the same split scraped before
+        position = {link: number for number, link in reversed(list(enumerate(results_offers)))}
+        records = sorted((offer_infos for split_details in results for offer_infos in split_details),
+                         key=lambda offer_infos: position.get(offer_infos.get("link"), len(position)))
+
+        # No offers or all splits were scraped before without saved files
+        if len(records) == 0:
+            return pd.DataFrame()
+
+        return pd.DataFrame(records)
+
+    # Save details of split at once
+    def save_split(self, path: str, details: List[DefaultDict[str, str]]) -> None:
+        """Save details of split at once, so a crash never leaves half written file
+
+        Parameters
+        ----------
+        path: str
+            path to file
+        details: list
+            details about apartments, pickle keeps list columns which csv would turn into strings
+        """
+
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as temp_file:
+            pickle.dump([dict(offer_infos) for offer_infos in details], temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_path, path)
+
+    # Scrape pages, offers and details at the same time
+    def stream_details(self, sources: List[str] = None, batch_size: int = 500,
+                       queue_size: int = 1000) -> Iterator[pd.DataFrame]:
+        """Scrape pages, offers and details at the same time and return details in batches as soon as they are
+        scraped. Stages are connected with bounded queues, so memory does not grow with the size of the crawl.
+
+        Parameters
+        ----------
+        sources: list, optional
+            arguments of scraping_pages_links e.g. voivodeships, districts (default page_sources())
+        batch_size: int
+            number of apartments in every returned data frame
+        queue_size: int
+            maximum number of links waiting between stages
+
+        Returns
+        ------
+        iterator
+            data frames with details about apartments
+        """
+
+        batch = []
+        for details in ScrapingPipeline(self, queue_size=queue_size).run(sources):
+            batch.append(details)
+            if len(batch) == batch_size:
+                yield pd.DataFrame(batch)
+                batch = []
+
+        if len(batch) != 0:
+            yield pd.DataFrame(batch)
+
+    # Find in Beautifulsoup with 3 args
+    def soup_find_information(self, soup: BeautifulSoup, find_attr: List[str]) -> List[str]:
+        """Find in soup with 3 args
+
+        Parameters
+        ----------
+        soup: str
+            offer link
+        find_attr: list
+            attributes of tag
+
+        Returns
+        ------
+        list
+            elements with specific attributes
+        """
+
+        return soup.find(find_attr[0], attrs={find_attr[1]: find_attr[2]})
+
+    # Extract strings from information founded in soup
+    def extract_information(self, find_in: BeautifulSoup, find_with_obj: bool = False,
+                            obj: str = None) -> Union[List[str], str]:
+        """Find in soup with 3 args
+
+        Parameters
+        ----------
+        find_in: BeautifulSoup
+            object where used to find information
+        find_with_obj: boolean, (default False)
+            determines whether user wants to find elements by "obj"
+        obj: str, (default None)
+            find all elements with that object
+
+        Returns
+        ------
+        list or str
+            1. elements with specific attributes
+            2. "None" informs that information is not available
+        """
+
+        try:
+            if find_with_obj:
+                return [info_part.string.strip() for info_part in find_in.find_all(obj) if (info_part.string != None)]
+            else:
+                return [info_part.string.strip() for info_part in find_in if (info_part.string != None)]
+        except:
+            return None
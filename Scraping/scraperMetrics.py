@@ -0,0 +1,325 @@
+# Metrics of scraping
+
+# Libraries
+import bisect
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Tuple
+
+# Upper bounds of latency histograms in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Descriptions of metrics exported to Prometheus
+DESCRIPTIONS = {"requests_total": ("counter", "Requests sent to the network by status"),
+                "bytes_total": ("counter", "Bytes of downloaded pages"),
+                "retries_total": ("counter", "Links scheduled for another attempt"),
+                "failures_total": ("counter", "Failed attempts by reason"),
+                "permanent_failures_total": ("counter", "Links which failed every attempt"),
+                "gone_offers_total": ("counter", "Offers which no longer exist"),
+                "removed_offers_total": ("counter", "Known offers found removed by HEAD requests"),
+                "stage_seconds_total": ("counter", "Seconds spent in stage without nested stages"),
+                "details_splits_left": ("gauge", "Splits of get_details which are not scraped yet"),
+                "fetch_seconds": ("histogram", "Latency of requests sent to the network"),
+                "parse_seconds": ("histogram", "Time of parsing pages and extracting information")}
+
+
+class Histogram:
+    """
+    A class used to count observations in latency buckets
+
+    ...
+
+    Attributes
+    ----------
+    buckets : tuple
+        upper bounds of buckets in seconds
+    counts : list
+        number of observations in every bucket and above the last one
+    sum : float
+        sum of observations
+    count : int
+        number of observations
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    # Cumulative counts as in Prometheus
+    def cumulative(self) -> Dict[str, int]:
+        cumulative, total = {}, 0
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += count
+            cumulative[str(bound)] = total
+        return cumulative
+
+
+class ScraperMetrics:
+    """
+    A class used to collect counters, latency histograms and stage durations of scraper
+
+    Metrics are shared by all threads. Copies sent to parse processes start empty, the main process records
+    results which come back from them.
+
+    ...
+
+    Attributes
+    ----------
+    labels : dict
+        labels added to every exported metric e.g. {"scraper": "ScrapingOtodom"}
+    prefix : str
+        prefix of names of exported metrics (default "scraper_")
+
+    Methods
+    -------
+    count(name: str, value: float = 1, **labels) -> None:
+        Increase counter
+
+    set(name: str, value: float, **labels) -> None:
+        Set gauge
+
+    observe(name: str, value: float) -> None:
+        Add observation to histogram
+
+    request(latency: float, status: str, n_bytes: int = 0) -> None:
+        Record request sent to the network
+
+    stage(name: str) -> Iterator[None]:
+        Context manager measuring stage, time of nested stages is not counted twice
+
+    snapshot() -> dict:
+        Current values of all metrics
+
+    to_prometheus() -> str:
+        Metrics in Prometheus text format
+
+    write(path: str) -> None:
+        Save metrics to JSON (.json) or Prometheus text file (other extensions)
+    """
+
+    def __init__(self, labels: Dict[str, str] = None, prefix: str = "scraper_"):
+        """
+        Parameters
+        ----------
+        labels : dict, optional
+            labels added to every exported metric e.g. {"scraper": "ScrapingOtodom"}
+        prefix : str
+            prefix of names of exported metrics (default "scraper_")
+        """
+
+        self.labels = labels or {}
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._gauges = {}
+        self._histograms = defaultdict(Histogram)
+        self._stages = threading.local()
+
+    # Copies sent to other processes start empty
+    def __reduce__(self):
+        return (ScraperMetrics, (self.labels, self.prefix))
+
+    # Increase counter
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    # Set gauge
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    # Add observation to histogram
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            self._histograms[name].observe(value)
+
+    # Record request sent to the network
+    def request(self, latency: float, status: str, n_bytes: int = 0) -> None:
+        """Record request sent to the network
+
+        Parameters
+        ----------
+        latency: float
+            seconds from sending request to reading the whole response
+        status: str
+            HTTP status or "error" if there was no response
+        n_bytes: int
+            number of bytes of response
+        """
+
+        with self._lock:
+            self._counters[("requests_total", (("status", str(status)),))] += 1
+            self._counters[("bytes_total", ())] += n_bytes
+            self._histograms["fetch_seconds"].observe(latency)
+
+    # Measure stage
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Context manager measuring stage e.g. pages, offers, details. Stages started inside other stage (e.g.
+        get_pages called by get_offers) are subtracted from it, so stages add up to the whole run
+
+        Parameters
+        ----------
+        name: str
+            name of stage
+        """
+
+        stack = self._stages.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if len(stack) != 0:
+                stack[-1] += elapsed
+            self.count("stage_seconds_total", elapsed - nested, stage=name)
+
+    # Current values of all metrics
+    def snapshot(self) -> dict:
+        """Current values of all metrics
+
+        Returns
+        ------
+        dict
+            counters, gauges and histograms (cumulative bucket counts, sum and count), names have no prefix
+        """
+
+        def by_labels(values):
+            metrics = defaultdict(list)
+            for (name, labels), value in sorted(values.items()):
+                metrics[name].append({"labels": dict(labels), "value": value})
+            return dict(metrics)
+
+        with self._lock:
+            return {"labels": dict(self.labels), "time": time.time(),
+                    "counters": by_labels(self._counters), "gauges": by_labels(self._gauges),
+                    "histograms": {name: {"buckets": histogram.cumulative(), "sum": histogram.sum,
+                                          "count": histogram.count}
+                                   for name, histogram in sorted(self._histograms.items())}}
+
+    # Metrics in Prometheus text format
+    def to_prometheus(self) -> str:
+        """Metrics in Prometheus text format
+
+        Returns
+        ------
+        str
+            metrics which can be read by node_exporter textfile collector
+        """
+
+        def format_labels(labels):
+            labels = {**self.labels, **labels}
+            if len(labels) == 0:
+                return ""
+            return "{%s}" % ",".join('%s="%s"' % (key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+                                     for key, value in labels.items())
+
+        snapshot = self.snapshot()
+        lines = []
+        for kind in ["counters", "gauges"]:
+            for name, values in snapshot[kind].items():
+                metric_type, description = DESCRIPTIONS.get(name, (kind[:-1], name))
+                lines.append("# HELP %s%s %s" % (self.prefix, name, description))
+                lines.append("# TYPE %s%s %s" % (self.prefix, name, metric_type))
+                lines.extend("%s%s%s %r" % (self.prefix, name, format_labels(value["labels"]), value["value"])
+                             for value in values)
+        for name, histogram in snapshot["histograms"].items():
+            lines.append("# HELP %s%s %s" % (self.prefix, name, DESCRIPTIONS.get(name, ("", name))[1]))
+            lines.append("# TYPE %s%s histogram" % (self.prefix, name))
+            lines.extend("%s%s_bucket%s %d" % (self.prefix, name, format_labels({"le": bound}), count)
+                         for bound, count in histogram["buckets"].items())
+            lines.append("%s%s_sum%s %r" % (self.prefix, name, format_labels({}), histogram["sum"]))
+            lines.append("%s%s_count%s %d" % (self.prefix, name, format_labels({}), histogram["count"]))
+
+        return "\n".join(lines) + "\n"
+
+    # Save metrics to file
+    def write(self, path: str) -> None:
+        """Save metrics to JSON (.json) or Prometheus text file (other extensions, e.g. .prom). File is replaced
+        at once, so collectors never read half written file
+
+        Parameters
+        ----------
+        path: str
+            path to file
+        """
+
+        if path.endswith(".json"):
+            content = json.dumps(self.snapshot(), indent=2)
+        else:
+            content = self.to_prometheus()
+
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, path)
+
+
+# Reason of failed attempt
+def failure_reason(error: Exception) -> str:
+    """Reason of failed attempt used as label of failures
+
+    Parameters
+    ----------
+    error: Exception
+        exception which made attempt fail
+
+    Returns
+    ------
+    str
+        "http_<status>" for error statuses, "timeout", "connection" or name of exception (e.g. AttributeError
+        raised while parsing)
+    """
+
+    status = getattr(error, "status", None)
+    if isinstance(status, int):
+        return "http_%d" % status
+
+    name = type(error).__name__
+    if isinstance(error, TimeoutError) or ("Timeout" in name):
+        return "timeout"
+    if isinstance(error, ConnectionError) or any(part in name for part in ["Connect", "MaxRetry", "Protocol"]):
+        return "connection"
+
+    return name
+
+
+# Measure method of scraper as stage
+def timed_stage(name: str) -> Callable:
+    """Decorator measuring method of scraper as stage of its metrics
+
+    Parameters
+    ----------
+    name: str
+        name of stage e.g. pages, offers, details
+
+    Returns
+    ------
+    function
+        decorator
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,262 @@
+# Streaming pages -> offers -> details pipeline
+
+# Libraries
+import concurrent.futures
+import queue
+import threading
+from typing import Callable, DefaultDict, Iterator, List
+from fetchResult import FetchResult, OK
+from retryScheduler import RetryScheduler
+
+# Marks the end of work in queues
+DONE = object()
+# Seconds between checks of queue of previous stage while links of stage are scraped
+POLL_INTERVAL = 0.05
+
+
+class ScrapingPipeline:
+    """
+    A class used to scrape pages, offers and details at the same time, connected with bounded queues
+
+    Pages found for a source are sent to offers stage at once and new offers links to details stage, so the
+    first details are scraped within seconds. Full queues stop earlier stages (backpressure), so memory does not
+    grow with the size of the crawl.
+
+    Every stage has one dispatcher thread, which takes links from queue, scrapes them in scraper worker_pool (as
+    stage named after scraping function, so stage quotas apply) and passes results to the next queue. Links which
+    were not scraped are retried with backoff like in scraping_all_links and saved to scraper failed_links.
+
+    ...
+
+    Attributes
+    ----------
+    scraper : Scraper
+        scraper of specific page (e.g. ScrapingOtodom)
+    queue_size : int
+        maximum number of links waiting in every queue (default 1000)
+    offers_threads : int
+        maximum number of offers links scraped at once
+    details_threads : int
+        maximum number of details scraped at once
+    retries : int
+        number of additional attempts for links which were not scraped
+
+    Methods
+    -------
+    run(sources: List[str] = None) -> Iterator[DefaultDict[str, str]]:
+        Scrape details of all offers found for sources, they are returned as soon as they are scraped
+    """
+
+    def __init__(self, scraper, queue_size: int = 1000, offers_threads: int = None, details_threads: int = None,
+                 retries: int = None):
+        """
+        Parameters
+        ----------
+        scraper : Scraper
+            scraper of specific page (e.g. ScrapingOtodom)
+        queue_size : int
+            maximum number of links waiting in every queue (default 1000)
+        offers_threads : int, optional
+            maximum number of offers links scraped at once (default a quarter of scraper max_threads), it is
+            limited by quota of stage in worker_pool
+        details_threads : int, optional
+            maximum number of details scraped at once (default scraper max_threads), it is limited by quota of
+            stage in worker_pool
+        retries : int, optional
+            number of additional attempts for links which were not scraped (default scraper max_attempts - 1)
+        """
+
+        self.scraper = scraper
+        self.queue_size = queue_size
+        self.offers_threads = offers_threads or max(1, scraper.max_threads // 4)
+        self.details_threads = details_threads or scraper.max_threads
+        self.retries = scraper.max_attempts - 1 if retries is None else retries
+
+    # Scrape details of all offers found for sources
+    def run(self, sources: List[str] = None) -> Iterator[DefaultDict[str, str]]:
+        """Scrape details of all offers found for sources, they are returned as soon as they are scraped
+
+        Parameters
+        ----------
+        sources: list, optional
+            arguments of scraping_pages_links e.g. voivodeships, districts (default scraper page_sources())
+
+        Returns
+        ------
+        iterator
+            details of apartments
+        """
+
+        if sources is None:
+            sources = self.scraper.page_sources()
+
+        self._stop = threading.Event()
+        self._seen = set()
+        sources_queue = queue.Queue()
+        pages_queue = queue.Queue(maxsize=self.queue_size)
+        offers_queue = queue.Queue(maxsize=self.queue_size)
+        details_queue = queue.Queue(maxsize=self.queue_size)
+        for source in sources:
+            sources_queue.put(source)
+        sources_queue.put(DONE)
+
+        stages = [(self.scraper.scraping_pages_links, self.scraper.max_threads, sources_queue,
+                   lambda pages: self.put_all(pages_queue, pages.payload)),
+                  (self.scraper.scraping_offers_links, self.offers_threads, pages_queue,
+                   lambda offers: self.put_new_offers(offers_queue, offers.payload)),
+                  (self.scraper.scraping_offers_details, self.details_threads, offers_queue,
+                   lambda details: self.put(details_queue, details.payload))]
+        next_queues = [pages_queue, offers_queue, details_queue]
+        threads = [threading.Thread(target=self.dispatcher, args=(func, threads, from_queue, handle, to_queue),
+                                    daemon=True)
+                   for (func, threads, from_queue, handle), to_queue in zip(stages, next_queues)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                details = details_queue.get()
+                if details is DONE:
+                    break
+                yield details
+        finally:
+            # Stop dispatchers also when user stops iterating
+            self._stop.set()
+            self.scraper.flush_archive()
+
+    # Put element to queue, give up when pipeline is stopped
+    def put(self, to_queue: queue.Queue, element) -> bool:
+        """Put element to queue, give up when pipeline is stopped
+
+        Parameters
+        ----------
+        to_queue: Queue
+            queue of next stage
+        element: object
+            link, details or DONE
+
+        Returns
+        ------
+        bool
+            False if pipeline was stopped
+        """
+
+        while not self._stop.is_set():
+            try:
+                to_queue.put(element, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    # Put all elements to queue
+    def put_all(self, to_queue: queue.Queue, elements: List) -> bool:
+        return all(self.put(to_queue, element) for element in elements)
+
+    # Put offers links which were not seen before to queue
+    def put_new_offers(self, offers_queue: queue.Queue, offers: List[str]) -> bool:
+        for offer in offers:
+            offer = self.scraper.clean_offer_link(offer)
+            if offer in self._seen:
+                continue
+            self._seen.add(offer)
+            if not self.put(offers_queue, offer):
+                return False
+
+        return True
+
+    # Get element from queue, None if there is no element in time
+    def get(self, from_queue: queue.Queue, timeout: float):
+        """Get element from queue, None if there is no element in time
+
+        Parameters
+        ----------
+        from_queue: Queue
+            queue of previous stage
+        timeout: float
+            seconds to wait for element, 0 does not wait
+
+        Returns
+        ------
+        object
+            link, DONE or None
+        """
+
+        try:
+            if timeout <= 0:
+                return from_queue.get_nowait()
+            return from_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    # Scrape links of stage in worker_pool and pass results to the next stage
+    def dispatcher(self, func: Callable, threads: int, from_queue: queue.Queue,
+                   handle: Callable[[FetchResult], bool], to_queue: queue.Queue) -> None:
+        """Scrape links from queue in worker_pool and handle OK results. Due retries go before new links like in
+        scraping_all_links, links which failed max_attempts times are saved to scraper failed_links.
+
+        Parameters
+        ----------
+        func: function
+            scraping function which returns FetchResult, its name is stage of worker_pool
+        threads: int
+            maximum number of links scraped at once, it is limited by quota of stage
+        from_queue: Queue
+            links of stage ended with DONE
+        handle: function
+            puts payload of OK result to the next queue, it returns False if pipeline was stopped
+        to_queue: Queue
+            queue of next stage, DONE is put there when all links are scraped
+        """
+
+        stage = func.__name__
+        threads = min(threads, self.scraper.worker_pool.quota(stage))
+        scheduler = RetryScheduler(max_attempts=self.retries + 1, base_delay=self.scraper.retry_delay)
+        in_flight = {}
+        closed = False
+
+        try:
+            while not self._stop.is_set():
+                while len(in_flight) < threads:
+                    link = scheduler.pop_due()
+                    if (link is None) and not closed:
+                        # Dispatcher without work waits for link or due retry
+                        timeout = 0 if len(in_flight) != 0 else min(scheduler.wait() or 0.5, 0.5)
+                        link = self.get(from_queue, timeout)
+                        if link is DONE:
+                            closed = True
+                            link = None
+                    if link is None:
+                        break
+                    in_flight[self.scraper.worker_pool.submit(stage, self.scraper.attempt, func, link)] = link
+
+                if len(in_flight) == 0:
+                    if closed:
+                        if scheduler.pending() == 0:
+                            break
+                        self._stop.wait(scheduler.wait())
+                    continue
+
+                # New links are taken in short intervals while stage has free threads
+                timeout = scheduler.wait()
+                if (not closed) and (len(in_flight) < threads):
+                    timeout = POLL_INTERVAL if timeout is None else min(timeout, POLL_INTERVAL)
+                done, _ = concurrent.futures.wait(in_flight, timeout=timeout,
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    link = in_flight.pop(future)
+                    result, error = future.result()
+                    if error is None:
+                        scheduler.succeeded(link)
+                    elif scheduler.retry(link, error, permanent=self.scraper.permanent_failure(result)):
+                        continue
+                    if (result.status == OK) and not handle(result):
+                        return
+
+            if not self._stop.is_set():
+                self.put(to_queue, DONE)
+        finally:
+            for future in in_flight:
+                future.cancel()
+            self.scraper.record_retries(scheduler)
@@ -0,0 +1,210 @@
+# Long-lived pool of threads shared by all scraping stages
+
+# Libraries
+import collections
+import concurrent.futures
+import threading
+from typing import Callable, Dict, Iterable, List
+
+
+class WorkerPool:
+    """
+    A class used to run work of all scraping stages (pages, offers, details, ...) on one bounded set of threads
+
+    Threads are started when work waits for them, up to max_workers, and then live as long as the pool, so splits
+    and retry rounds do not create and stop threads and stages started one inside other do not multiply them.
+    Every stage has a quota of threads it can use at once, waiting tasks of stages below their quota are taken in
+    turns. Tasks must not wait for other tasks of the pool, because they would hold threads which those tasks need.
+
+    ...
+
+    Attributes
+    ----------
+    max_workers : int
+        maximum number of threads (default 30)
+    quotas : dict
+        stage: maximum number of its tasks running at once (stages which are not listed can use every thread)
+
+    Methods
+    -------
+    quota(stage: str) -> int:
+        Maximum number of tasks of stage running at once
+
+    submit(stage: str, func: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        Schedule func of stage
+
+    map(stage: str, func: Callable, iterable: Iterable) -> List:
+        Call func for every element and wait for all results
+
+    report() -> Dict[str, Dict[str, int]]:
+        Threads and tasks of every stage
+
+    shutdown(wait: bool = True) -> None:
+        Stop threads when waiting tasks are finished
+    """
+
+    def __init__(self, max_workers: int = 30, quotas: Dict[str, int] = None):
+        """
+        Parameters
+        ----------
+        max_workers : int
+            maximum number of threads (default 30)
+        quotas : dict, optional
+            stage: maximum number of its tasks running at once (default every stage can use every thread)
+        """
+
+        self.max_workers = max_workers
+        self.quotas = dict(quotas or {})
+        self._condition = threading.Condition()
+        self._pending = collections.OrderedDict()
+        self._running = collections.defaultdict(int)
+        self._completed = collections.defaultdict(int)
+        self._threads = []
+        self._idle = 0
+        self._starting = 0
+        self._shutdown = False
+
+    # Maximum number of tasks of stage running at once
+    def quota(self, stage: str) -> int:
+        return max(1, min(self.quotas.get(stage, self.max_workers), self.max_workers))
+
+    # Schedule func of stage
+    def submit(self, stage: str, func: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        """Schedule func of stage, it runs when a thread is free and stage is below its quota
+
+        Parameters
+        ----------
+        stage: str
+            name of stage e.g. name of scraping function
+        func: function
+            function called in thread of pool
+        args, kwargs:
+            arguments of func
+
+        Returns
+        ------
+        Future
+            result of func
+        """
+
+        future = concurrent.futures.Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("cannot submit to WorkerPool after shutdown")
+            self._pending.setdefault(stage, collections.deque()).append((future, func, args, kwargs))
+
+            # New thread is started only if idle threads are not enough for waiting tasks which can run now
+            if (self._idle + self._starting < self._runnable()) and (len(self._threads) < self.max_workers):
+                thread = threading.Thread(target=self._work, name="scraper-worker-%d" % len(self._threads),
+                                          daemon=True)
+                self._threads.append(thread)
+                self._starting += 1
+                thread.start()
+            else:
+                self._condition.notify()
+
+        return future
+
+    # Call func for every element and wait for all results
+    def map(self, stage: str, func: Callable, iterable: Iterable) -> List:
+        """Call func for every element and wait for all results
+
+        Parameters
+        ----------
+        stage: str
+            name of stage
+        func: function
+            function called with every element
+        iterable: iterable
+            arguments of func
+
+        Returns
+        ------
+        list
+            results in the order of elements
+        """
+
+        futures = [self.submit(stage, func, element) for element in iterable]
+        return [future.result() for future in futures]
+
+    # Threads and tasks of every stage
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """Threads and tasks of every stage
+
+        Returns
+        ------
+        dict
+            stage: quota, running, waiting and completed tasks ("threads": started and idle threads)
+        """
+
+        with self._condition:
+            stages = set(self._pending) | set(self._running) | set(self._completed)
+            report = {stage: {"quota": self.quota(stage), "running": self._running[stage],
+                              "waiting": len(self._pending.get(stage, ())), "completed": self._completed[stage]}
+                      for stage in sorted(stages)}
+            report["threads"] = {"started": len(self._threads), "idle": self._idle}
+
+            return report
+
+    # Stop threads when waiting tasks are finished
+    def shutdown(self, wait: bool = True) -> None:
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                if thread is not threading.current_thread():
+                    thread.join()
+
+    # Number of waiting tasks which can run now
+    def _runnable(self) -> int:
+        # Tasks of stage at its quota wait for its running tasks, not for a new thread
+        return sum(min(len(tasks), max(0, self.quota(stage) - self._running[stage]))
+                   for stage, tasks in self._pending.items())
+
+    # Waiting task of the next stage below its quota
+    def _next_task(self) -> tuple:
+        for stage, tasks in self._pending.items():
+            if (len(tasks) != 0) and (self._running[stage] < self.quota(stage)):
+                future, func, args, kwargs = tasks.popleft()
+                self._running[stage] += 1
+                # Stages take turns
+                self._pending.move_to_end(stage)
+                return stage, future, func, args, kwargs
+
+        return None
+
+    # Loop of thread
+    def _work(self) -> None:
+        stage = None
+        starting = True
+        while True:
+            with self._condition:
+                # Started thread takes a task like an idle one
+                if starting:
+                    self._starting -= 1
+                    starting = False
+                # Finished task and the next one are handled at once, so submit never sees its quota free while
+                # this thread is not counted as idle and starts another thread
+                if stage is not None:
+                    self._running[stage] -= 1
+                    self._completed[stage] += 1
+                    # Task of stage which was at its quota can start in idle thread
+                    self._condition.notify()
+                task = self._next_task()
+                while task is None:
+                    if self._shutdown:
+                        return
+                    self._idle += 1
+                    self._condition.wait()
+                    self._idle -= 1
+                    task = self._next_task()
+
+            stage, future, func, args, kwargs = task
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = func(*args, **kwargs)
+                except BaseException as error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
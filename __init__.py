@@ -1,28 +1,28 @@
-# Add path to scraping scripts
-import sys
-sys.path.append('Scraping')
-sys.path.append('Database_scripts')
-sys.path.append('Preprocessing scripts')
-
-#Colab paths
-sys.path.append('/content/Apartments')
-sys.path.append('/content/Apartments/Scraping')
-sys.path.append('/content/Apartments/Database_scripts')
-sys.path.append('/content/Apartments/Preprocessing_scripts')
-sys.path.append('/Apartments/Scraping')
-sys.path.append('/Apartments/Database_scripts')
-sys.path.append('/Apartments/Preprocessing_scripts')
-
-from morizonScraper import ScrapingMorizon
-from otodomScraper import ScrapingOtodom
-from db_manipulation import DatabaseManipulation
-from otodom import Preprocessing_Otodom
-from morizon import Preprocessing_Morizon
-import pandas as pd
-import configparser
-import urllib
-from sqlalchemy import create_engine
-
-if __name__ == "__main__":
-    # ===Morizon===
-    # ===Otodom===
+# Add path to scraping scripts
+import sys
+sys.path.append('Scraping')
+sys.path.append('Database_scripts')
+sys.path.append('Preprocessing scripts')
+
+#Colab paths
+sys.path.append('/content/Apartments')
+sys.path.append('/content/Apartments/Scraping')
+sys.path.append('/content/Apartments/Database_scripts')
+sys.path.append('/content/Apartments/Preprocessing_scripts')
+sys.path.append('/Apartments/Scraping')
+sys.path.append('/Apartments/Database_scripts')
+sys.path.append('/Apartments/Preprocessing_scripts')
+
+from morizonScraper import ScrapingMorizon
+from otodomScraper import ScrapingOtodom
+from db_manipulation import DatabaseManipulation
+from otodom import Preprocessing_Otodom
+from morizon import Preprocessing_Morizon
+import pandas as pd
+import configparser
+import urllib
+from sqlalchemy import create_engine
+
+if __name__ == "__main__":
+    # ===Morizon===
+    # ===Otodom===